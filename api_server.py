@@ -5,6 +5,7 @@ Connects React frontend with Python voice assistant
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import Any, Dict, List
 import sys
 from pathlib import Path
 
@@ -37,6 +38,9 @@ class CommandRequest(BaseModel):
 class CommandResponse(BaseModel):
     response: str
     success: bool
+    intent: str = ""
+    actions: List[Dict[str, Any]] = []
+    timing: Dict[str, float] = {}
 
 
 @app.on_event("startup")
@@ -62,9 +66,10 @@ async def process_command(request: CommandRequest):
         command = request.command
         print(f"\n🎤 Command received: {command}")
         
-        # Get response using assistant's method
-        response = assistant._get_response_for_command(command)
-        print(f"💬 Response: {response}")
+        # Same cached, instrumented dispatch path as the voice loop, text-only
+        result = assistant.dispatch(command, speak=False)
+        response = result["message"]
+        print(f"💬 Response: {response} ({result['timing'].get('total_ms', 0):.0f}ms)")
         
         # Also speak it
         try:
@@ -74,7 +79,10 @@ async def process_command(request: CommandRequest):
         
         return CommandResponse(
             response=response,
-            success=True
+            success=result["success"],
+            intent=result["intent"] or "",
+            actions=result["actions"],
+            timing=result["timing"]
         )
     except Exception as e:
         error_msg = f"Sorry, I encountered an error: {str(e)}"
@@ -0,0 +1,61 @@
+"""
+Microbenchmark: linear substring scan vs the trigram AppIndex.
+
+Run: python benchmarks/bench_app_lookup.py
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from capabilities.app_index import AppIndex
+
+QUERIES = ["chrome", "crome", "spotfy", "visual studio code", "steem", "discrod", "calculator", "zzzz"]
+
+
+def legacy_find(cache, app_name):
+    """The previous AppDiscovery.find_application matching."""
+    app_name = app_name.lower().strip()
+    if app_name in cache:
+        return cache[app_name]
+    for name, path in cache.items():
+        if app_name in name or name in app_name:
+            return path
+    return None
+
+
+def build_apps(count, rng):
+    apps = {"chrome": "chrome.exe", "spotify": "spotify.exe", "visual studio code": "code.exe",
+            "steam": "steam.exe", "discord": "discord.exe", "calculator": "calc.exe"}
+    while len(apps) < count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 14)))
+        apps[name + rng.choice(["", " helper", " tool", "64"])] = name + ".exe"
+    return apps
+
+
+def timed(fn, repeat=200):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+
+def main():
+    rng = random.Random(1)
+    print(f"{'apps':>6} {'build ms':>9} {'linear us':>10} {'index us':>9}")
+    for count in (100, 1000, 10000, 20000):
+        apps = build_apps(count, rng)
+        start = time.perf_counter()
+        index = AppIndex(apps)
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"{count:>6} {build_ms:>9.1f} {timed(lambda q: legacy_find(apps, q), 20):>10.1f} "
+              f"{timed(index.search):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Microbenchmark: eval() of the normalized text vs the cached compiled closures.
+
+Run: python benchmarks/bench_calculator.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from capabilities.math_engine import MathEngine, compile_expression, normalize
+
+EXPRESSIONS = [
+    "five plus three", "17 times 23", "square root of 144", "2 to the power of 10",
+    "15 percent of 200", "three hundred and two minus two", "(4 + 5) * 6 / 3",
+]
+
+
+def timed(fn, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in EXPRESSIONS:
+            fn(text)
+    return (time.perf_counter() - start) / (repeat * len(EXPRESSIONS)) * 1e6
+
+
+def main():
+    import math
+
+    engine = MathEngine()
+    normalized = {text: normalize(text) for text in EXPRESSIONS}
+    namespace = {"__builtins__": {}, "sqrt": math.sqrt}
+
+    print(f"{'path':<28} {'us/expr':>8}")
+    print(f"{'eval (pre-normalized)':<28} {timed(lambda t: eval(normalized[t], namespace)):>8.2f}")
+    print(f"{'compiled (pre-normalized)':<28} {timed(lambda t: compile_expression(normalized[t])({})):>8.2f}")
+    print(f"{'MathEngine.evaluate':<28} {timed(engine.evaluate):>8.2f}")
+    print(engine.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Microbenchmark: legacy substring routing vs. precompiled phrase matchers.
+
+Run: python benchmarks/bench_dispatch.py
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from assistant.registry import HandlerRegistry, PhraseMatcher, INTENT_PATTERNS
+
+CORPUS = [
+    ("file_operation", "open file explorer in downloads"),
+    ("file_operation", "show me my pictures"),
+    ("file_operation", "open the videos folder"),
+    ("web_browsing", "search for python asyncio tutorials on youtube"),
+    ("web_browsing", "open website github.com"),
+    ("web_browsing", "fetch the content of this page"),
+    ("web_browsing", "what are the latest news headlines"),
+    ("email", "check my email"),
+    ("email", "read the second email"),
+    ("email", "how many unread messages do i have"),
+    ("app_automation", "type meeting notes for tomorrow in word"),
+    ("app_automation", "press control shift s"),
+    ("app_automation", "paste what is on the clipboard"),
+]
+
+
+def legacy_route(intent, command):
+    """Branch selection as done by the old if/elif substring handlers."""
+    command_lower = command.lower()
+    if intent == "file_operation":
+        if "file explorer" in command_lower or "explorer" in command_lower:
+            for loc in ["downloads", "documents", "pictures", "photos", "desktop", "music", "videos"]:
+                if loc in command_lower:
+                    return loc
+            return "explorer"
+        for loc in ["downloads", "documents", "pictures", "desktop", "music", "videos"]:
+            if loc in command_lower:
+                return loc
+        return None
+    if intent == "web_browsing":
+        if "search" in command_lower or "google" in command_lower or "look up" in command_lower:
+            for phrase in ["search for", "google", "look up", "find"]:
+                if phrase in command_lower:
+                    command_lower.split(phrase, 1)[1].strip()
+                    break
+            return "youtube" if "youtube" in command_lower else "bing" if "bing" in command_lower else "search"
+        if "open" in command_lower and ("website" in command_lower or "site" in command_lower or ".com" in command_lower):
+            return "open"
+        if "fetch" in command_lower or "get content" in command_lower or "read page" in command_lower:
+            return "fetch"
+        if "news" in command_lower or "headlines" in command_lower:
+            return "news"
+        return None
+    if intent == "email":
+        if "check" in command_lower or "any email" in command_lower or "new email" in command_lower:
+            return "check"
+        if "unread" in command_lower or "how many" in command_lower:
+            return "unread"
+        if "read" in command_lower:
+            return "second" if "second" in command_lower else "third" if "third" in command_lower else "read"
+        return None
+    if intent == "app_automation":
+        if "type" in command_lower or "write" in command_lower:
+            for app in ["word", "notepad", "notepad++", "excel"]:
+                if app in command_lower or app.replace("++", " plus plus") in command_lower:
+                    return app
+            return "type"
+        if "draft email" in command_lower or "compose email" in command_lower:
+            return "draft"
+        if "screenshot" in command_lower or "screen capture" in command_lower:
+            return "screenshot"
+        if "copy" in command_lower and "clipboard" in command_lower:
+            return "copy"
+        if "paste" in command_lower:
+            return "paste"
+        if "press" in command_lower:
+            keys = [k for k in ("ctrl", "control", "alt", "shift") if k in command_lower]
+            return "press" if keys else None
+        return None
+    return None
+
+
+def legacy_dispatch():
+    for intent, command in CORPUS:
+        legacy_route(intent, command)
+
+
+def build_registry():
+    registry = HandlerRegistry()
+    noop = lambda action, params, command, matches: None
+    for intent in ("file_operation", "web_browsing", "email", "app_automation"):
+        registry.register(intent, noop, INTENT_PATTERNS[intent])
+    return registry
+
+
+def registry_dispatch(registry):
+    for intent, command in CORPUS:
+        registry.dispatch(intent, "", {}, command)
+
+
+def bench_scaling(sizes=(30, 300, 3000), number=200):
+    """Phrase-table growth: substring scans are linear in phrases, the matcher is not."""
+    rng = random.Random(1)
+    commands = [command for _, command in CORPUS]
+    print("\nPhrases  substring us/cmd  matcher us/cmd  speedup")
+    for size in sizes:
+        phrases = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+            for _ in range(size)
+        ]
+        matcher = PhraseMatcher({f"label{i}": [phrase] for i, phrase in enumerate(phrases)})
+
+        def substring():
+            for command in commands:
+                [phrase for phrase in phrases if phrase in command]
+
+        def compiled():
+            for command in commands:
+                matcher.scan(command)
+
+        per_command = number * len(commands)
+        legacy = timeit.timeit(substring, number=number) / per_command * 1e6
+        table = timeit.timeit(compiled, number=number) / per_command * 1e6
+        print(f"{size:7d}  {legacy:16.2f}  {table:14.2f}  {legacy / table:6.2f}x")
+
+
+def main():
+    number = 20000
+    registry = build_registry()
+
+    legacy = timeit.timeit(legacy_dispatch, number=number)
+    table = timeit.timeit(lambda: registry_dispatch(registry), number=number)
+    per_command = number * len(CORPUS)
+
+    print(f"Commands per run:     {len(CORPUS)} x {number}")
+    print(f"Legacy substring:     {legacy / per_command * 1e6:.2f} us/command")
+    print(f"Registry + matchers:  {table / per_command * 1e6:.2f} us/command")
+    print(f"Ratio:                {legacy / table:.2f}x")
+    bench_scaling()
+
+
+if __name__ == "__main__":
+    main()
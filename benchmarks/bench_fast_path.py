@@ -0,0 +1,52 @@
+"""
+Microbenchmark: fast-path matching cost as the phrase table grows.
+
+Run: python benchmarks/bench_fast_path.py
+"""
+import random
+import string
+import sys
+import timeit
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.fast_path import FastCommandEngine
+from utils.performance import FAST_COMMANDS
+
+COMMANDS = [
+    "what time is it",
+    "what's the weather today",
+    "weather in new york",
+    "open calc",
+    "next song please",
+    "set a timer for 5 minutes",
+    "check for updates",
+    "tell me a joke about computers",
+]
+
+
+def main(number=20000):
+    rng = random.Random(1)
+    print("Extra phrases  us/command")
+    for extra in (0, 100, 1000, 10000):
+        overrides = {
+            f"custom{i}": [" ".join(
+                "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+                for _ in range(rng.randint(1, 3))
+            )]
+            for i in range(extra)
+        }
+        engine = FastCommandEngine(FAST_COMMANDS, overrides=overrides)
+
+        def run():
+            for command in COMMANDS:
+                engine.match(command)
+
+        elapsed = timeit.timeit(run, number=number // 10)
+        print(f"{extra:13d}  {elapsed / (number // 10) / len(COMMANDS) * 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
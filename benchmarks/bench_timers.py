@@ -0,0 +1,91 @@
+"""
+Benchmark: thread-per-timer vs the shared heap scheduler.
+
+Schedules N timers, cancels half, and reports wall time, peak thread count
+and firing lateness.
+
+Run: python benchmarks/bench_timers.py
+"""
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from utils.scheduler import Scheduler
+
+
+def run_threads(count, delay):
+    """The old TimerManager model: one sleeping thread per timer, no real cancel."""
+    lateness = []
+    lock = threading.Lock()
+    cancelled = set(range(0, count, 2))
+
+    def worker(index, deadline):
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        if index in cancelled:
+            return  # Old cancel only hid the timer; the thread still woke up
+        with lock:
+            lateness.append(time.monotonic() - deadline)
+            peak[0] = max(peak[0], threading.active_count())
+
+    peak = [0]
+    start = time.perf_counter()
+    threads = []
+    for index in range(count):
+        thread = threading.Thread(target=worker, args=(index, time.monotonic() + delay), daemon=True)
+        thread.start()
+        threads.append(thread)
+    setup = time.perf_counter() - start
+    peak[0] = max(peak[0], threading.active_count())
+    for thread in threads:
+        thread.join()
+    return setup, peak[0], lateness
+
+
+def run_scheduler(count, delay):
+    scheduler = Scheduler(name="bench-scheduler")
+    lateness = []
+    lock = threading.Lock()
+    remaining = threading.Semaphore(0)
+
+    def fire(deadline):
+        with lock:
+            lateness.append(time.monotonic() - deadline)
+            peak[0] = max(peak[0], threading.active_count())
+        remaining.release()
+
+    peak = [0]
+    start = time.perf_counter()
+    tasks = []
+    for _ in range(count):
+        deadline = time.monotonic() + delay
+        tasks.append(scheduler.schedule_at(deadline, fire, deadline))
+    for task in tasks[::2]:
+        scheduler.cancel(task)
+    setup = time.perf_counter() - start
+    peak[0] = max(peak[0], threading.active_count())
+    for _ in range(count - len(tasks[::2])):
+        remaining.acquire()
+    scheduler.shutdown()
+    return setup, peak[0], lateness
+
+
+def report(name, count, setup, peak, lateness):
+    p99 = sorted(lateness)[int(len(lateness) * 0.99) - 1] if lateness else 0.0
+    print(f"{name:<12} {count:>6} {setup * 1000:>10.1f} {peak:>8} "
+          f"{statistics.median(lateness) * 1000:>10.2f} {p99 * 1000:>10.2f}")
+
+
+def main(delay=1.0):
+    print(f"{'model':<12} {'timers':>6} {'setup ms':>10} {'threads':>8} {'p50 late':>10} {'p99 late':>10}")
+    for count in (100, 1000, 5000):
+        report("threads", count, *run_threads(count, delay))
+        report("scheduler", count, *run_scheduler(count, delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""On-demand capability loading with startup cost reporting."""
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CapabilityLoader:
+    """Registry of capabilities that are imported and constructed on first use."""
+
+    def __init__(self):
+        self.logger = logging.getLogger('jarvis.capabilities')
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self.report: Dict[str, Dict[str, Any]] = {}
+        self._prewarm_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, module: str, class_name: str, **kwargs):
+        """
+        Register a capability without importing it.
+
+        Args:
+            name: Attribute name the assistant exposes it under
+            module: Module path, e.g. "capabilities.weather"
+            class_name: Class to construct
+            **kwargs: Constructor arguments
+        """
+        self._specs[name] = {"module": module, "class": class_name, "kwargs": kwargs}
+        self._locks[name] = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a capability has been constructed."""
+        return name in self._instances
+
+    def get(self, name: str) -> Any:
+        """
+        Get a capability, importing and constructing it on first use.
+
+        Raises:
+            KeyError: If the capability is not registered
+            Exception: Whatever the import or constructor raised
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        spec = self._specs[name]
+        with self._locks[name]:
+            # Another thread may have finished loading while we waited
+            if name in self._instances:
+                return self._instances[name]
+
+            entry = {"module": spec["module"], "import_ms": 0.0, "init_ms": 0.0,
+                     "thread": threading.current_thread().name, "error": None}
+            self.report[name] = entry
+            try:
+                start = time.perf_counter()
+                module = importlib.import_module(spec["module"])
+                entry["import_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+                start = time.perf_counter()
+                instance = getattr(module, spec["class"])(**spec["kwargs"])
+                entry["init_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            except Exception as e:
+                entry["error"] = str(e)
+                self.logger.error(f"Failed to load capability {name}: {e}")
+                raise
+
+            self._instances[name] = instance
+            self.logger.info(
+                f"Loaded {name} (import {entry['import_ms']}ms, init {entry['init_ms']}ms)"
+            )
+            return instance
+
+    def prewarm(self, names: Optional[List[str]] = None, delay: float = 0.0,
+                then: Optional[Callable[[], None]] = None) -> threading.Thread:
+        """
+        Load capabilities in a background thread.
+
+        Args:
+            names: Capabilities to load, in order (default: all registered)
+            delay: Seconds to wait first so prewarming does not compete with startup
+            then: Called on the same thread once loading is done
+
+        Returns:
+            The daemon thread doing the work
+        """
+        names = list(names) if names is not None else list(self._specs)
+
+        def run():
+            if delay:
+                time.sleep(delay)
+            for name in names:
+                if name in self._specs and not self.is_loaded(name):
+                    try:
+                        self.get(name)
+                    except Exception:
+                        pass  # Logged by get(); the capability retries on first use
+            if then is not None:
+                try:
+                    then()
+                except Exception as e:
+                    self.logger.error(f"Post-prewarm step failed: {e}")
+
+        self._prewarm_thread = threading.Thread(target=run, name="capability-prewarm", daemon=True)
+        self._prewarm_thread.start()
+        return self._prewarm_thread
+
+    def startup_report(self) -> List[Dict[str, Any]]:
+        """Get per-capability import and init cost, most expensive first."""
+        rows = [dict(entry, name=name) for name, entry in self.report.items()]
+        rows.sort(key=lambda row: row["import_ms"] + row["init_ms"], reverse=True)
+        return rows
+
+    def format_report(self) -> str:
+        """Render the startup report as a text table."""
+        lines = [f"{'capability':<20} {'import ms':>10} {'init ms':>10}  loaded by"]
+        for row in self.startup_report():
+            status = f"ERROR: {row['error']}" if row["error"] else row["thread"]
+            lines.append(f"{row['name']:<20} {row['import_ms']:>10.1f} {row['init_ms']:>10.1f}  {status}")
+        pending = [name for name in self._specs if name not in self.report]
+        if pending:
+            lines.append(f"not loaded yet: {', '.join(pending)}")
+        return "\n".join(lines)
+
+
+class LazyCapability:
+    """Class attribute that resolves to a CapabilityLoader entry on first access."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.capabilities.get(self.name)
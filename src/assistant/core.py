@@ -1,8 +1,5 @@
 """Core assistant module that coordinates all components."""
-from typing import Optional, Any
-import sounddevice as sd
-import numpy as np
-import speech_recognition as sr
+from typing import Optional, Any, Dict
 from io import BytesIO
 import wave
 import struct
@@ -10,27 +7,54 @@ import threading
 import time
 import sys
 import os
+import re
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from llm.local_llm import LocalLLM
-from auth.voice_auth import VoiceAuthenticator
-from capabilities.system_control import SystemController
-from capabilities.web_search import WebSearcher
-from capabilities.weather import WeatherService
-from capabilities.calculator import Calculator
-from capabilities.timer import TimerManager
-from capabilities.media_control import MediaController
-from capabilities.app_discovery import AppDiscovery
-from capabilities.email_manager import EmailManager
-from capabilities.web_automation import WebAutomation
-from capabilities.app_automation import AppAutomation
+from llm.intent import HedgedIntentResolver, KeywordIntentClassifier
+from llm.scheduler import get_llm_scheduler
+from llm.summarizer import PageSummarizer
+from assistant.registry import HandlerRegistry, PhraseMatcher, INTENT_PATTERNS
+from utils.fast_path import FastCommandEngine
+from utils.logging_config import JARVISLogger
+from assistant.capability_loader import CapabilityLoader, LazyCapability
+from utils.http_cache import configure_session
+from utils.lazy_import import lazy_import
+from utils.scheduler import get_scheduler
+
+# Audio stacks are only needed once we actually listen; keep them off the import path
+sd = lazy_import('sounddevice')
+np = lazy_import('numpy')
+sr = lazy_import('speech_recognition')
+
+
+def _is_unit_conversion(text: str) -> bool:
+    """Whether a command names a quantity and two known units (loads the unit table on first use)."""
+    from capabilities.units import get_registry
+    return get_registry().parse(text) is not None
 
 
 class Assistant:
     """Main assistant class that coordinates speech recognition, synthesis, and command handling."""
     
+    FOLDER_LOCATIONS = ("downloads", "documents", "pictures", "desktop", "music", "videos")
+    TYPING_APPS = ("word", "notepad++", "notepad", "excel")
+    
+    # Capabilities are imported and constructed on first use (see _register_capabilities)
+    authenticator = LazyCapability()
+    system_controller = LazyCapability()
+    web_searcher = LazyCapability()
+    weather_service = LazyCapability()
+    calculator = LazyCapability()
+    media_controller = LazyCapability()
+    app_discovery = LazyCapability()
+    email_manager = LazyCapability()
+    web_automation = LazyCapability()
+    news = LazyCapability()
+    app_automation = LazyCapability()
+    
     def __init__(self, config=None, health_monitor=None):
         """Initialize the assistant with all required components."""
         import logging
@@ -38,7 +62,8 @@ class Assistant:
         self.config = config
         self.health_monitor = health_monitor
         
-        self.recognizer = sr.Recognizer()
+        self._recognizer = None
+        self._page_summarizer = None
         self.sample_rate = 16000 if not config else config.get('audio.sample_rate', 16000)
         self.channels = 1
         self.tts = None
@@ -46,37 +71,207 @@ class Assistant:
         self.is_listening = False
         self.wake_word_detected = False
         self.running = True
+        self._turn = threading.local()  # Per-thread result of the command being dispatched
         
         # Initialize all capability modules
         model_name = "llama3.2:3b" if not config else config.get('llm.model', 'llama3.2:3b')
         self.llm = LocalLLM(model=model_name)
-        self.authenticator = VoiceAuthenticator()
-        
-        require_auth = True if not config else config.get('security.require_auth_for_system', True)
-        self.system_controller = SystemController(require_auth=require_auth)
-        
-        self.web_searcher = WebSearcher()
-        self.weather_service = WeatherService()
-        self.calculator = Calculator()
-        self.timer_manager: Optional[TimerManager] = None  # Initialize after TTS is ready
-        self.media_controller = MediaController()
-        self.app_discovery = AppDiscovery()
-        self.email_manager = EmailManager()
-        self.web_automation = WebAutomation()
-        self.app_automation = AppAutomation()
+        self.intent_resolver = HedgedIntentResolver(
+            self.llm,
+            classifier=KeywordIntentClassifier(validators={"convert": _is_unit_conversion}),
+            budget_ms=2500 if not config else config.get('llm.intent_budget_ms', 2500),
+            hedge_ms=600 if not config else config.get('llm.intent_hedge_ms', 600),
+            accept_confidence=0.85 if not config else config.get('llm.local_intent_confidence', 0.85),
+        )
+        self._configure_http()
+        self.capabilities = CapabilityLoader()
+        self._register_capabilities()
+        self.timer_manager = None  # Initialize after TTS is ready
+        
+        # Intent -> handler dispatch table, matchers compiled once
+        self.handlers = HandlerRegistry()
+        self._register_handlers()
+        self.exit_matcher = PhraseMatcher(INTENT_PATTERNS["exit"])
+        
+        # Fast path: FAST_COMMANDS (plus config additions) compiled into one automaton
+        fast_enabled = True if not config else config.get('performance.enable_fast_commands', True)
+        fast_overrides = None if not config else config.get('performance.fast_commands')
+        self.fast_path = FastCommandEngine(overrides=fast_overrides) if fast_enabled else None
+        self._register_fast_actions()
         
         # Voice-first mode: minimize console output
         self.verbose = False if not config else config.get('assistant.verbose', False)
         
         # Command cache for speed
         cache_enabled = True if not config else config.get('performance.enable_cache', True)
-        cache_size = 100 if not config else config.get('performance.cache_size', 100)
+        self.cache_size = 100 if not config else config.get('performance.cache_size', 100)
         self.command_cache = {} if cache_enabled else None
         self.cache_hits = 0
         
         self.logger.info("Assistant components initialized")
         self.verbose = False
         
+    def _configure_http(self) -> None:
+        """Set up the pooled, caching HTTP session every capability shares."""
+        config = self.config
+        cache_enabled = True if not config else config.get('http_cache.enabled', True)
+        cache_path = "data/http_cache.db" if not config else config.get('http_cache.path', "data/http_cache.db")
+        max_mb = 50 if not config else config.get('http_cache.max_mb', 50)
+        session = configure_session(
+            cache_path if cache_enabled else None,
+            max_bytes=int(max_mb * 1024 * 1024),
+            memory_entries=128 if not config else config.get('http_cache.memory_entries', 128),
+            pool_maxsize=16 if not config else config.get('http_cache.pool_maxsize', 16),
+        )
+        if self.health_monitor:
+            self.health_monitor.add_source("http", session.report)
+    
+    def _register_capabilities(self) -> None:
+        """Register capability modules; nothing is imported until first use."""
+        config = self.config
+        require_auth = True if not config else config.get('security.require_auth_for_system', True)
+        
+        register = self.capabilities.register
+        register("authenticator", "auth.voice_auth", "VoiceAuthenticator")
+        register("system_controller", "capabilities.system_control", "SystemController", require_auth=require_auth)
+        register("web_searcher", "capabilities.web_search", "WebSearcher")
+        register("weather_service", "capabilities.weather", "WeatherService",
+                 cache_ttl=600 if not config else config.get('weather.cache_ttl', 600),
+                 stale_ttl=3600 if not config else config.get('weather.stale_ttl', 3600),
+                 timeout=10 if not config else config.get('weather.timeout', 10),
+                 history_path="data/weather_history" if not config else config.get(
+                     'storage.weather_history_path', "data/weather_history"),
+                 fetch_workers=2 if not config else config.get('weather.prefetch_concurrency', 2),
+                 cache_entries=256 if not config else config.get('weather.cache_entries', 256))
+        register("calculator", "capabilities.calculator", "Calculator")
+        register("media_controller", "capabilities.media_control", "MediaController")
+        register("app_discovery", "capabilities.app_discovery", "AppDiscovery")
+        register("email_manager", "capabilities.email_manager", "EmailManager",
+                 preview_bytes=2048 if not config else config.get('mail.preview_bytes', 2048),
+                 cache_size=50 if not config else config.get('mail.cache_size', 50),
+                 idle_timeout=540 if not config else config.get('mail.idle_timeout', 540),
+                 spool_path="data/mail_spool" if not config else config.get(
+                     'storage.mail_spool_path', "data/mail_spool"),
+                 smtp_keepalive=60 if not config else config.get('mail.smtp_keepalive', 60),
+                 send_attempts=6 if not config else config.get('mail.send_attempts', 6))
+        register("web_automation", "capabilities.web_automation", "WebAutomation",
+                 fetch_workers=4 if not config else config.get('web.fetch_workers', 4),
+                 fetch_timeout=10 if not config else config.get('web.fetch_timeout', 10),
+                 fetch_deadline=12 if not config else config.get('web.fetch_deadline', 12),
+                 max_page_bytes=2_000_000 if not config else config.get('web.max_page_bytes', 2_000_000),
+                 max_page_chars=5000 if not config else config.get('web.max_page_chars', 5000),
+                 download_workers=4 if not config else config.get('web.download_workers', 4),
+                 download_parallel_mb=16 if not config else config.get('web.download_parallel_mb', 16))
+        register("news", "capabilities.news", "NewsAggregator",
+                 topics=["world"] if not config else config.get('news.topics', ["world"]),
+                 feeds={} if not config else config.get('news.feeds', {}),
+                 cache_ttl=900 if not config else config.get('news.cache_ttl', 900),
+                 stale_ttl=3600 if not config else config.get('news.stale_ttl', 3600),
+                 fetch_workers=4 if not config else config.get('news.fetch_workers', 4),
+                 deadline=6 if not config else config.get('news.deadline', 6),
+                 cache_entries=64 if not config else config.get('news.cache_entries', 64))
+        register("app_automation", "capabilities.app_automation", "AppAutomation")
+        persist_timers = True if not config else config.get('storage.persist_timers', True)
+        timers_path = "data/timers" if not config else config.get('storage.timers_path', "data/timers")
+        register("timer_manager", "capabilities.timer", "TimerManager", speak_callback=self.speak,
+                 store_path=timers_path if persist_timers else None)
+    
+    def prewarm_capabilities(self) -> None:
+        """Load capabilities, then start background services, off the startup path."""
+        names = None if not self.config else self.config.get('performance.prewarm_order')
+        if self.config and not self.config.get('performance.prewarm_capabilities', True):
+            names = []  # Services still start; they load what they need themselves
+        delay = 2.0 if not self.config else self.config.get('performance.prewarm_delay', 2.0)
+        self.capabilities.prewarm(names, delay=delay, then=self.start_background_services)
+    
+    def start_background_services(self) -> None:
+        """Start prefetching and the mail session; each loads its capability on first use."""
+        for start in (self.start_weather_prefetch, self.start_news_prefetch, self.start_mail_session):
+            try:
+                start()
+            except Exception as e:
+                self.logger.error(f"Failed to start {start.__name__}: {e}")
+    
+    def start_weather_prefetch(self) -> None:
+        """Refresh the usual weather locations in the background so answers come from cache."""
+        config = self.config
+        if config and not config.get('weather.prefetch_enabled', True):
+            return
+        self.weather_service.start_prefetch(
+            get_scheduler(),
+            locations=[] if not config else config.get('weather.prefetch_locations', []),
+            interval=540 if not config else config.get('weather.prefetch_interval', 540),
+            top_n=3 if not config else config.get('weather.prefetch_top_locations', 3),
+            active_hours=None if not config else config.get('weather.prefetch_hours'),
+        )
+        if self.health_monitor:
+            self.health_monitor.add_source("weather", self.weather_service.cache_report)
+    
+    def start_news_prefetch(self) -> None:
+        """Refresh the configured news topics in the background so headlines come from cache."""
+        config = self.config
+        if config and not config.get('news.prefetch_enabled', True):
+            return
+        self.news.start_prefetch(
+            get_scheduler(),
+            interval=840 if not config else config.get('news.prefetch_interval', 840),
+        )
+        if self.health_monitor:
+            self.health_monitor.add_source("news", self.news.cache_report)
+    
+    def start_mail_session(self) -> None:
+        """Keep the mailbox open with IDLE so email questions are answered from memory."""
+        config = self.config
+        # Sends mail queued before the last shutdown
+        outbox = self.email_manager.start_outbox(on_failed=self._announce_send_failure)
+        if outbox and self.health_monitor:
+            self.health_monitor.add_source("outbox", outbox.report)
+        if config and not config.get('mail.session_enabled', True):
+            return
+        announce = False if not config else config.get('mail.announce_new_mail', False)
+        session = self.email_manager.start_session(on_new_mail=self._announce_mail if announce else None)
+        if session and self.health_monitor:
+            self.health_monitor.add_source("mail", session.report)
+    
+    def _announce_send_failure(self, record: dict) -> None:
+        self.speak(f"I couldn't send your email {record['description']}")
+    
+    def _announce_mail(self, emails: list) -> None:
+        if len(emails) == 1:
+            self.speak(f"New email from {emails[0]['from']}: {emails[0]['subject']}")
+        else:
+            self.speak(f"You have {len(emails)} new emails. Latest from {emails[0]['from']}")
+    
+    @property
+    def page_summarizer(self) -> PageSummarizer:
+        """Cached map-reduce page summaries, created on first use."""
+        if self._page_summarizer is None:
+            from utils.journal_store import JournalStore
+            config = self.config
+            path = "data/page_summaries" if not config else config.get(
+                'storage.summary_cache_path', "data/page_summaries")
+            scheduler = get_llm_scheduler(2 if not config else config.get('llm.max_concurrent', 2))
+            self._page_summarizer = PageSummarizer(
+                self.llm.complete,
+                scheduler=scheduler,
+                store=JournalStore(path),
+                ttl=3600 if not config else config.get('summary.ttl', 3600),
+                chunk_chars=3000 if not config else config.get('summary.chunk_chars', 3000),
+                max_chunks=8 if not config else config.get('summary.max_chunks', 8),
+                max_entries=200 if not config else config.get('summary.max_entries', 200),
+            )
+            if self.health_monitor:
+                self.health_monitor.add_source("summaries", self._page_summarizer.report)
+                self.health_monitor.add_source("llm_scheduler", scheduler.report)
+        return self._page_summarizer
+    
+    @property
+    def recognizer(self):
+        """Speech recognizer, created on first use so text-only callers never load it."""
+        if self._recognizer is None:
+            self._recognizer = sr.Recognizer()
+        return self._recognizer
+
     def initialize(self) -> None:
         """Initialize the text-to-speech engine and calibrate microphone."""
         try:
@@ -92,17 +287,6 @@ class Assistant:
             self.tts.setProperty('rate', voice_rate)
             self.tts.setProperty('volume', voice_volume)
             
-            # Fast command patterns (skip LLM for common commands)
-            self.fast_patterns = {
-                'time': ['time', 'what time'],
-                'date': ['date', 'what day', 'today'],
-                'weather': ['weather'],
-                'email': ['check email', 'check my email', 'any email'],
-                'explorer': ['file explorer', 'open explorer'],
-                'downloads': ['downloads', 'download folder'],
-                'calculator': ['calculator', 'open calc'],
-            }
-            
             self.logger.info("TTS initialized successfully")
             
             # Test microphone
@@ -122,12 +306,16 @@ class Assistant:
                     self.speak("Authentication setup failed. Please try again later.")
             
             # Initialize timer manager with speech callback
-            self.timer_manager = TimerManager(speak_callback=self.speak)
+            self.timer_manager = self.capabilities.get("timer_manager")
             
             print("\nInitialization complete!")
             self.speak("JARVIS online. All systems operational.")
             self.is_initialized = True
             
+            # Load the remaining capabilities and start background services
+            # off the critical path
+            self.prewarm_capabilities()
+            
         except Exception as e:
             print(f"Initialization error: {e}")
             self.is_initialized = False
@@ -143,44 +331,25 @@ class Assistant:
         except Exception as e:
             print(f"Speech error: {e}")
     
+    def respond(self, text: str) -> None:
+        """Send a reply to the current command's result and, in voice mode, speak it."""
+        turn = getattr(self._turn, "result", None)
+        if turn is not None:
+            turn["responses"].append(text)
+            if not turn["speak"]:
+                return
+        self.speak(text)
+    
+    def _listen_for_reply(self) -> Optional[str]:
+        """Ask the user for follow-up input; text-only dispatch has no microphone."""
+        turn = getattr(self._turn, "result", None)
+        if turn is not None and not turn["speak"]:
+            return None
+        return self.listen()
+    
     def _get_response_for_command(self, command: str) -> str:
         """Get text response for a command without speaking (for API)."""
-        from datetime import datetime
-        import re
-        
-        command_lower = command.lower()
-        
-        # Time
-        if 'time' in command_lower:
-            current_time = datetime.now().strftime("%I:%M %p")
-            return f"The time is {current_time}"
-        
-        # Date
-        if 'date' in command_lower:
-            current_date = datetime.now().strftime("%B %d, %Y")
-            return f"Today is {current_date}"
-        
-        # Greetings
-        if any(word in command_lower for word in ['hello', 'hi', 'hey']):
-            return "Hello! How can I help you?"
-        
-        # Weather
-        if 'weather' in command_lower:
-            result = self.weather_service.get_weather()
-            return result["message"]
-        
-        # Calculator
-        if any(word in command_lower for word in ['calculate', 'what is', 'plus', 'minus', 'times', 'divided']):
-            result = self.calculator.calculate(command)
-            if result["success"]:
-                return result["message"]
-        
-        # Use LLM for general conversation
-        try:
-            response = self.llm.chat(command)
-            return response
-        except:
-            return "I'm processing your request. How else can I help you?"
+        return self.dispatch(command, speak=False)["message"]
     
     def listen(self) -> Optional[str]:
         """Listen for voice input and convert to text using sounddevice."""
@@ -294,226 +463,338 @@ class Assistant:
                 print(f"Wake word detection error: {e}")
                 time.sleep(1)
     
-    def process_command(self, command: str) -> None:
-        """Process a voice command using LLM intelligence."""
+    def process_command(self, command: str) -> Dict[str, Any]:
+        """Process a voice command using LLM intelligence and speak the reply."""
+        return self.dispatch(command, speak=True)
+    
+    def dispatch(self, command: str, speak: bool = True) -> Dict[str, Any]:
+        """
+        Route a command through the fast path, intent cache and capability handlers.
+        
+        Args:
+            command: The user's command text
+            speak: Speak replies as they are produced; False gives a text-only
+                   result for the API and GUIs (follow-up questions are skipped)
+            
+        Returns:
+            Result dictionary with success, message, responses, actions, intent and timing
+        """
+        result = {
+            "success": True,
+            "message": "",
+            "responses": [],
+            "actions": [],
+            "intent": None,
+            "timing": {},
+            "speak": speak,
+        }
         if not command:
-            return
+            result["success"] = False
+            return result
         
+        start = time.perf_counter()
+        self._turn.result = result
+        try:
+            self._route_command(command, result)
+        except Exception as e:
+            self.logger.error(f"Command dispatch error: {e}", exc_info=True)
+            result["success"] = False
+            self.respond(f"Sorry, I encountered an error: {e}")
+            if self.health_monitor:
+                # record_command below counts the failure
+                self.health_monitor.record_error(e, count=False)
+        finally:
+            self._turn.result = None
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        result["timing"]["total_ms"] = round(total_ms, 2)
+        result["message"] = " ".join(result["responses"])
+        del result["speak"]
+        
+        if self.health_monitor:
+            self.health_monitor.record_command(success=result["success"], response_time=total_ms)
+        JARVISLogger.log_command(command, result["intent"], total_ms)
+        return result
+    
+    def _route_command(self, command: str, result: Dict[str, Any]) -> None:
+        """Resolve intent and invoke the matching capability handler."""
         if self.verbose:
             print(f"\n🧠 Processing: {command}")
         
         command_lower = command.lower()
+        timing = result["timing"]
         
         # Fast path: Check common patterns first (no LLM needed)
-        if self._handle_fast_command(command_lower):
+        t0 = time.perf_counter()
+        handled = self._handle_fast_command(command_lower)
+        timing["fast_path_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        if handled:
+            result["intent"] = "fast_path"
+            result["actions"].append({"intent": "fast_path", "action": handled})
             return
         
         # Check cache for repeated commands
-        if command_lower in self.command_cache:
+        t0 = time.perf_counter()
+        if self.command_cache is not None and command_lower in self.command_cache:
             intent_data = self.command_cache[command_lower]
             self.cache_hits += 1
+            if self.health_monitor:
+                self.health_monitor.record_cache_hit()
         else:
-            # Extract intent using LLM
-            intent_data = self.llm.extract_intent(command)
-            # Cache the result (limit cache size)
-            if len(self.command_cache) < 100:
+            # Local classifier and LLM race within the latency budget
+            intent_data = self.intent_resolver.resolve(command)
+            # Cache the result (limit cache size); timeouts are not answers
+            if (self.command_cache is not None and not intent_data.get("timed_out")
+                    and len(self.command_cache) < self.cache_size):
                 self.command_cache[command_lower] = intent_data
+        timing["intent_ms"] = round((time.perf_counter() - t0) * 1000, 2)
         
         intent = intent_data.get("intent", "general")
         action = intent_data.get("action", "chat")
         needs_permission = intent_data.get("needs_permission", False)
         parameters = intent_data.get("parameters", {})
+        result["intent"] = intent
+        result["actions"].append({
+            "intent": intent,
+            "action": action,
+            "parameters": parameters,
+            "source": intent_data.get("source", "cache"),
+        })
         
         if self.verbose:
-            print(f"Intent: {intent}, Action: {action}, Needs Auth: {needs_permission}")
+            print(f"Intent: {intent}, Action: {action}, Needs Auth: {needs_permission}, "
+                  f"Source: {intent_data.get('source')}")
         
         # Handle exit commands
-        if any(word in command for word in ["exit", "quit", "goodbye", "bye", "stop listening", "shut down", "power off"]):
-            self.speak("Goodbye sir.")
-            self.running = False
+        if self.exit_matcher.scan(command_lower):
+            self.respond("Goodbye sir.")
+            if result["speak"]:
+                self.running = False
+            return
+        
+        if intent_data.get("timed_out"):
+            if self.health_monitor:
+                self.health_monitor.record_intent_timeout()
+            self.logger.warning(f"Intent extraction timed out after {intent_data.get('latency_ms')}ms: {command}")
+            result["success"] = False
+            self.respond("Sorry, that took too long to understand. Please try again.")
             return
         
         # Check if authentication is needed
         if needs_permission and intent == "system_control":
             if not self.authenticator.is_authenticated:
-                self.speak("Voice authentication required for system access.")
-                if self.authenticator.authenticate():
+                self.respond("Voice authentication required for system access.")
+                if result["speak"] and self.authenticator.authenticate():
                     self.system_controller.authorize()
-                    self.speak("Access granted.")
+                    self.respond("Access granted.")
                 else:
-                    self.speak("Access denied. Command cancelled.")
+                    result["success"] = False
+                    self.respond("Access denied. Command cancelled.")
                     return
         
         # Route to appropriate capability
-        if intent == "system_control":
-            self._handle_system_control(action, parameters)
-        elif intent == "file_operation":
-            self._handle_file_operation(action, parameters, command)
-        elif intent == "search":
-            self._handle_search(action, parameters, command)
-        elif intent == "productivity":
-            self._handle_productivity(action, parameters, command)
-        elif intent == "weather":
-            self._handle_weather(action, parameters)
-        elif intent == "calculation":
-            self._handle_calculation(action, parameters, command)
-        elif intent == "media_control":
-            self._handle_media_control(action, parameters)
-        elif intent == "timer":
-            self._handle_timer(action, parameters, command)
-        elif intent == "email":
-            self._handle_email(action, parameters, command)
-        elif intent == "web_browsing":
-            self._handle_web_browsing(action, parameters, command)
-        elif intent == "app_automation":
-            self._handle_app_automation(action, parameters, command)
-        else:
+        t0 = time.perf_counter()
+        if not self.handlers.dispatch(intent, action, parameters, command):
             # Use LLM for general conversation
             response = self.llm.chat(command)
-            self.speak(response)
+            self.respond(response)
+        timing["handler_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    
+    def _handle_fast_command(self, command: str) -> Optional[str]:
+        """Handle common commands instantly without LLM. Returns the handled action or None."""
+        if not self.fast_path:
+            return None
+        
+        match = self.fast_path.match(command)
+        if not match:
+            return None
+        
+        handler = self._fast_actions.get(match["action"])
+        if handler is None:
+            return None
+        handler(match["slots"])
+        return match["action"]
     
-    def _handle_fast_command(self, command: str) -> bool:
-        """Handle common commands instantly without LLM. Returns True if handled."""
+    def _register_fast_actions(self) -> None:
+        """Map FAST_COMMANDS actions to their handlers."""
         from datetime import datetime
         
-        # Time
-        if 'time' in command and not 'timer' in command:
-            current_time = datetime.now().strftime("%I:%M %p")
-            self.speak(f"{current_time}")
-            return True
-        
-        # Date
-        if 'date' in command or ('what' in command and 'day' in command):
-            current_date = datetime.now().strftime("%A, %B %d")
-            self.speak(current_date)
-            return True
-        
-        # Calculator
-        if 'calculator' in command or 'open calc' in command:
-            self.speak("Opening Calculator")
-            import subprocess
-            subprocess.Popen('calc.exe')
-            return True
-        
-        # File Explorer
-        if 'file explorer' in command or 'open explorer' in command:
-            if 'download' in command:
-                self.app_discovery.open_system_location('downloads')
-            elif 'document' in command:
-                self.app_discovery.open_system_location('documents')
-            elif 'picture' in command:
-                self.app_discovery.open_system_location('pictures')
-            else:
-                self.app_discovery.open_file_explorer()
-            self.speak("Done")
-            return True
+        def say_time(slots):
+            self.respond(datetime.now().strftime("%I:%M %p"))
         
-        # Downloads folder
-        if 'download' in command and 'folder' in command:
-            self.app_discovery.open_system_location('downloads')
-            self.speak("Downloads")
-            return True
+        def say_date(slots):
+            self.respond(datetime.now().strftime("%A, %B %d"))
         
-        # Weather (quick check)
-        if command.startswith('weather') or command.startswith('what') and 'weather' in command:
-            result = self.weather_service.get_weather()
-            self.speak(result["message"])
-            return True
+        def weather(slots):
+            self.respond(self.weather_service.get_weather(slots.get("location"))["message"])
         
-        return False
+        def open_app(name, label):
+            def handler(slots):
+                import subprocess
+                self.respond(f"Opening {label}")
+                resolved = self.app_discovery.resolve_launch(name)
+                if not resolved:
+                    subprocess.Popen(f"{name}.exe")
+                    return
+                try:
+                    subprocess.Popen(resolved["argv"])
+                    self.app_discovery.record_launch(name, resolved)
+                except OSError:
+                    self.app_discovery.forget_launch(name)
+                    raise
+            return handler
+        
+        def open_location(location):
+            def handler(slots):
+                self.respond(self.app_discovery.open_system_location(location)["message"])
+            return handler
+        
+        def explorer(slots):
+            self.app_discovery.open_file_explorer()
+            self.respond("Done")
+        
+        def media(method):
+            def handler(slots):
+                self.respond(getattr(self.media_controller, method)()["message"])
+            return handler
+        
+        self._fast_actions = {
+            "greeting": lambda slots: self.respond("Hello! How can I help you?"),
+            "time": say_time,
+            "date": say_date,
+            "weather": weather,
+            "calculator": open_app("calc", "Calculator"),
+            "notepad": open_app("notepad", "Notepad"),
+            "paint": open_app("mspaint", "Paint"),
+            "explorer": explorer,
+            "downloads": open_location("downloads"),
+            "documents": open_location("documents"),
+            "pictures": open_location("pictures"),
+            "desktop": open_location("desktop"),
+            "play": media("play_pause"),
+            "pause": media("play_pause"),
+            "next": media("next_track"),
+            "previous": media("previous_track"),
+            "volume up": media("volume_up"),
+            "volume down": media("volume_down"),
+            "mute": media("mute"),
+        }
+    
+    def _register_handlers(self) -> None:
+        """Register capability handlers and compile their phrase matchers once."""
+        media_actions = {
+            "play_pause": "play_pause",
+            "play": "play_pause",
+            "pause": "play_pause",
+            "next": "next_track",
+            "next_track": "next_track",
+            "previous": "previous_track",
+            "previous_track": "previous_track",
+            "volume_up": "volume_up",
+            "volume_down": "volume_down",
+            "mute": "mute",
+        }
+        system_actions = {
+            "lock_screen": "lock_screen",
+            "screenshot": "take_screenshot",
+        }
+        
+        register = self.handlers.register
+        register("system_control", self._handle_system_control,
+                 actions={name: self._capability_action("system_controller", method)
+                          for name, method in system_actions.items()})
+        register("file_operation", self._handle_file_operation, INTENT_PATTERNS["file_operation"])
+        register("search", self._handle_search, INTENT_PATTERNS["search"])
+        register("productivity", self._handle_productivity, INTENT_PATTERNS["productivity"])
+        register("weather", self._handle_weather)
+        register("calculation", self._handle_calculation, INTENT_PATTERNS["calculation"])
+        register("media_control", self._handle_media_control,
+                 actions={name: self._capability_action("media_controller", method)
+                          for name, method in media_actions.items()})
+        register("timer", self._handle_timer, INTENT_PATTERNS["timer"])
+        register("email", self._handle_email, INTENT_PATTERNS["email"])
+        register("web_browsing", self._handle_web_browsing, INTENT_PATTERNS["web_browsing"])
+        register("app_automation", self._handle_app_automation, INTENT_PATTERNS["app_automation"])
+    
+    def _capability_action(self, capability: str, method: str):
+        """Wrap a no-argument capability method as a registry action handler (loaded on call)."""
+        def handler(action: str, params: dict, command: str, matches: dict):
+            self.respond(getattr(self.capabilities.get(capability), method)()["message"])
+        return handler
     
-    def _handle_system_control(self, action: str, params: dict):
+    def _handle_system_control(self, action: str, params: dict, command: str, matches: dict):
         """Handle system control actions."""
         if action == "open_app":
             app_name = params.get("app", "")
             
-            # Try smart app discovery first
-            app_path = self.app_discovery.find_application(app_name)
-            if app_path:
-                result = self.system_controller.open_application(app_path)
+            # Launch cache first, then smart app discovery
+            resolved = self.app_discovery.resolve_launch(app_name)
+            if resolved:
+                result = self.system_controller.open_application(app_name, argv=resolved["argv"])
+                if result["success"]:
+                    self.app_discovery.record_launch(app_name, resolved)
+                elif resolved["cached"]:
+                    self.app_discovery.forget_launch(app_name)
             else:
                 # Fallback to default behavior
                 result = self.system_controller.open_application(app_name)
-            self.speak(result["message"])
+            self.respond(result["message"])
             
         elif action == "close_app":
             app_name = params.get("app", "")
             result = self.system_controller.close_application(app_name)
-            self.speak(result["message"])
-            
-        elif action == "lock_screen":
-            result = self.system_controller.lock_screen()
-            self.speak(result["message"])
+            self.respond(result["message"])
             
         elif action == "shutdown" or action == "restart":
             result = self.system_controller.shutdown_computer(action)
-            self.speak(result["message"])
-            
-        elif action == "screenshot":
-            result = self.system_controller.take_screenshot()
-            self.speak(result["message"])
+            self.respond(result["message"])
         
         else:
             # Use LLM to handle unclear system commands
             response = self.llm.chat(f"Help with system control: {params}")
-            self.speak(response)
+            self.respond(response)
     
-    def _handle_file_operation(self, action: str, params: dict, command: str):
+    def _handle_file_operation(self, action: str, params: dict, command: str, matches: dict):
         """Handle file operations including File Explorer."""
-        command_lower = command.lower()
+        location = next((loc for loc in self.FOLDER_LOCATIONS if loc in matches), None)
         
-        # Open File Explorer
-        if "file explorer" in command_lower or "explorer" in command_lower:
-            # Check if specific location mentioned
-            if "downloads" in command_lower:
-                result = self.app_discovery.open_system_location("downloads")
-            elif "documents" in command_lower:
-                result = self.app_discovery.open_system_location("documents")
-            elif "pictures" in command_lower or "photos" in command_lower:
-                result = self.app_discovery.open_system_location("pictures")
-            elif "desktop" in command_lower:
-                result = self.app_discovery.open_system_location("desktop")
-            elif "music" in command_lower:
-                result = self.app_discovery.open_system_location("music")
-            elif "videos" in command_lower:
-                result = self.app_discovery.open_system_location("videos")
+        # Open File Explorer, at a specific location if one is mentioned
+        if "explorer" in matches:
+            if location:
+                result = self.app_discovery.open_system_location(location)
             else:
                 result = self.app_discovery.open_file_explorer()
-            
-            self.speak(result["message"])
+            self.respond(result["message"])
         
         # Open specific folders
-        elif any(loc in command_lower for loc in ["downloads", "documents", "pictures", "desktop", "music", "videos"]):
-            for location in ["downloads", "documents", "pictures", "desktop", "music", "videos"]:
-                if location in command_lower:
-                    result = self.app_discovery.open_system_location(location)
-                    self.speak(result["message"])
-                    return
+        elif location:
+            result = self.app_discovery.open_system_location(location)
+            self.respond(result["message"])
         
         else:
-            self.speak("File operation not yet supported. Try opening File Explorer or folders like Downloads.")
+            self.respond("File operation not yet supported. Try opening File Explorer or folders like Downloads.")
     
-    def _handle_search(self, action: str, params: dict, command: str):
+    def _handle_search(self, action: str, params: dict, command: str, matches: dict):
         """Handle search operations."""
         query = params.get("query", command)
         
-        if "youtube" in command.lower():
+        if "youtube" in matches:
             result = self.web_searcher.search_youtube(query)
-            self.speak(result["message"])
-        elif "website" in command.lower() or "open" in command.lower():
+            self.respond(result["message"])
+        elif "website" in matches:
             url = params.get("url", query)
             result = self.web_searcher.open_website(url)
-            self.speak(result["message"])
+            self.respond(result["message"])
         else:
             # Try to get quick answer first
             quick_answer = self.web_searcher.get_quick_answer(query)
             if quick_answer and len(quick_answer) < 200:
-                self.speak(quick_answer)
+                self.respond(quick_answer)
             else:
                 result = self.web_searcher.search(query)
-                self.speak(result["message"])
+                self.respond(result["message"])
     
-    def _handle_weather(self, action: str, params: dict):
+    def _handle_weather(self, action: str, params: dict, command: str, matches: dict):
         """Handle weather requests."""
         location = params.get("location", None)
         
@@ -522,332 +803,311 @@ class Assistant:
         else:
             result = self.weather_service.get_weather(location)
         
-        self.speak(result["message"])
+        self.respond(result["message"])
     
-    def _handle_calculation(self, action: str, params: dict, command: str):
+    def _handle_calculation(self, action: str, params: dict, command: str, matches: dict):
         """Handle calculations and conversions."""
-        if "convert" in command.lower():
-            # Use LLM to help with conversion
-            response = self.llm.chat(f"Parse this conversion and give just the result: {command}")
-            self.speak(response)
+        if "convert" in matches or action == "convert":
+            result = self.calculator.convert(command)
+            if result["success"]:
+                self.respond(result["message"])
+            else:
+                response = self.llm.chat(f"Parse this conversion and give just the result: {command}")
+                self.respond(response)
         else:
             result = self.calculator.calculate(command)
             if result["success"]:
-                self.speak(result["message"])
+                self.respond(result["message"])
             else:
                 # Fallback to LLM
                 response = self.llm.chat(command)
-                self.speak(response)
-    
-    def _handle_media_control(self, action: str, params: dict):
-        """Handle media player control."""
-        if action == "play_pause" or action == "play" or action == "pause":
-            result = self.media_controller.play_pause()
-        elif action == "next" or action == "next_track":
-            result = self.media_controller.next_track()
-        elif action == "previous" or action == "previous_track":
-            result = self.media_controller.previous_track()
-        elif action == "volume_up":
-            result = self.media_controller.volume_up()
-        elif action == "volume_down":
-            result = self.media_controller.volume_down()
-        elif action == "mute":
-            result = self.media_controller.mute()
-        else:
-            result = {"success": False, "message": "Unknown media command"}
-        
-        self.speak(result["message"])
+                self.respond(response)
     
-    def _handle_timer(self, action: str, params: dict, command: str):
+    def _handle_media_control(self, action: str, params: dict, command: str, matches: dict):
+        """Handle media player control for actions without a registered handler."""
+        self.respond("Unknown media command")
+    
+    def _handle_timer(self, action: str, params: dict, command: str, matches: dict):
         """Handle timer operations."""
         if not self.timer_manager:
-            self.speak("Timer service not initialized.")
+            self.respond("Timer service not initialized.")
             return
             
-        if "set timer" in command.lower() or "timer for" in command.lower():
+        if "remind" in matches:
+            self._set_reminder(command, "every" in matches)
+        
+        elif "set" in matches:
             duration = self.timer_manager.parse_duration(command)
             if duration:
                 result = self.timer_manager.set_timer(duration)
-                self.speak(result["message"])
+                self.respond(result["message"])
             else:
-                self.speak("I couldn't understand the duration. Please specify time like '5 minutes' or '30 seconds'.")
+                self.respond("I couldn't understand the duration. Please specify time like '5 minutes' or '30 seconds'.")
         
-        elif "list timer" in command.lower() or "active timer" in command.lower():
+        elif "list" in matches:
             result = self.timer_manager.list_timers()
-            self.speak(result["message"])
+            self.respond(result["message"])
         
-        elif "cancel timer" in command.lower() or "stop timer" in command.lower():
+        elif "cancel" in matches:
             result = self.timer_manager.cancel_timer()
-            self.speak(result["message"])
+            self.respond(result["message"])
         
         else:
             # Try to parse as a simple timer command
             duration = self.timer_manager.parse_duration(command)
             if duration:
                 result = self.timer_manager.set_timer(duration)
-                self.speak(result["message"])
+                self.respond(result["message"])
             else:
-                self.speak("Timer command not recognized.")
+                self.respond("Timer command not recognized.")
     
-    def _handle_productivity(self, action: str, params: dict, command: str):
+    def _set_reminder(self, command: str, recurring: bool):
+        """Set a reminder from e.g. "remind me every 30 minutes to drink water"."""
+        duration = self.timer_manager.parse_duration(command)
+        match = re.search(r"\b(?:to|that|about)\s+(.+)$", command, re.IGNORECASE)
+        if not duration or not match:
+            self.respond("Tell me when and what, like 'remind me in 10 minutes to stretch'.")
+            return
+        
+        result = self.timer_manager.set_reminder(
+            match.group(1).strip(), duration, interval=duration if recurring else None
+        )
+        self.respond(result["message"])
+    
+    def _handle_productivity(self, action: str, params: dict, command: str, matches: dict):
         """Handle productivity tasks."""
+        from datetime import datetime
+        
         # Time and date queries
-        if "time" in command.lower():
-            from datetime import datetime
+        if "time" in matches:
             current_time = datetime.now().strftime("%I:%M %p")
-            self.speak(f"The time is {current_time}")
+            self.respond(f"The time is {current_time}")
         
-        elif "date" in command.lower() or "day" in command.lower():
-            from datetime import datetime
+        elif "date" in matches:
             current_date = datetime.now().strftime("%A, %B %d, %Y")
-            self.speak(f"Today is {current_date}")
+            self.respond(f"Today is {current_date}")
         
         else:
-            self.speak("Productivity feature coming soon.")
+            self.respond("Productivity feature coming soon.")
     
-    def _handle_email(self, action: str, params: dict, command: str):
+    def _handle_email(self, action: str, params: dict, command: str, matches: dict):
         """Handle email operations."""
-        command_lower = command.lower()
-        
         # Check email
-        if "check" in command_lower or "any email" in command_lower or "new email" in command_lower:
+        if "check" in matches:
             result = self.email_manager.check_email(limit=5)
-            self.speak(result["message"])
+            self.respond(result["message"])
             
             # Read first email details if available
             if result.get("success") and result.get("emails"):
-                self.speak("Would you like me to read any of them?")
+                self.respond("Would you like me to read any of them?")
         
         # Unread count
-        elif "unread" in command_lower or "how many" in command_lower:
+        elif "unread" in matches:
             result = self.email_manager.get_unread_count()
-            self.speak(result["message"])
+            self.respond(result["message"])
         
         # Read email
-        elif "read" in command_lower:
+        elif "read" in matches:
             # Try to extract email index
             index = 0
-            if "first" in command_lower or "latest" in command_lower:
-                index = 0
-            elif "second" in command_lower:
+            if "second" in matches:
                 index = 1
-            elif "third" in command_lower:
+            elif "third" in matches:
                 index = 2
             
             result = self.email_manager.read_email(index)
-            self.speak(result["message"])
+            self.respond(result["message"])
         
-        # Send email (requires more context)
-        elif "send" in command_lower:
+        # Send email
+        elif "send" in matches:
             if not self.email_manager.is_configured:
-                self.speak("Email not configured. Please set up your email account first.")
+                self.respond("Email not configured. Please set up your email account first.")
             else:
-                self.speak("Email sending requires recipient, subject, and message. This feature needs interactive setup.")
+                self.respond("Who is the email to?")
+                to = self._listen_for_reply()
+                subject = body = None
+                if to:
+                    self.respond("What is the subject?")
+                    subject = self._listen_for_reply()
+                    self.respond("What would you like to say?")
+                    body = self._listen_for_reply()
+                
+                if to and subject and body:
+                    # Queued: the outbox sends it in the background
+                    result = self.email_manager.send_email(to, subject, body)
+                    self.respond(result["message"])
+                else:
+                    self.respond("Email cancelled")
         
         # Configure email
-        elif "configure" in command_lower or "setup" in command_lower:
-            self.speak("To configure email, you'll need to edit the configuration file manually for security. Check the documentation.")
+        elif "configure" in matches:
+            self.respond("To configure email, you'll need to edit the configuration file manually for security. Check the documentation.")
         
         else:
-            self.speak("Email command not recognized. Try 'check email', 'read email', or 'unread emails'.")
+            self.respond("Email command not recognized. Try 'check email', 'read email', or 'unread emails'.")
     
-    def _handle_web_browsing(self, action: str, params: dict, command: str):
+    def _handle_web_browsing(self, action: str, params: dict, command: str, matches: dict):
         """Handle web browsing actions."""
         command_lower = command.lower()
         
         # Search web
-        if "search" in command_lower or "google" in command_lower or "look up" in command_lower:
-            # Extract search query
+        if "search" in matches:
+            # Extract search query from the text after the search phrase
             query = params.get("query", "")
-            if not query:
-                # Try to extract from command
-                for phrase in ["search for", "google", "look up", "find"]:
-                    if phrase in command_lower:
-                        query = command_lower.split(phrase, 1)[1].strip()
-                        break
+            if not query and "query" in matches:
+                query = command_lower[matches["query"].end():].strip()
             
             if query:
                 # Determine search engine
                 engine = "google"
-                if "youtube" in command_lower:
+                if "youtube" in matches:
                     engine = "youtube"
-                elif "bing" in command_lower:
+                elif "bing" in matches:
                     engine = "bing"
                 
                 result = self.web_automation.search_web(query, engine)
-                self.speak(f"Searching {engine} for {query}")
+                self.respond(f"Searching {engine} for {query}")
             else:
-                self.speak("What would you like me to search for?")
+                self.respond("What would you like me to search for?")
         
         # Open website
-        elif "open" in command_lower and ("website" in command_lower or "site" in command_lower or ".com" in command_lower):
+        elif "open" in matches and ("site" in matches or ".com" in command_lower):
             url = params.get("url", "")
             if not url:
                 # Try to extract URL from command
-                words = command_lower.split()
-                for word in words:
-                    if "." in word and len(word) > 3:
-                        url = word
-                        break
+                url = next((word for word in command_lower.split() if "." in word and len(word) > 3), "")
             
             if url:
                 result = self.web_automation.open_website(url)
-                self.speak(f"Opening {url}")
+                self.respond(f"Opening {url}")
             else:
-                self.speak("Which website would you like me to open?")
+                self.respond("Which website would you like me to open?")
         
         # Fetch webpage content
-        elif "fetch" in command_lower or "get content" in command_lower or "read page" in command_lower:
+        elif "fetch" in matches:
             url = params.get("url", "")
             if url:
-                self.speak(f"Fetching content from {url}")
-                content = self.web_automation.fetch_webpage_content(url)
-                if content:
-                    # Summarize using LLM
-                    summary = self.llm.chat(f"Summarize this content briefly: {content[:2000]}")
-                    self.speak(summary)
-                else:
-                    self.speak("Failed to fetch webpage content")
+                self.respond(f"Fetching content from {url}")
+                max_chars = 24000 if not self.config else self.config.get('summary.max_page_chars', 24000)
+                result = self.page_summarizer.summarize_page(
+                    url, lambda u: self.web_automation.fetch_webpage_content(u, max_chars=max_chars))
+                self.respond(result["summary"] if result["success"] else result["message"])
             else:
-                self.speak("Please specify a URL to fetch")
+                self.respond("Please specify a URL to fetch")
         
         # Get news
-        elif "news" in command_lower or "headlines" in command_lower:
-            topic = params.get("topic", "world")
-            self.speak(f"Fetching {topic} news headlines")
-            headlines = self.web_automation.get_news_headlines(topic)
-            
-            if headlines:
-                self.speak(f"Here are the top {len(headlines)} headlines")
-                for i, headline in enumerate(headlines[:3], 1):
-                    self.speak(f"{i}. {headline}")
-            else:
-                self.speak("Could not fetch news headlines")
+        elif "news" in matches:
+            topic = params.get("topic")
+            result = self.news.get_headlines([topic] if topic else None, limit=3)
+            self.respond(result["message"])
+            for i, headline in enumerate(result["headlines"], 1):
+                self.respond(f"{i}. {headline.title}")
         
         else:
-            self.speak("Web browsing command not recognized")
+            self.respond("Web browsing command not recognized")
     
-    def _handle_app_automation(self, action: str, params: dict, command: str):
+    def _handle_app_automation(self, action: str, params: dict, command: str, matches: dict):
         """Handle application automation actions."""
         command_lower = command.lower()
         
         # Type in application
-        if "type" in command_lower or "write" in command_lower:
+        if "type" in matches:
             # Determine target app
-            app_name = None
-            for app in ["word", "notepad", "notepad++", "excel"]:
-                if app in command_lower or app.replace("++", " plus plus") in command_lower:
-                    app_name = app
-                    break
+            app_name = next((app for app in self.TYPING_APPS if app in matches), None)
             
             # If no app specified, ask user
             if not app_name:
-                self.speak("Which application would you like me to write in? Word, Notepad, or Excel?")
-                app_response = self.listen()
+                self.respond("Which application would you like me to write in? Word, Notepad, or Excel?")
+                app_response = self._listen_for_reply()
                 if app_response:
-                    for app in ["word", "notepad", "excel"]:
-                        if app in app_response.lower():
-                            app_name = app
-                            break
+                    reply_matches = self.handlers.scan("app_automation", app_response)
+                    app_name = next((app for app in self.TYPING_APPS if app in reply_matches), None)
             
             if not app_name:
                 app_name = "notepad"  # Default
             
-            # Get text to type
+            # Get text to type: whatever follows "type"/"write", minus a trailing "in <app>"
             text = params.get("text", "")
             if not text:
-                # Extract from command
-                for phrase in ["type", "write", "in"]:
-                    if phrase in command_lower:
-                        parts = command_lower.split(phrase)
-                        if len(parts) > 1:
-                            text = parts[-1].strip()
-                            break
+                text = command_lower[matches["type"].end():].strip()
+                text = re.sub(r"\s+in\s+(?:microsoft\s+)?(?:word|notepad(?:\+\+| plus plus)?|excel)$", "", text)
             
             if not text:
-                self.speak("What would you like me to write?")
-                text_response = self.listen()
+                self.respond("What would you like me to write?")
+                text_response = self._listen_for_reply()
                 if text_response:
                     text = text_response
             
             if text:
-                self.speak(f"Writing in {app_name}")
+                self.respond(f"Writing in {app_name}")
                 result = self.app_automation.open_and_type(app_name, text)
-                self.speak("Done")
+                self.respond("Done")
             else:
-                self.speak("I didn't get the text to write")
+                self.respond("I didn't get the text to write")
         
         # Draft email in Outlook
-        elif "draft email" in command_lower or "compose email" in command_lower:
-            self.speak("Who is the email to?")
-            to = self.listen()
+        elif "draft" in matches:
+            self.respond("Who is the email to?")
+            to = self._listen_for_reply()
             
             if to:
-                self.speak("What is the subject?")
-                subject = self.listen()
+                self.respond("What is the subject?")
+                subject = self._listen_for_reply()
                 
-                self.speak("What would you like to say?")
-                body = self.listen()
+                self.respond("What would you like to say?")
+                body = self._listen_for_reply()
                 
                 if subject and body:
-                    self.speak("Drafting email in Outlook")
+                    self.respond("Drafting email in Outlook")
                     result = self.app_automation.draft_email_outlook(to, subject, body)
-                    self.speak("Email drafted. Please review and send when ready")
+                    self.respond("Email drafted. Please review and send when ready")
                 else:
-                    self.speak("Email draft cancelled")
+                    self.respond("Email draft cancelled")
             else:
-                self.speak("Email draft cancelled")
+                self.respond("Email draft cancelled")
         
         # Take screenshot
-        elif "screenshot" in command_lower or "screen capture" in command_lower:
-            self.speak("Taking screenshot")
+        elif "screenshot" in matches:
+            self.respond("Taking screenshot")
             result = self.app_automation.take_screenshot()
-            self.speak("Screenshot saved")
+            self.respond("Screenshot saved")
         
         # Copy to clipboard
-        elif "copy" in command_lower and "clipboard" in command_lower:
+        elif "copy" in matches and "clipboard" in matches:
             text = params.get("text", "")
             if text:
                 result = self.app_automation.copy_to_clipboard(text)
-                self.speak("Copied to clipboard")
+                self.respond("Copied to clipboard")
             else:
-                self.speak("What would you like me to copy?")
+                self.respond("What would you like me to copy?")
         
         # Paste from clipboard
-        elif "paste" in command_lower:
+        elif "paste" in matches:
             text = self.app_automation.paste_from_clipboard()
             if text:
-                self.speak(f"Clipboard contains: {text[:100]}")
+                self.respond(f"Clipboard contains: {text[:100]}")
             else:
-                self.speak("Clipboard is empty")
+                self.respond("Clipboard is empty")
         
         # Press keyboard shortcut
-        elif "press" in command_lower:
+        elif "press" in matches:
             # Extract keys
-            keys = []
-            if "ctrl" in command_lower or "control" in command_lower:
-                keys.append("ctrl")
-            if "alt" in command_lower:
-                keys.append("alt")
-            if "shift" in command_lower:
-                keys.append("shift")
+            keys = [key for key in ("ctrl", "alt", "shift") if key in matches]
             
             # Common shortcuts
-            if "c" in command_lower and "ctrl" in keys:
-                keys.append("c")
-            elif "v" in command_lower and "ctrl" in keys:
-                keys.append("v")
-            elif "s" in command_lower and "ctrl" in keys:
-                keys.append("s")
+            if "ctrl" in keys:
+                letter = next((key for key in ("c", "v", "s") if key in matches), None)
+                if letter:
+                    keys.append(letter)
             
             if len(keys) > 1:
                 result = self.app_automation.press_keys(keys)
-                self.speak(f"Pressed {' plus '.join(keys)}")
+                self.respond(f"Pressed {' plus '.join(keys)}")
             else:
-                self.speak("Which keyboard shortcut would you like me to press?")
+                self.respond("Which keyboard shortcut would you like me to press?")
         
         else:
-            self.speak("Application automation command not recognized")
+            self.respond("Application automation command not recognized")
     
     def process_commands(self) -> None:
         """Listen for and process voice commands."""
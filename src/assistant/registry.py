@@ -0,0 +1,200 @@
+"""Table-driven command handler registry with precompiled phrase matchers."""
+import re
+from typing import Callable, Dict, List, Optional, Any
+
+
+# Phrase tables per intent: label -> phrases. Handlers test labels instead of
+# re-scanning the command with substring checks.
+INTENT_PATTERNS: Dict[str, Dict[str, List[str]]] = {
+    "exit": {
+        "exit": ["exit", "quit", "goodbye", "bye", "stop listening", "shut down", "power off"],
+    },
+    "file_operation": {
+        "explorer": ["file explorer", "explorer"],
+        "downloads": ["downloads"],
+        "documents": ["documents"],
+        "pictures": ["pictures", "photos"],
+        "desktop": ["desktop"],
+        "music": ["music"],
+        "videos": ["videos"],
+    },
+    "search": {
+        "youtube": ["youtube"],
+        "website": ["website", "open"],
+    },
+    "calculation": {
+        "convert": ["convert"],
+    },
+    "timer": {
+        "set": ["set timer", "set a timer", "timer for"],
+        "list": ["list timer", "list timers", "active timer", "active timers"],
+        "cancel": ["cancel timer", "cancel timers", "stop timer", "stop timers", "cancel the timer", "stop the timer"],
+        "remind": ["remind me", "reminder", "set a reminder"],
+        "every": ["every"],
+    },
+    "productivity": {
+        "time": ["time"],
+        "date": ["date", "day", "today"],
+    },
+    "email": {
+        "check": ["check", "any email", "any emails", "new email", "new emails"],
+        "unread": ["unread", "how many"],
+        "read": ["read"],
+        "send": ["send"],
+        "configure": ["configure", "setup", "set up"],
+        "first": ["first", "latest"],
+        "second": ["second"],
+        "third": ["third"],
+    },
+    "web_browsing": {
+        "search": ["search", "search for", "google", "look up"],
+        "query": ["search for", "google", "look up", "find"],
+        "youtube": ["youtube"],
+        "bing": ["bing"],
+        "open": ["open"],
+        "site": ["website", "site"],
+        "fetch": ["fetch", "get content", "read page"],
+        "news": ["news", "headlines"],
+    },
+    "app_automation": {
+        "type": ["type", "write"],
+        "word": ["word"],
+        "notepad": ["notepad"],
+        "notepad++": ["notepad++", "notepad plus plus"],
+        "excel": ["excel"],
+        "draft": ["draft email", "compose email"],
+        "screenshot": ["screenshot", "screen capture"],
+        "copy": ["copy"],
+        "clipboard": ["clipboard"],
+        "paste": ["paste"],
+        "press": ["press"],
+        "ctrl": ["ctrl", "control"],
+        "alt": ["alt"],
+        "shift": ["shift"],
+        "c": ["c"],
+        "v": ["v"],
+        "s": ["s"],
+    },
+}
+
+
+def trie_pattern(phrases: List[str]) -> str:
+    """
+    Build a regex alternation factored by common prefixes.
+    
+    A flat "a|b|c" alternation is retried phrase by phrase at every position, so
+    its cost grows with the table; the trie form rejects a position after one
+    character and stays flat as phrases are added.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class PhraseMatcher:
+    """Match a label -> phrases table against text in a single compiled-regex pass."""
+
+    def __init__(self, table: Dict[str, List[str]]):
+        """
+        Compile the phrase table.
+
+        Args:
+            table: Mapping of label to the phrases that signal it. A phrase may
+                   appear under several labels.
+        """
+        self.labels_for: Dict[str, List[str]] = {}
+        for label, phrases in table.items():
+            for phrase in phrases:
+                self.labels_for.setdefault(phrase.lower(), []).append(label)
+
+        # Greedy trie branches prefer "file explorer" over "explorer"
+        alternation = trie_pattern(list(self.labels_for))
+        self.pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)") if alternation else None
+
+    def scan(self, text: str) -> Dict[str, "re.Match"]:
+        """
+        Find every label mentioned in the (lowercased) text.
+
+        Returns:
+            Mapping of label to the first match that signalled it
+        """
+        found: Dict[str, re.Match] = {}
+        if self.pattern is None:
+            return found
+        for match in self.pattern.finditer(text):
+            for label in self.labels_for[match.group(0)]:
+                found.setdefault(label, match)
+        return found
+
+
+class HandlerEntry:
+    """A registered intent: default handler, per-action overrides and phrase matcher."""
+
+    def __init__(self, handler: Callable, actions: Optional[Dict[str, Callable]] = None,
+                 matcher: Optional[PhraseMatcher] = None):
+        self.handler = handler
+        self.actions = actions or {}
+        self.matcher = matcher
+
+
+class HandlerRegistry:
+    """Dispatch table from intent (and action) to capability handlers."""
+
+    def __init__(self):
+        self._entries: Dict[str, HandlerEntry] = {}
+
+    def register(self, intent: str, handler: Callable,
+                 patterns: Optional[Dict[str, List[str]]] = None,
+                 actions: Optional[Dict[str, Callable]] = None):
+        """
+        Register a handler for an intent.
+
+        Args:
+            intent: Intent name produced by intent extraction
+            handler: Callable(action, params, command, matches) for the intent
+            patterns: Phrase table compiled once into the intent's matcher
+            actions: Optional action -> handler overrides with the same signature
+        """
+        matcher = PhraseMatcher(patterns) if patterns else None
+        self._entries[intent] = HandlerEntry(handler, actions, matcher)
+
+    def __contains__(self, intent: str) -> bool:
+        return intent in self._entries
+
+    def intents(self) -> List[str]:
+        """Get the registered intent names."""
+        return list(self._entries)
+
+    def scan(self, intent: str, command: str) -> Dict[str, Any]:
+        """Run the intent's matcher over a command."""
+        entry = self._entries.get(intent)
+        if entry is None or entry.matcher is None:
+            return {}
+        return entry.matcher.scan(command.lower())
+
+    def dispatch(self, intent: str, action: str, params: dict, command: str) -> bool:
+        """
+        Invoke the handler registered for an intent.
+
+        Returns:
+            False if no handler is registered for the intent
+        """
+        entry = self._entries.get(intent)
+        if entry is None:
+            return False
+        matches = entry.matcher.scan(command.lower()) if entry.matcher else {}
+        handler = entry.actions.get(action, entry.handler)
+        handler(action, params, command, matches)
+        return True
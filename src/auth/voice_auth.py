@@ -1,13 +1,16 @@
 """Voice authentication system for secure access."""
 import os
 import pickle
-import numpy as np
 from typing import Optional
-import sounddevice as sd
-import speech_recognition as sr
 from io import BytesIO
 import wave
 
+from utils.lazy_import import lazy_import
+
+np = lazy_import('numpy')
+sd = lazy_import('sounddevice')
+sr = lazy_import('speech_recognition')
+
 
 class VoiceAuthenticator:
     """Voice-based authentication system."""
@@ -7,12 +7,19 @@ from typing import Optional, List
 import subprocess
 import os
 
-try:
-    import pyautogui
-    import keyboard
-    AUTOMATION_AVAILABLE = True
-except ImportError:
-    AUTOMATION_AVAILABLE = False
+from utils.lazy_import import lazy_import, is_available
+
+
+def _configure_pyautogui(module):
+    module.FAILSAFE = True  # Move mouse to corner to stop
+    module.PAUSE = 0.1  # Pause between actions
+
+
+# pyautogui pulls in screenshot/GUI backends; load it on the first automation call
+pyautogui = lazy_import('pyautogui', on_load=_configure_pyautogui)
+keyboard = lazy_import('keyboard')
+AUTOMATION_AVAILABLE = is_available('pyautogui') and is_available('keyboard')
+if not AUTOMATION_AVAILABLE:
     logging.warning("pyautogui/keyboard not available - app automation disabled")
 
 
@@ -32,10 +39,6 @@ class AppAutomation:
             'firefox': ['firefox.exe', 'Mozilla Firefox'],
             'edge': ['msedge.exe', 'Microsoft Edge']
         }
-        
-        if AUTOMATION_AVAILABLE:
-            pyautogui.FAILSAFE = True  # Move mouse to corner to stop
-            pyautogui.PAUSE = 0.1  # Pause between actions
     
     def is_app_running(self, app_name: str) -> bool:
         """Check if application is running."""
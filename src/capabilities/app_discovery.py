@@ -1,151 +1,145 @@
-"""Application discovery and learning system for Windows."""
+"""Application discovery and learning system."""
 import os
-import json
-import winreg
-from pathlib import Path
+import logging
+import threading
 from typing import List, Dict, Optional, Any
-import platform
+
+from capabilities.app_index import AppIndex
+from capabilities.app_registry import AppRegistry
+from capabilities.app_scanner import AppScanner, WindowsBackend, default_backend
+from capabilities.launch_cache import LaunchCache, build_argv
+from utils.scheduler import get_scheduler
 
 
 class AppDiscovery:
-    """Discovers and caches installed applications on Windows."""
+    """Discovers and caches installed applications."""
     
-    def __init__(self, cache_file: str = "data/app_cache.json"):
-        """Initialize app discovery system."""
-        self.cache_file = cache_file
-        self.app_cache = self._load_cache()
+    def __init__(self, cache_file: str = "data/app_cache.json", db_path: str = "data/apps.db",
+                 background: bool = True):
+        """
+        Initialize app discovery system.
+        
+        Args:
+            cache_file: Legacy JSON cache, imported into the registry once
+            db_path: SQLite app registry
+            background: Refresh in a background thread instead of blocking construction
+        """
+        self.logger = logging.getLogger('jarvis.app_discovery')
+        self.registry = AppRegistry(db_path, legacy_cache=cache_file,
+                                    legacy_state=os.path.join(os.path.dirname(cache_file), "app_scan_state.json"))
+        self._index: Optional[AppIndex] = None
+        self._index_lock = threading.Lock()
         
         # Common system utilities
-        self.system_apps = {
-            "file explorer": "explorer.exe",
-            "explorer": "explorer.exe",
-            "task manager": "taskmgr.exe",
-            "control panel": "control.exe",
-            "settings": "ms-settings:",
-            "calculator": "calc.exe",
-            "paint": "mspaint.exe",
-            "wordpad": "write.exe",
-            "command prompt": "cmd.exe",
-            "powershell": "powershell.exe",
-            "registry editor": "regedit.exe",
-            "device manager": "devmgmt.msc",
-            "disk management": "diskmgmt.msc",
-            "services": "services.msc",
-            "event viewer": "eventvwr.msc",
-            "system information": "msinfo32.exe",
-            "resource monitor": "resmon.exe",
-            "snipping tool": "snippingtool.exe",
-            "sticky notes": "ms-stickynotes:",
-            "camera": "microsoft.windows.camera:",
-            "mail": "outlookmailapp:",
-            "calendar": "outlookcal:",
-            "store": "ms-windows-store:",
-            "photos": "ms-photos:",
-            "maps": "bingmaps:",
-            "weather": "bingweather:",
-            "news": "bingnews:",
-            "music": "mswindowsmusic:",
-            "movies": "mswindowsvideo:",
-        }
+        self.system_apps = WindowsBackend.SYSTEM_APPS
         
-        # Auto-discover on first run
-        if not self.app_cache or len(self.app_cache) < 10:
+        self.launch_cache = LaunchCache()
+        self.scanner = AppScanner(default_backend())
+        self._scan_lock = threading.Lock()
+        self._scan_thread: Optional[threading.Thread] = None
+        
+        # Refresh on every start; unchanged directories are not re-listed
+        if background:
+            self.refresh_async()
+        elif len(self.registry) < 10:
             self.discover_applications()
     
-    def _load_cache(self) -> Dict[str, str]:
-        """Load cached application paths."""
-        try:
-            cache_path = Path(self.cache_file)
-            if cache_path.exists():
-                with open(cache_path, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading app cache: {e}")
-        return {}
+    @property
+    def app_cache(self) -> Dict[str, str]:
+        """All known applications as name -> launch target."""
+        return self.registry.apps()
     
-    def _save_cache(self):
-        """Save application paths to cache."""
-        try:
-            cache_path = Path(self.cache_file)
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, 'w') as f:
-                json.dump(self.app_cache, f, indent=2)
-        except Exception as e:
-            print(f"Error saving app cache: {e}")
+    @property
+    def index(self) -> AppIndex:
+        """Lookup index, built from the registry on first use."""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+    
+    def _build_index(self) -> AppIndex:
+        apps = self.registry.apps()
+        for alias, target in self.registry.aliases().items():
+            apps.setdefault(alias, target)
+        return AppIndex(apps)
     
     def discover_applications(self) -> Dict[str, str]:
         """
-        Discover installed applications on Windows.
-        Returns dictionary of app_name -> executable_path.
+        Discover installed applications.
+        Returns dictionary of app_name -> launch target.
         """
-        if platform.system() != "Windows":
+        if self.scanner.backend is None:
             return self.app_cache
         
-        discovered = {}
-        
-        # Add system apps first
-        discovered.update(self.system_apps)
+        with self._scan_lock:
+            discovered, state = self.scanner.scan(self.registry.load_scan_state())
+            changes = self.registry.apply_scan(discovered)
+            self.registry.save_scan_state(state)
+            self.logger.info(
+                f"Discovered {len(discovered)} apps in {self.scanner.stats['duration_ms']}ms "
+                f"({self.scanner.stats['dirs_scanned']} dirs scanned, "
+                f"{self.scanner.stats['dirs_reused']} unchanged; "
+                f"+{changes['added']} ~{changes['updated']} -{changes['removed']} ^{changes['restored']})"
+            )
+            
+            # Swap in a fully built index so concurrent lookups never see a partial one
+            if self._index is None or any(changes.values()):
+                self._index = self._build_index()
         
-        # Search Windows Registry for installed apps
-        registry_paths = [
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths"),
-            (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\App Paths"),
-        ]
+        return discovered
+    
+    def refresh_async(self) -> Optional[threading.Thread]:
+        """Run discovery in a background thread unless one is already running."""
+        if self.scanner.backend is None:
+            return None
+        if self._scan_thread and self._scan_thread.is_alive():
+            return self._scan_thread
         
-        for hkey, path in registry_paths:
+        def run():
             try:
-                reg_key = winreg.OpenKey(hkey, path)
-                i = 0
-                while True:
-                    try:
-                        app_key = winreg.EnumKey(reg_key, i)
-                        app_path_key = winreg.OpenKey(reg_key, app_key)
-                        exe_path, _ = winreg.QueryValueEx(app_path_key, "")
-                        
-                        # Extract app name from .exe
-                        app_name = app_key.lower().replace(".exe", "")
-                        discovered[app_name] = exe_path
-                        
-                        winreg.CloseKey(app_path_key)
-                        i += 1
-                    except OSError:
-                        break
-                winreg.CloseKey(reg_key)
+                if not self.launch_cache.entries:
+                    self._seed_launch_cache()
+                self.discover_applications()
             except Exception as e:
-                pass
+                self.logger.error(f"Background app discovery failed: {e}")
         
-        # Search common program directories
-        program_dirs = [
-            os.environ.get("ProgramFiles", "C:\\Program Files"),
-            os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"),
-            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs"),
-        ]
-        
-        for prog_dir in program_dirs:
-            if os.path.exists(prog_dir):
-                try:
-                    for root, dirs, files in os.walk(prog_dir):
-                        # Only search 2 levels deep
-                        depth = root[len(prog_dir):].count(os.sep)
-                        if depth > 2:
-                            continue
-                        
-                        for file in files:
-                            if file.lower().endswith('.exe'):
-                                app_name = file.lower().replace(".exe", "")
-                                full_path = os.path.join(root, file)
-                                
-                                # Avoid duplicate entries, prefer App Paths
-                                if app_name not in discovered:
-                                    discovered[app_name] = full_path
-                except Exception:
-                    pass
+        self._scan_thread = threading.Thread(target=run, name="app-discovery", daemon=True)
+        self._scan_thread.start()
+        return self._scan_thread
+    
+    def _seed_launch_cache(self, limit: int = 20):
+        """Warm the launch cache from launch history and keep its top entries validated."""
+        for name, target, count, last in self.registry.most_launched(limit):
+            self.launch_cache.record(name, name, target, build_argv(target), count=count, last=last)
+        self.launch_cache.validate_top()
+        self.launch_cache.start_validation(get_scheduler())
+    
+    def resolve_launch(self, app_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a spoken app name to something runnable, cache first.
         
-        # Update cache
-        self.app_cache.update(discovered)
-        self._save_cache()
+        Args:
+            app_name: Name as the user said it
+            
+        Returns:
+            {"name", "app", "target", "argv", "cached"} or None if nothing matched
+        """
+        cached = self.launch_cache.get(app_name)
+        if cached:
+            return dict(cached, cached=True)
         
-        return discovered
+        results = self.find_applications(app_name, limit=1)
+        if not results or results[0]["score"] < 0.6:
+            return None
+        target = results[0]["path"]
+        return {
+            "name": app_name,
+            "app": results[0]["name"],
+            "target": target,
+            "argv": build_argv(target),
+            "cached": False,
+        }
     
     def find_application(self, app_name: str) -> Optional[str]:
         """
@@ -155,42 +149,60 @@ class AppDiscovery:
             app_name: Name of the application to find
             
         Returns:
-            Path to application executable or None
+            Path to the best confidently matching executable or None
         """
-        app_name = app_name.lower().strip()
-        
-        # Exact match
-        if app_name in self.app_cache:
-            return self.app_cache[app_name]
-        
-        # Partial match
-        for name, path in self.app_cache.items():
-            if app_name in name or name in app_name:
-                return path
-        
-        # Try common variations
-        variations = [
-            app_name,
-            app_name.replace(" ", ""),
-            app_name.replace(" ", "_"),
-            app_name + ".exe",
-        ]
+        results = self.find_applications(app_name, limit=3)
+        return results[0]["path"] if results and results[0]["score"] >= 0.6 else None
+    
+    def find_applications(self, app_name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank installed applications against a name.
         
-        for var in variations:
-            if var in self.app_cache:
-                return self.app_cache[var]
+        Args:
+            app_name: Spoken or typed application name
+            limit: Maximum candidates to return
+            
+        Returns:
+            [{"name", "path", "score"}] best first
+        """
+        results = self.index.search(app_name, limit=limit)
+        if len(results) > 1:
+            # Break near-ties in favour of apps the user actually launches
+            counts = self.registry.launch_counts()
+            results.sort(key=lambda r: r["score"] + 0.02 * min(counts.get(r["name"], 0), 5), reverse=True)
+        return results
+    
+    def record_launch(self, app_name: str, resolved: Optional[Dict[str, Any]] = None):
+        """
+        Count a launch so frequently used apps rank first and launch from cache.
         
-        return None
+        Args:
+            app_name: Name as the user said it
+            resolved: The resolve_launch() result that was run, if any
+        """
+        try:
+            if resolved is None:
+                results = self.index.search(app_name, limit=1, min_score=0.6)
+                self.registry.record_launch(results[0]["name"] if results else app_name)
+                return
+            self.launch_cache.record(app_name, resolved["app"], resolved["target"], resolved["argv"])
+            self.registry.record_launch(resolved["app"])
+        except Exception as e:
+            self.logger.error(f"Could not record launch of {app_name}: {e}")
+    
+    def forget_launch(self, app_name: str):
+        """Drop a cached launch that failed to start."""
+        self.launch_cache.invalidate(app_name)
     
     def get_all_apps(self) -> List[str]:
         """Get list of all discovered application names."""
-        return sorted(self.app_cache.keys())
+        return sorted(self.registry.apps())
     
     def refresh_cache(self) -> int:
         """Refresh application cache. Returns number of apps discovered."""
-        self.app_cache = {}
+        self.registry.save_scan_state({})  # Force a full rescan
         self.discover_applications()
-        return len(self.app_cache)
+        return len(self.registry)
     
     def open_file_explorer(self, path: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -0,0 +1,175 @@
+"""
+Ranked fuzzy lookup over installed application names.
+
+Names are normalized once into a trigram inverted index plus exact and token
+maps. A lookup gathers candidates from the postings of the query's trigrams,
+keeps the best few by trigram overlap, and ranks those by exact, prefix,
+token and edit-distance evidence. The cost depends on the query and the
+postings it touches, not on the total number of applications.
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Optional
+
+SEPARATORS = re.compile(r"[\s_\-.]+")
+
+# Helper executables that ship next to real apps and should not win fuzzy matches
+NOISE_PREFIXES = ("unins", "uninstall", "setup", "update", "crash", "helper", "install", "repair")
+
+
+def normalize(name: str) -> str:
+    """Lowercase, drop a trailing .exe and collapse separators to single spaces."""
+    name = name.lower().strip()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return SEPARATORS.sub(" ", name).strip()
+
+
+def trigrams(text: str) -> set:
+    """Trigrams of the space-free form, padded so short names still index."""
+    padded = f"  {text.replace(' ', '')} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance counting adjacent transpositions as one edit ("discrod").
+
+    Gives up and returns limit + 1 as soon as the distance must exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if before and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class AppIndex:
+    """Trigram index over application names with ranked lookup."""
+
+    def __init__(self, apps: Optional[Dict[str, str]] = None, shortlist: int = 20):
+        """
+        Args:
+            apps: name -> launch target
+            shortlist: Candidates kept after trigram counting for full scoring
+        """
+        self.shortlist = shortlist
+        self.build(apps or {})
+
+    def build(self, apps: Dict[str, str]):
+        """(Re)build the index from a name -> launch target mapping."""
+        self.names: List[str] = []
+        self.targets: List[str] = []
+        self.keys: List[str] = []         # normalized names
+        self.compact: List[str] = []      # normalized names without spaces
+        self.gram_counts: List[int] = []
+        self.exact: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+        for name, target in apps.items():
+            key = normalize(name)
+            if not key:
+                continue
+            compact = key.replace(" ", "")
+            if key in self.exact or compact in self.exact:
+                continue  # First entry wins, as in the cache
+            doc = len(self.names)
+            self.names.append(name)
+            self.targets.append(target)
+            self.keys.append(key)
+            self.compact.append(compact)
+            grams = trigrams(key)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(doc)
+            self.exact[key] = doc
+            self.exact.setdefault(compact, doc)
+        self.postings = dict(self.postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Dict[str, object]]:
+        """
+        Rank applications for a spoken or typed name.
+
+        Returns:
+            [{"name", "path", "score"}] best first, scores in 0..1
+        """
+        key = normalize(query)
+        if not key or not self.names:
+            return []
+        compact = key.replace(" ", "")
+
+        scores: Dict[int, float] = {}
+        for exact_key in (key, compact):
+            doc = self.exact.get(exact_key)
+            if doc is not None:
+                scores[doc] = 1.0
+
+        query_grams = trigrams(key)
+        overlap = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in query_grams))
+
+        # Dice coefficient on trigrams picks the shortlist; documents sharing
+        # under a third of the query's trigrams cannot reach min_score
+        total = len(query_grams)
+        floor = max(1, total // 3)
+        gram_counts = self.gram_counts
+        shortlist = heapq.nlargest(
+            self.shortlist, ((doc, shared) for doc, shared in overlap.items() if shared >= floor),
+            key=lambda item: 2 * item[1] / (total + gram_counts[item[0]])
+        )
+        for doc, shared in shortlist:
+            if doc not in scores:
+                scores[doc] = self._score(key, compact, doc, 2 * shared / (total + gram_counts[doc]))
+
+        ranked = sorted(
+            ((score, -len(self.compact[doc]), doc) for doc, score in scores.items() if score >= min_score),
+            reverse=True
+        )[:limit]
+        return [
+            {"name": self.names[doc], "path": self.targets[doc], "score": round(score, 3)}
+            for score, _, doc in ranked
+        ]
+
+    def _score(self, key: str, compact: str, doc: int, dice: float) -> float:
+        name_key = self.keys[doc]
+        name_compact = self.compact[doc]
+        score = dice * 0.7
+
+        if name_compact.startswith(compact) or name_key.startswith(key):
+            # Prefix of the app name; longer unmatched tails are less certain
+            score = max(score, 0.9 - 0.5 * (1 - len(compact) / len(name_compact)))
+
+        query_tokens = key.split()
+        name_tokens = set(name_key.split())
+        if query_tokens and all(token in name_tokens for token in query_tokens):
+            score = max(score, 0.6 + 0.25 * len(query_tokens) / len(name_tokens))
+
+        limit = max(1, len(compact) // 4)
+        distance = bounded_edit_distance(compact, name_compact, limit)
+        if distance <= limit:
+            score = max(score, 0.95 - 0.1 * distance - 0.5 * distance / max(len(compact), 1))
+
+        if name_key.startswith(NOISE_PREFIXES) and not key.startswith(NOISE_PREFIXES):
+            score *= 0.5
+        return score
+
+    def find(self, query: str, min_score: float = 0.6) -> Optional[str]:
+        """Best launch target for a name, or None if nothing is a confident match."""
+        results = self.search(query, limit=1, min_score=min_score)
+        return results[0]["path"] if results else None
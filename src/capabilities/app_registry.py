@@ -0,0 +1,235 @@
+"""
+SQLite-backed registry of installed applications.
+
+Replaces data/app_cache.json. Rows carry the launch target plus launch counts
+and last-seen times, so lookups can be ranked by use and a refresh only
+writes what changed. Apps missing from a scan are tombstoned rather than
+deleted, so an install on a temporarily unavailable drive keeps its launch
+history and aliases when it comes back. The database is opened on first use rather than at
+construction, and an existing JSON cache is imported once.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS apps (
+    name TEXT PRIMARY KEY,
+    target TEXT NOT NULL,
+    launch_count INTEGER NOT NULL DEFAULT 0,
+    last_launched REAL,
+    last_seen REAL NOT NULL,
+    missing_since REAL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    name TEXT NOT NULL REFERENCES apps(name) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_aliases_name ON aliases(name);
+CREATE INDEX IF NOT EXISTS idx_apps_launches ON apps(launch_count DESC, last_launched DESC);
+CREATE TABLE IF NOT EXISTS scan_state (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    apps TEXT NOT NULL,
+    dirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class AppRegistry:
+    """Application names, launch targets and usage in one SQLite file."""
+
+    def __init__(self, db_path: str = "data/apps.db", legacy_cache: Optional[str] = "data/app_cache.json",
+                 legacy_state: Optional[str] = "data/app_scan_state.json"):
+        """
+        Args:
+            db_path: SQLite database file
+            legacy_cache: JSON name -> target cache to import on first open
+            legacy_state: JSON scan state to import on first open
+        """
+        self.logger = logging.getLogger('jarvis.app_registry')
+        self.db_path = db_path
+        self.legacy_cache = legacy_cache
+        self.legacy_state = legacy_state
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection, opened (and migrated) on first use."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    self._conn = self._open()
+        return self._conn
+
+    def _open(self) -> sqlite3.Connection:
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(apps)")}
+        if "missing_since" not in columns:
+            conn.execute("ALTER TABLE apps ADD COLUMN missing_since REAL")
+        self._migrate_json(conn)
+        return conn
+
+    def _migrate_json(self, conn: sqlite3.Connection):
+        """Import the legacy JSON files once, then rename them out of the way."""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+
+        now = time.time()
+        with conn:
+            if self.legacy_cache and os.path.exists(self.legacy_cache):
+                try:
+                    with open(self.legacy_cache, 'r') as f:
+                        cache = json.load(f)
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO apps (name, target, last_seen) VALUES (?, ?, ?)",
+                        [(name, target, now) for name, target in cache.items()]
+                    )
+                    self.logger.info(f"Migrated {len(cache)} apps from {self.legacy_cache}")
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Could not migrate {self.legacy_cache}: {e}")
+            if self.legacy_state and os.path.exists(self.legacy_state):
+                try:
+                    with open(self.legacy_state, 'r') as f:
+                        self._write_scan_state(conn, json.load(f))
+                except (OSError, ValueError):
+                    pass  # Only costs one full rescan
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (str(now),))
+
+        for path in (self.legacy_cache, self.legacy_state):
+            if path and os.path.exists(path):
+                try:
+                    os.replace(path, path + ".migrated")
+                except OSError:
+                    pass
+
+    def apps(self) -> Dict[str, str]:
+        """All applications as name -> launch target."""
+        with self._lock:
+            return dict(self.conn.execute("SELECT name, target FROM apps WHERE missing_since IS NULL"))
+
+    def aliases(self) -> Dict[str, str]:
+        """All aliases as alias -> launch target."""
+        with self._lock:
+            return dict(self.conn.execute(
+                "SELECT aliases.alias, apps.target FROM aliases JOIN apps ON apps.name = aliases.name "
+                "WHERE apps.missing_since IS NULL"
+            ))
+
+    def get(self, name: str) -> Optional[str]:
+        """Launch target for an exact name or alias."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT target FROM apps WHERE name = ? AND missing_since IS NULL "
+                "UNION ALL SELECT apps.target FROM aliases JOIN apps ON apps.name = aliases.name "
+                "WHERE aliases.alias = ? AND apps.missing_since IS NULL LIMIT 1",
+                (name, name)
+            ).fetchone()
+        return row[0] if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM apps WHERE missing_since IS NULL").fetchone()[0]
+
+    def add_alias(self, alias: str, name: str):
+        """Make alias resolve to an existing application."""
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO aliases (alias, name) VALUES (?, ?)", (alias, name))
+
+    def apply_scan(self, discovered: Dict[str, str]) -> Dict[str, int]:
+        """
+        Bring the registry in line with a completed scan in one transaction.
+
+        Only new, retargeted, vanished and reappeared apps are written; the
+        time of the scan itself goes into meta.last_scan. Apps missing from
+        the scan are tombstoned, keeping their launch counts and aliases.
+
+        Returns:
+            {"added": n, "updated": n, "removed": n, "restored": n}
+        """
+        now = time.time()
+        with self._lock, self.conn:
+            current = {name: (target, missing) for name, target, missing
+                       in self.conn.execute("SELECT name, target, missing_since FROM apps")}
+            added = [(name, target, now) for name, target in discovered.items() if name not in current]
+            updated = [(target, now, name) for name, target in discovered.items()
+                       if name in current and current[name][1] is None and current[name][0] != target]
+            restored = [(target, now, name) for name, target in discovered.items()
+                        if name in current and current[name][1] is not None]
+            removed = [(now, name) for name, (_, missing) in current.items()
+                       if name not in discovered and missing is None]
+
+            self.conn.executemany("INSERT INTO apps (name, target, last_seen) VALUES (?, ?, ?)", added)
+            self.conn.executemany("UPDATE apps SET target = ?, last_seen = ?, missing_since = NULL WHERE name = ?",
+                                  updated + restored)
+            self.conn.executemany("UPDATE apps SET missing_since = ? WHERE name = ?", removed)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_scan', ?)", (str(now),))
+        return {"added": len(added), "updated": len(updated), "removed": len(removed), "restored": len(restored)}
+
+    def record_launch(self, name: str):
+        """Count a launch of an application (by name or alias)."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE apps SET launch_count = launch_count + 1, last_launched = ? "
+                "WHERE name = COALESCE((SELECT name FROM aliases WHERE alias = ?), ?)",
+                (time.time(), name, name)
+            )
+
+    def launch_counts(self) -> Dict[str, int]:
+        """name -> launch count for every app launched at least once."""
+        with self._lock:
+            return dict(self.conn.execute(
+                "SELECT name, launch_count FROM apps WHERE launch_count > 0 AND missing_since IS NULL"
+            ))
+
+    def most_launched(self, limit: int = 10) -> List[Tuple[str, str, int, Optional[float]]]:
+        """(name, target, launch_count, last_launched) rows, most used first."""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT name, target, launch_count, last_launched FROM apps "
+                "WHERE launch_count > 0 AND missing_since IS NULL ORDER BY launch_count DESC, last_launched DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+    def load_scan_state(self) -> Dict[str, dict]:
+        """Directory state for AppScanner.scan()."""
+        with self._lock:
+            return {
+                path: {"mtime": mtime, "apps": json.loads(apps), "dirs": json.loads(dirs)}
+                for path, mtime, apps, dirs in self.conn.execute("SELECT path, mtime, apps, dirs FROM scan_state")
+            }
+
+    def save_scan_state(self, state: Dict[str, dict]):
+        """Replace the stored directory state."""
+        with self._lock, self.conn:
+            self._write_scan_state(self.conn, state)
+
+    @staticmethod
+    def _write_scan_state(conn: sqlite3.Connection, state: Dict[str, dict]):
+        conn.execute("DELETE FROM scan_state")
+        conn.executemany(
+            "INSERT INTO scan_state (path, mtime, apps, dirs) VALUES (?, ?, ?, ?)",
+            [(path, entry["mtime"], json.dumps(entry["apps"]), json.dumps(entry["dirs"]))
+             for path, entry in state.items()]
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
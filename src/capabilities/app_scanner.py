@@ -0,0 +1,298 @@
+"""
+Parallel, incremental discovery of installed applications.
+
+A backend describes where applications live (scan roots with a depth limit
+and a per-file matcher) plus entries that need no directory walk (Windows
+App Paths, built-in system apps). The scanner walks each root with
+os.scandir, never descending past the root's depth limit, fans the first
+level of subdirectories out over a thread pool, and remembers every
+directory's mtime with what it found there. A later scan reuses a
+directory's results whenever its mtime is unchanged, so a refresh costs one
+stat per directory rather than a listing of every file.
+"""
+import os
+import platform
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Matcher: directory entry -> (app name, launch target) pairs it provides
+Matcher = Callable[[os.DirEntry], Iterable[Tuple[str, str]]]
+
+
+class ScanRoot(NamedTuple):
+    path: str
+    max_depth: int
+    matcher: Matcher
+
+
+class WindowsBackend:
+    """Registry App Paths, Program Files executables and built-in system apps."""
+
+    name = "windows"
+
+    SYSTEM_APPS = {
+        "file explorer": "explorer.exe",
+        "explorer": "explorer.exe",
+        "task manager": "taskmgr.exe",
+        "control panel": "control.exe",
+        "settings": "ms-settings:",
+        "calculator": "calc.exe",
+        "paint": "mspaint.exe",
+        "wordpad": "write.exe",
+        "command prompt": "cmd.exe",
+        "powershell": "powershell.exe",
+        "registry editor": "regedit.exe",
+        "device manager": "devmgmt.msc",
+        "disk management": "diskmgmt.msc",
+        "services": "services.msc",
+        "event viewer": "eventvwr.msc",
+        "system information": "msinfo32.exe",
+        "resource monitor": "resmon.exe",
+        "snipping tool": "snippingtool.exe",
+        "sticky notes": "ms-stickynotes:",
+        "camera": "microsoft.windows.camera:",
+        "mail": "outlookmailapp:",
+        "calendar": "outlookcal:",
+        "store": "ms-windows-store:",
+        "photos": "ms-photos:",
+        "maps": "bingmaps:",
+        "weather": "bingweather:",
+        "news": "bingnews:",
+        "music": "mswindowsmusic:",
+        "movies": "mswindowsvideo:",
+    }
+
+    REGISTRY_PATHS = (
+        r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths",
+        r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\App Paths",
+    )
+
+    def static_apps(self) -> Dict[str, str]:
+        """System apps plus App Paths registry entries."""
+        import winreg
+        
+        apps = dict(self.SYSTEM_APPS)
+        for path in self.REGISTRY_PATHS:
+            try:
+                reg_key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path)
+            except OSError:
+                continue
+            i = 0
+            while True:
+                try:
+                    app_key = winreg.EnumKey(reg_key, i)
+                except OSError:
+                    break
+                i += 1
+                try:
+                    app_path_key = winreg.OpenKey(reg_key, app_key)
+                    exe_path, _ = winreg.QueryValueEx(app_path_key, "")
+                    winreg.CloseKey(app_path_key)
+                except OSError:
+                    continue
+                apps[app_key.lower().replace(".exe", "")] = exe_path
+            winreg.CloseKey(reg_key)
+        return apps
+
+    @staticmethod
+    def match_exe(entry: os.DirEntry) -> Iterable[Tuple[str, str]]:
+        if entry.name.lower().endswith(".exe"):
+            yield entry.name[:-4].lower(), entry.path
+
+    def roots(self) -> List[ScanRoot]:
+        program_dirs = [
+            os.environ.get("ProgramFiles", "C:\\Program Files"),
+            os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)"),
+            os.path.join(os.environ.get("LOCALAPPDATA", ""), "Programs"),
+        ]
+        return [ScanRoot(path, 2, self.match_exe) for path in program_dirs]
+
+
+class LinuxBackend:
+    """freedesktop .desktop launchers plus executables on PATH."""
+
+    name = "linux"
+
+    def static_apps(self) -> Dict[str, str]:
+        return {}
+
+    @staticmethod
+    def parse_desktop_file(path: str) -> Optional[Dict[str, str]]:
+        """Read the [Desktop Entry] group of a .desktop file."""
+        fields: Dict[str, str] = {}
+        in_entry = False
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("["):
+                        if in_entry:
+                            break
+                        in_entry = line == "[Desktop Entry]"
+                    elif in_entry and "=" in line and not line.startswith("#"):
+                        key, value = line.split("=", 1)
+                        fields.setdefault(key.strip(), value.strip())
+        except OSError:
+            return None
+        return fields or None
+
+    @classmethod
+    def match_desktop(cls, entry: os.DirEntry) -> Iterable[Tuple[str, str]]:
+        if not entry.name.endswith(".desktop"):
+            return
+        fields = cls.parse_desktop_file(entry.path)
+        if (not fields or fields.get("Type", "Application") != "Application"
+                or fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true"
+                or not fields.get("Exec")):
+            return
+        # Drop field codes (%u, %F, ...) that only make sense to a launcher
+        try:
+            argv = [arg for arg in shlex.split(fields["Exec"]) if not arg.startswith("%")]
+        except ValueError:
+            return
+        if not argv:
+            return
+        command = " ".join(shlex.quote(arg) for arg in argv)
+        if fields.get("Name"):
+            yield fields["Name"].lower(), command
+        yield entry.name[:-len(".desktop")].lower(), command
+
+    @staticmethod
+    def match_executable(entry: os.DirEntry) -> Iterable[Tuple[str, str]]:
+        try:
+            if entry.is_file() and os.access(entry.path, os.X_OK):
+                yield entry.name.lower(), entry.path
+        except OSError:
+            return
+
+    def roots(self) -> List[ScanRoot]:
+        data_dirs = [os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))]
+        data_dirs += os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+        data_dirs.append("/var/lib/flatpak/exports/share")
+        roots = [ScanRoot(os.path.join(d, "applications"), 1, self.match_desktop) for d in data_dirs if d]
+        roots += [ScanRoot(d, 0, self.match_executable) for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        return roots
+
+
+def default_backend():
+    """Backend for the current platform, or None if unsupported."""
+    system = platform.system()
+    if system == "Windows":
+        return WindowsBackend()
+    if system == "Linux":
+        return LinuxBackend()
+    return None
+
+
+class AppScanner:
+    """Walks a backend's roots concurrently, reusing unchanged directories."""
+
+    def __init__(self, backend, workers: int = 4):
+        """
+        Args:
+            backend: WindowsBackend, LinuxBackend or anything with static_apps()/roots()
+            workers: Threads used to scan subtrees
+        """
+        self.backend = backend
+        self.workers = workers
+        self.stats = {"dirs_scanned": 0, "dirs_reused": 0, "duration_ms": 0.0}
+
+    def scan(self, state: Optional[Dict[str, dict]] = None) -> Tuple[Dict[str, str], Dict[str, dict]]:
+        """
+        Discover applications.
+
+        Args:
+            state: Directory state returned by a previous scan
+
+        Returns:
+            (name -> launch target, new directory state)
+        """
+        start = time.perf_counter()
+        state = state or {}
+        new_state: Dict[str, dict] = {}
+        counts = {"scanned": 0, "reused": 0}
+
+        # The first level is listed here so its subtrees can be spread across the pool
+        jobs = []
+        top_found = []
+        for root in self.backend.roots():
+            found: Dict[str, str] = {}
+            subdirs = self._visit_dir(root, root.path, state, new_state, found, counts)
+            top_found.append(found)
+            jobs.append([(root, path) for path in subdirs] if root.max_depth > 0 else [])
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="app-scan") as pool:
+            futures = [
+                [pool.submit(self._scan_tree, root, path, 1, state) for root, path in root_jobs]
+                for root_jobs in jobs
+            ]
+            # Merge in root order so earlier roots win name clashes, as before
+            apps = dict(self.backend.static_apps())
+            for found, root_futures in zip(top_found, futures):
+                for name, target in found.items():
+                    apps.setdefault(name, target)
+                for future in root_futures:
+                    tree_found, tree_state, tree_counts = future.result()
+                    for name, target in tree_found.items():
+                        apps.setdefault(name, target)
+                    new_state.update(tree_state)
+                    counts["scanned"] += tree_counts["scanned"]
+                    counts["reused"] += tree_counts["reused"]
+
+        self.stats = {
+            "dirs_scanned": counts["scanned"],
+            "dirs_reused": counts["reused"],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        return apps, new_state
+
+    def _scan_tree(self, root: ScanRoot, path: str, depth: int, state: Dict[str, dict]):
+        found: Dict[str, str] = {}
+        new_state: Dict[str, dict] = {}
+        counts = {"scanned": 0, "reused": 0}
+        stack = [(path, depth)]
+        while stack:
+            current, current_depth = stack.pop()
+            subdirs = self._visit_dir(root, current, state, new_state, found, counts)
+            if current_depth < root.max_depth:
+                # Reversed so the walk stays in listing order
+                stack.extend((sub, current_depth + 1) for sub in reversed(subdirs))
+        return found, new_state, counts
+
+    def _visit_dir(self, root: ScanRoot, path: str, state: Dict[str, dict],
+                   new_state: Dict[str, dict], found: Dict[str, str], counts: Dict[str, int]) -> List[str]:
+        """Collect one directory's apps (cached if unchanged) and return its subdirectories."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return []
+
+        cached = state.get(path)
+        if cached and cached["mtime"] == mtime:
+            entry = cached
+            counts["reused"] += 1
+        else:
+            apps: Dict[str, str] = {}
+            dirs: List[str] = []
+            try:
+                with os.scandir(path) as it:
+                    for item in it:
+                        try:
+                            if item.is_dir(follow_symlinks=False):
+                                dirs.append(item.path)
+                                continue
+                        except OSError:
+                            continue
+                        for name, target in root.matcher(item):
+                            apps.setdefault(name, target)
+            except OSError:
+                return []
+            entry = {"mtime": mtime, "apps": apps, "dirs": dirs}
+            counts["scanned"] += 1
+
+        new_state[path] = entry
+        for name, target in entry["apps"].items():
+            found.setdefault(name, target)
+        return entry["dirs"]
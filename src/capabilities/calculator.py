@@ -1,7 +1,8 @@
 """Calculator and unit converter capabilities."""
-import math
-import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List
+
+from capabilities.math_engine import MathEngine, format_number
+from capabilities.units import format_quantity, get_registry
 
 
 class Calculator:
@@ -9,76 +10,25 @@ class Calculator:
     
     def __init__(self):
         """Initialize calculator."""
-        self.conversion_factors = {
-            # Length
-            'meters_to_feet': 3.28084,
-            'feet_to_meters': 0.3048,
-            'miles_to_kilometers': 1.60934,
-            'kilometers_to_miles': 0.621371,
-            'inches_to_centimeters': 2.54,
-            'centimeters_to_inches': 0.393701,
-            
-            # Weight
-            'pounds_to_kilograms': 0.453592,
-            'kilograms_to_pounds': 2.20462,
-            'ounces_to_grams': 28.3495,
-            'grams_to_ounces': 0.035274,
-            
-            # Temperature conversions handled separately
-            
-            # Volume
-            'gallons_to_liters': 3.78541,
-            'liters_to_gallons': 0.264172,
-            'cups_to_milliliters': 236.588,
-            'milliliters_to_cups': 0.00422675,
-        }
+        self.engine = MathEngine()
+        self.units = get_registry()
     
     def calculate(self, expression: str) -> Dict[str, Any]:
         """
         Evaluate a mathematical expression.
         
         Args:
-            expression: Math expression to evaluate
+            expression: Math expression to evaluate, typed or spoken
             
         Returns:
             Result dictionary
         """
         try:
-            # Clean the expression
-            expression = expression.lower().strip()
-            
-            # Replace word operators
-            expression = expression.replace('plus', '+')
-            expression = expression.replace('minus', '-')
-            expression = expression.replace('times', '*')
-            expression = expression.replace('multiplied by', '*')
-            expression = expression.replace('divided by', '/')
-            expression = expression.replace('to the power of', '**')
-            expression = expression.replace('squared', '**2')
-            expression = expression.replace('cubed', '**3')
-            
-            # Remove common phrases
-            expression = re.sub(r'what is |calculate |compute |equals? ', '', expression)
-            
-            # Evaluate safely
-            # Only allow numbers, basic operators, and math functions
-            allowed_names = {
-                'sqrt': math.sqrt,
-                'sin': math.sin,
-                'cos': math.cos,
-                'tan': math.tan,
-                'log': math.log,
-                'log10': math.log10,
-                'exp': math.exp,
-                'pi': math.pi,
-                'e': math.e,
-            }
-            
-            result = eval(expression, {"__builtins__": {}}, allowed_names)
+            expression, result = self.engine.evaluate(expression)
             
             return {
                 "success": True,
-                "message": f"{expression} = {result}",
+                "message": f"{expression} = {format_number(result)}",
                 "result": result
             }
             
@@ -88,81 +38,112 @@ class Calculator:
                 "message": f"Could not calculate: {str(e)}"
             }
     
-    def convert_temperature(self, value: float, from_unit: str, to_unit: str) -> Dict[str, Any]:
-        """Convert between temperature units."""
-        try:
-            from_unit = from_unit.lower()
-            to_unit = to_unit.lower()
-            
-            # Convert to Celsius first
-            if from_unit in ['f', 'fahrenheit']:
-                celsius = (value - 32) * 5/9
-            elif from_unit in ['c', 'celsius']:
-                celsius = value
-            elif from_unit in ['k', 'kelvin']:
-                celsius = value - 273.15
-            else:
-                return {"success": False, "message": "Unknown temperature unit"}
-            
-            # Convert from Celsius to target
-            if to_unit in ['f', 'fahrenheit']:
-                result = celsius * 9/5 + 32
-                unit_name = "°F"
-            elif to_unit in ['c', 'celsius']:
-                result = celsius
-                unit_name = "°C"
-            elif to_unit in ['k', 'kelvin']:
-                result = celsius + 273.15
-                unit_name = "K"
-            else:
-                return {"success": False, "message": "Unknown temperature unit"}
+    def calculate_many(self, expressions: List[str]) -> Dict[str, Any]:
+        """
+        Evaluate several expressions, reusing compiled ones from the cache.
+        
+        Args:
+            expressions: Expressions to evaluate
             
+        Returns:
+            Result dictionary with per-expression results
+        """
+        results = self.engine.evaluate_many(expressions)
+        lines = [
+            f"{r['expression']} = {format_number(r['result'])}" if "result" in r
+            else f"{r['expression']}: {r['error']}"
+            for r in results
+        ]
+        return {
+            "success": all("result" in r for r in results),
+            "message": "\n".join(lines),
+            "results": results
+        }
+    
+    def evaluate_array(self, expression: str, **arrays) -> Dict[str, Any]:
+        """
+        Evaluate one expression over NumPy arrays, e.g. evaluate_array("x squared", x=values).
+        
+        Returns:
+            Result dictionary with the result array
+        """
+        try:
+            result = self.engine.evaluate_array(expression, **arrays)
             return {
                 "success": True,
-                "message": f"{value}° {from_unit} = {result:.2f}{unit_name}",
+                "message": f"Evaluated {expression} over {len(result)} values",
                 "result": result
             }
-            
         except Exception as e:
             return {
                 "success": False,
-                "message": f"Conversion error: {str(e)}"
+                "message": f"Could not calculate: {str(e)}"
+            }
+    
+    def convert(self, text: str) -> Dict[str, Any]:
+        """
+        Convert a spoken quantity, e.g. "five and a half miles in km".
+        
+        Args:
+            text: The conversion as the user said it
+            
+        Returns:
+            Result dictionary
+        """
+        parsed = self.units.parse(text)
+        if parsed is None:
+            return {
+                "success": False,
+                "message": "I couldn't work out which units to convert between"
             }
+        value, source, target = parsed
+        return self.convert_units(value, source.name, target.name)
+    
+    def convert_temperature(self, value: float, from_unit: str, to_unit: str) -> Dict[str, Any]:
+        """Convert between temperature units."""
+        return self.convert_units(value, from_unit, to_unit)
     
     def convert_units(self, value: float, from_unit: str, to_unit: str) -> Dict[str, Any]:
         """
-        Convert between various units.
+        Convert between any two units of the same dimension.
         
         Args:
             value: Value to convert
-            from_unit: Source unit
+            from_unit: Source unit (name, plural, symbol or alias)
             to_unit: Target unit
             
         Returns:
             Result dictionary
         """
         try:
-            # Handle temperature separately
-            if any(u in from_unit.lower() for u in ['celsius', 'fahrenheit', 'kelvin']):
-                return self.convert_temperature(value, from_unit, to_unit)
-            
-            # Construct conversion key
-            conversion_key = f"{from_unit.lower()}_to_{to_unit.lower()}"
-            
-            if conversion_key in self.conversion_factors:
-                result = value * self.conversion_factors[conversion_key]
-                return {
-                    "success": True,
-                    "message": f"{value} {from_unit} = {result:.2f} {to_unit}",
-                    "result": result
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Conversion from {from_unit} to {to_unit} not supported"
-                }
-                
-        except Exception as e:
+            result = self.units.convert(value, from_unit, to_unit)
+            source, target = self.units.resolve(from_unit), self.units.resolve(to_unit)
+            return {
+                "success": True,
+                "message": f"{format_quantity(value, source)} = {format_quantity(result, target)}",
+                "result": result
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "message": str(e)
+            }
+    
+    def convert_array(self, values, from_unit: str, to_unit: str) -> Dict[str, Any]:
+        """
+        Convert a whole array of values in one vectorized pass.
+        
+        Returns:
+            Result dictionary with the converted array
+        """
+        try:
+            result = self.units.convert_array(values, from_unit, to_unit)
+            return {
+                "success": True,
+                "message": f"Converted {len(result)} values from {from_unit} to {to_unit}",
+                "result": result
+            }
+        except (ValueError, ImportError) as e:
             return {
                 "success": False,
                 "message": f"Conversion error: {str(e)}"
@@ -1,25 +1,48 @@
 """Email capabilities for JARVIS assistant."""
-import smtplib
-import imaplib
-import email
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.utils import formatdate
 from typing import Dict, List, Optional, Any
 import json
 from pathlib import Path
 
+from capabilities import mail_fetch
+from capabilities.mail_outbox import Outbox
+from capabilities.mail_session import MailSession
+from utils.lazy_import import lazy_import
+
+# smtplib/imaplib drag in ssl; only pay for them when mail is actually used
+smtplib = lazy_import('smtplib')
+imaplib = lazy_import('imaplib')
+mime_text = lazy_import('email.mime.text')
+mime_multipart = lazy_import('email.mime.multipart')
+
 
 class EmailManager:
     """Manages email sending and reading capabilities."""
     
-    def __init__(self, config_file: str = "data/email_config.json"):
+    def __init__(self, config_file: str = "data/email_config.json", preview_bytes: int = 2048,
+                 cache_size: int = 50, idle_timeout: float = 540, spool_path: Optional[str] = None,
+                 smtp_keepalive: float = 60, send_attempts: int = 6):
         """
         Initialize email manager.
         
         Args:
             config_file: Path to email configuration file
+            preview_bytes: Body bytes fetched per message for previews
+            cache_size: Newest messages the mail session keeps in memory
+            idle_timeout: Seconds per IMAP IDLE before it is re-issued
+            spool_path: Base path of the outbound queue; mail is sent synchronously if None
+            smtp_keepalive: Seconds an idle SMTP session is kept open for further messages
+            send_attempts: Tries before a queued message is given up on
         """
         self.config_file = config_file
+        self.preview_bytes = preview_bytes
+        self.cache_size = cache_size
+        self.idle_timeout = idle_timeout
+        self.session: Optional[MailSession] = None
+        self.spool_path = spool_path
+        self.smtp_keepalive = smtp_keepalive
+        self.send_attempts = send_attempts
+        self.outbox: Optional[Outbox] = None
         self.config = self._load_config()
         self.is_configured = self._validate_config()
     
@@ -87,24 +110,56 @@ class EmailManager:
         self._save_config()
         self.is_configured = True
         
+        if self.session is not None:
+            # Reconnect with the new account
+            callback = self.session.on_new_mail
+            self.close()
+            self.start_session(callback)
+        
         return {
             "success": True,
             "message": "Email account configured successfully"
         }
     
+    def _smtp_connect(self):
+        """Logged-in SMTP connection."""
+        server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'], timeout=30)
+        if self.config.get('use_tls', True):
+            server.starttls()
+        server.login(self.config['email'], self.config['password'])
+        return server
+    
+    def start_outbox(self, on_failed=None) -> Optional[Outbox]:
+        """
+        Start the background sender; mail left in the spool from a previous run goes out first.
+        
+        Args:
+            on_failed: Called with the spool record of a message that could not be sent
+        """
+        if self.outbox is None and self.is_configured and self.spool_path:
+            from utils.journal_store import JournalStore
+            self.outbox = Outbox(self._smtp_connect, JournalStore(self.spool_path), keepalive=self.smtp_keepalive,
+                                 max_attempts=self.send_attempts, on_failed=on_failed)
+            self.outbox.start()
+        return self.outbox
+    
     def send_email(self, to: str, subject: str, body: str, 
-                   cc: Optional[List[str]] = None) -> Dict[str, Any]:
+                   cc: Optional[List[str]] = None, wait: bool = False) -> Dict[str, Any]:
         """
         Send an email.
         
+        With a spool configured the message is queued and this returns at
+        once; the outbox sends it in the background, retrying on failure.
+        
         Args:
             to: Recipient email address
             subject: Email subject
             body: Email body text
             cc: List of CC recipients (optional)
+            wait: Send synchronously even if the outbox is available
             
         Returns:
-            Result dictionary
+            Result dictionary ("queued" and "id" when queued)
         """
         if not self.is_configured:
             return {
@@ -114,32 +169,36 @@ class EmailManager:
         
         try:
             # Create message
-            msg = MIMEMultipart()
+            msg = mime_multipart.MIMEMultipart()
             msg['From'] = self.config['email']
             msg['To'] = to
             msg['Subject'] = subject
+            # Stamped now, so a message sent later by the outbox keeps its compose time
+            msg['Date'] = formatdate(localtime=True)
             
             if cc:
                 msg['Cc'] = ', '.join(cc)
             
             # Attach body
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Connect to SMTP server
-            server = smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port'])
+            msg.attach(mime_text.MIMEText(body, 'plain'))
             
-            if self.config.get('use_tls', True):
-                server.starttls()
-            
-            # Login
-            server.login(self.config['email'], self.config['password'])
-            
-            # Send email
             recipients = [to]
             if cc:
                 recipients.extend(cc)
             
-            server.send_message(msg)
+            if not wait and self.start_outbox():
+                message_id = self.outbox.enqueue(self.config['email'], recipients, msg.as_string(),
+                                                 description=f"to {to}")
+                return {
+                    "success": True,
+                    "message": f"Sending email to {to}",
+                    "queued": True,
+                    "id": message_id
+                }
+            
+            # Connect, log in and send
+            server = self._smtp_connect()
+            server.sendmail(self.config['email'], recipients, msg.as_string())
             server.quit()
             
             return {
@@ -158,6 +217,38 @@ class EmailManager:
                 "message": f"Failed to send email: {str(e)}"
             }
     
+    def _connect(self):
+        """Logged-in IMAP connection."""
+        mail = imaplib.IMAP4_SSL(self.config['imap_server'], self.config['imap_port'])
+        mail.login(self.config['email'], self.config['password'])
+        return mail
+    
+    def start_session(self, on_new_mail=None) -> Optional[MailSession]:
+        """
+        Keep a logged-in IMAP connection and a header cache in the background.
+        
+        Once its first sync is done, check_email, read_email and
+        get_unread_count answer from memory. New mail arrives through IDLE.
+        
+        Args:
+            on_new_mail: Called with the list of newly arrived emails, newest first
+        """
+        if self.session is None and self.is_configured and self.config.get('imap_server'):
+            self.session = MailSession(self._connect, cache_size=self.cache_size,
+                                       preview_bytes=self.preview_bytes, idle_timeout=self.idle_timeout,
+                                       on_new_mail=on_new_mail)
+            self.session.start()
+        return self.session
+    
+    def close(self):
+        """Stop the background mail session and sender (queued mail stays in the spool)."""
+        if self.session is not None:
+            self.session.stop()
+            self.session = None
+        if self.outbox is not None:
+            self.outbox.close()
+            self.outbox = None
+    
     def check_email(self, limit: int = 5) -> Dict[str, Any]:
         """
         Check recent emails.
@@ -175,102 +266,29 @@ class EmailManager:
                 "emails": []
             }
         
+        if self.session is not None and self.session.ready and limit <= self.cache_size:
+            return self._email_summary(self.session.recent(limit))
+        
         try:
-            # Connect to IMAP server
-            mail = imaplib.IMAP4_SSL(self.config['imap_server'], self.config['imap_port'])
-            
-            # Login
-            mail.login(self.config['email'], self.config['password'])
-            
-            # Select inbox
-            mail.select('INBOX')
+            mail = self._connect()
             
-            # Search for all emails
-            result, data = mail.search(None, 'ALL')
-            
-            if result != 'OK':
-                return {
-                    "success": False,
-                    "message": "Failed to search emails",
-                    "emails": []
-                }
-            
-            # Get email IDs
-            email_ids = data[0].split()
-            
-            # Get most recent emails
-            recent_ids = email_ids[-limit:] if len(email_ids) > limit else email_ids
-            recent_ids.reverse()  # Most recent first
-            
-            emails = []
-            for email_id in recent_ids:
-                result, data = mail.fetch(email_id, '(RFC822)')
-                
-                if result != 'OK' or not data or not data[0]:
-                    continue
-                
-                raw_email_data = data[0][1]
-                if not isinstance(raw_email_data, bytes):
-                    continue
-                    
-                msg = email.message_from_bytes(raw_email_data)
-                
-                # Extract email details
-                from_addr = msg.get('From', 'Unknown')
-                subject = msg.get('Subject', 'No Subject')
-                date = msg.get('Date', 'Unknown')
-                
-                # Get body
-                body = ""
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        if part.get_content_type() == 'text/plain':
-                            try:
-                                payload = part.get_payload(decode=True)
-                                if isinstance(payload, bytes):
-                                    body = payload.decode()
-                            except:
-                                body = "Unable to decode"
-                            break
-                else:
-                    try:
-                        payload = msg.get_payload(decode=True)
-                        if isinstance(payload, bytes):
-                            body = payload.decode()
-                    except:
-                        body = "Unable to decode"
-                
-                # Limit body length
-                if len(body) > 200:
-                    body = body[:200] + "..."
-                
-                emails.append({
-                    "from": from_addr,
-                    "subject": subject,
-                    "date": date,
-                    "preview": body
-                })
+            # UIDNEXT bounds the newest messages; no mailbox-wide SEARCH
+            status = mail_fetch.mailbox_status(mail, 'INBOX')
+            mail.select('INBOX', readonly=True)
+            uidnext = status.get('uidnext') or mail_fetch.latest_uid(mail) + 1
+            emails = mail_fetch.fetch_recent(mail, uidnext, limit=limit, preview_bytes=self.preview_bytes)
             
             mail.close()
             mail.logout()
             
-            # Create summary message
-            if emails:
-                count = len(emails)
-                summary = f"You have {count} recent email"
-                if count > 1:
-                    summary += "s"
-                summary += f". Latest from {emails[0]['from']}: {emails[0]['subject']}"
-            else:
-                summary = "No emails found in inbox"
+            return self._email_summary(emails)
             
+        except mail_fetch.IMAPError as e:
             return {
-                "success": True,
-                "message": summary,
-                "emails": emails,
-                "count": len(emails)
+                "success": False,
+                "message": f"Failed to fetch emails: {e}",
+                "emails": []
             }
-            
         except imaplib.IMAP4.error:
             return {
                 "success": False,
@@ -284,6 +302,26 @@ class EmailManager:
                 "emails": []
             }
     
+    @staticmethod
+    def _email_summary(emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Result dictionary for a list of recent emails, newest first."""
+        # Create summary message
+        if emails:
+            count = len(emails)
+            summary = f"You have {count} recent email"
+            if count > 1:
+                summary += "s"
+            summary += f". Latest from {emails[0]['from']}: {emails[0]['subject']}"
+        else:
+            summary = "No emails found in inbox"
+        
+        return {
+            "success": True,
+            "message": summary,
+            "emails": emails,
+            "count": len(emails)
+        }
+    
     def read_email(self, index: int = 0) -> Dict[str, Any]:
         """
         Read a specific email by index (0 = most recent).
@@ -332,38 +370,16 @@ class EmailManager:
                 "count": 0
             }
         
+        if self.session is not None and self.session.ready:
+            return self._unread_summary(self.session.unseen_count())
+        
         try:
-            mail = imaplib.IMAP4_SSL(self.config['imap_server'], self.config['imap_port'])
-            mail.login(self.config['email'], self.config['password'])
-            mail.select('INBOX')
-            
-            result, data = mail.search(None, 'UNSEEN')
-            
-            if result != 'OK':
-                return {
-                    "success": False,
-                    "message": "Failed to check unread emails",
-                    "count": 0
-                }
-            
-            unread_ids = data[0].split()
-            count = len(unread_ids)
-            
-            mail.close()
+            mail = self._connect()
+            # STATUS reports the unread count without selecting or searching the mailbox
+            count = mail_fetch.mailbox_status(mail, 'INBOX').get('unseen', 0)
             mail.logout()
             
-            if count == 0:
-                message = "You have no unread emails"
-            elif count == 1:
-                message = "You have 1 unread email"
-            else:
-                message = f"You have {count} unread emails"
-            
-            return {
-                "success": True,
-                "message": message,
-                "count": count
-            }
+            return self._unread_summary(count)
             
         except Exception as e:
             return {
@@ -371,3 +387,18 @@ class EmailManager:
                 "message": f"Error checking unread emails: {str(e)}",
                 "count": 0
             }
+    
+    @staticmethod
+    def _unread_summary(count: int) -> Dict[str, Any]:
+        if count == 0:
+            message = "You have no unread emails"
+        elif count == 1:
+            message = "You have 1 unread email"
+        else:
+            message = f"You have {count} unread emails"
+        
+        return {
+            "success": True,
+            "message": message,
+            "count": count
+        }
@@ -0,0 +1,165 @@
+"""
+Frecency-ranked cache of resolved application launches.
+
+Every successful launch records the spoken name together with the resolved
+target and ready-to-run argv. Entries are ranked by frecency, a launch count
+that decays with a half-life, so the cache keeps what the user opens often
+and recently. A background pass re-checks the top entries' paths so that a
+launch from the cache never has to touch the filesystem first.
+"""
+import os
+import platform
+import shlex
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+URI_SCHEME_SUFFIX = ":"
+
+
+def build_argv(target: str, system: Optional[str] = None) -> List[str]:
+    """
+    Turn a launch target (path, bare executable, command line or URI) into argv.
+
+    Args:
+        target: What discovery resolved: an executable path, "ms-settings:", "gimp %U"...
+        system: platform.system() value (default: current platform)
+    """
+    system = system or platform.system()
+    is_uri = "://" in target or (target.endswith(URI_SCHEME_SUFFIX) and " " not in target)
+    if system == "Windows":
+        if is_uri or target.lower().endswith((".msc", ".lnk")):
+            return ["cmd", "/c", "start", "", target]
+        return [target]
+    if is_uri:
+        return ["open" if system == "Darwin" else "xdg-open", target]
+    if os.path.isabs(target) and os.path.exists(target):
+        return [target]
+    return shlex.split(target)
+
+
+def target_exists(argv: List[str]) -> bool:
+    """Check that the program argv would run is present."""
+    program = argv[0]
+    if program in ("cmd", "xdg-open", "open"):
+        return True  # Shell handlers; the target is resolved by the OS
+    if os.path.isabs(program):
+        return os.path.exists(program)
+    return shutil.which(program) is not None
+
+
+class LaunchCache:
+    """Spoken name -> validated launch, ranked by frecency."""
+
+    def __init__(self, capacity: int = 64, half_life_days: float = 14.0, revalidate_after: float = 600.0):
+        """
+        Args:
+            capacity: Entries kept; the lowest frecency is evicted first
+            half_life_days: Days for a launch's weight to halve
+            revalidate_after: Seconds a path check stays trusted
+        """
+        self.capacity = capacity
+        self.half_life = half_life_days * 86400
+        self.revalidate_after = revalidate_after
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0, "validated": 0}
+
+    @staticmethod
+    def key(name: str) -> str:
+        return " ".join(name.lower().split())
+
+    def _frecency(self, entry: Dict[str, Any], now: float) -> float:
+        return entry["score"] * 0.5 ** ((now - entry["last"]) / self.half_life)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached launch for a name, or None.
+
+        A hit whose path was checked within revalidate_after is returned
+        without touching the filesystem; an older one is checked first.
+        """
+        key = self.key(name)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        if time.time() - entry["validated_at"] > self.revalidate_after:
+            if not target_exists(entry["argv"]):
+                self.invalidate(name)
+                self.stats["misses"] += 1
+                return None
+            entry["validated_at"] = time.time()
+        self.stats["hits"] += 1
+        return entry
+
+    def record(self, name: str, app: str, target: str, argv: List[str],
+               count: int = 1, last: Optional[float] = None):
+        """
+        Record a successful launch.
+
+        Args:
+            name: What the user said
+            app: Registry name the launch resolved to
+            target: Resolved launch target
+            argv: Command that was run
+            count: Launches to credit (used when seeding from history)
+            last: Time of the most recent launch (default: now)
+        """
+        now = time.time()
+        last = last or now
+        key = self.key(name)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry["argv"] == argv:
+                entry["score"] = self._frecency(entry, last) + count
+                entry["last"] = last
+            else:
+                entry = {"name": key, "app": app, "target": target, "argv": argv,
+                         "score": float(count), "last": last, "validated_at": now}
+                self.entries[key] = entry
+            if len(self.entries) > self.capacity:
+                coldest = min(self.entries.values(), key=lambda e: self._frecency(e, now))
+                del self.entries[coldest["name"]]
+
+    def invalidate(self, name: str):
+        """Forget a launch whose target has gone away."""
+        with self._lock:
+            if self.entries.pop(self.key(name), None) is not None:
+                self.stats["invalidated"] += 1
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Entries with the highest frecency first."""
+        now = time.time()
+        with self._lock:
+            entries = list(self.entries.values())
+        return sorted(entries, key=lambda e: self._frecency(e, now), reverse=True)[:limit]
+
+    def validate_top(self, limit: int = 10) -> int:
+        """
+        Re-check the most used entries' paths, dropping ones that vanished.
+
+        Returns:
+            Number of entries confirmed
+        """
+        confirmed = 0
+        for entry in self.top(limit):
+            if target_exists(entry["argv"]):
+                entry["validated_at"] = time.time()
+                confirmed += 1
+            else:
+                self.invalidate(entry["name"])
+        self.stats["validated"] += confirmed
+        return confirmed
+
+    def start_validation(self, scheduler, interval: float = 300.0, limit: int = 10, delay: float = 5.0):
+        """Re-validate the top entries on a scheduler every interval seconds."""
+        def run():
+            try:
+                self.validate_top(limit)
+            finally:
+                scheduler.schedule(interval, run)
+        scheduler.schedule(delay, run)
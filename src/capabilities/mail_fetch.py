@@ -0,0 +1,180 @@
+"""
+Cheap IMAP reads: mailbox counters from STATUS, recent messages by UID window.
+
+Nothing here enumerates the mailbox or downloads whole messages. STATUS
+gives the message count, the unread count and UIDNEXT, which is one above
+the newest UID. The newest messages are then fetched in one batched
+UID FETCH over a window of UIDs just below UIDNEXT. The window widens only
+if deletions left it too sparse. Each message contributes a few header
+fields and the first preview_bytes of its body, peeked so that it is not
+marked as read.
+"""
+import email
+import email.header
+import re
+from typing import Any, Dict, List, Optional
+
+HEADER_FIELDS = "FROM SUBJECT DATE CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+STATUS_ITEMS = "(MESSAGES UIDNEXT UIDVALIDITY UNSEEN)"
+MESSAGE_START = re.compile(rb"^\s*\d+ \(")
+UID = re.compile(rb"\bUID (\d+)")
+FLAGS = re.compile(rb"\bFLAGS \(([^)]*)\)")
+STATUS_PAIR = re.compile(rb"([A-Z]+) (\d+)")
+MAX_WINDOW = 5000
+
+
+class IMAPError(Exception):
+    """The server answered a command with something other than OK."""
+
+
+def parse_status(data: List[bytes]) -> Dict[str, int]:
+    """b'INBOX (MESSAGES 231 UIDNEXT 44292 UNSEEN 3)' -> {"messages": 231, "uidnext": 44292, "unseen": 3}"""
+    line = data[0] if data and data[0] else b""
+    if isinstance(line, tuple):
+        line = line[0]
+    items = line[line.rfind(b"(") + 1:] if b"(" in line else line
+    return {name.decode().lower(): int(value) for name, value in STATUS_PAIR.findall(items)}
+
+
+def mailbox_status(conn, mailbox: str = "INBOX") -> Dict[str, int]:
+    """Message, unread and UID counters of a mailbox without selecting it."""
+    result, data = conn.status(mailbox, STATUS_ITEMS)
+    if result != "OK":
+        raise IMAPError(f"STATUS {mailbox} failed: {data}")
+    return parse_status(data)
+
+
+def parse_fetch(data: List[Any]) -> Dict[int, Dict[str, Any]]:
+    """
+    Group an imaplib FETCH response by message.
+
+    Returns:
+        UID -> {"header": bytes, "text": bytes, "flags": [str]}
+    """
+    messages: Dict[int, Dict[str, Any]] = {}
+    current: Optional[Dict[str, Any]] = None
+
+    def finish():
+        match = UID.search(current["meta"])
+        if match:
+            flags = FLAGS.search(current["meta"])
+            messages[int(match.group(1))] = {
+                "header": current["header"],
+                "text": current["text"],
+                "flags": flags.group(1).decode(errors="replace").split() if flags else [],
+            }
+
+    for item in data:
+        if item is None:
+            continue
+        prefix, literal = (item[0], item[1]) if isinstance(item, tuple) else (item, None)
+        if MESSAGE_START.match(prefix):
+            if current is not None:
+                finish()
+            current = {"meta": b"", "header": b"", "text": b""}
+        if current is None:
+            continue
+        current["meta"] += prefix + b" "
+        if literal is not None:
+            section = prefix.rsplit(b"BODY[", 1)[-1].upper()
+            current["header" if section.startswith(b"HEADER") else "text"] = literal
+    if current is not None:
+        finish()
+    return messages
+
+
+def latest_uid(conn) -> int:
+    """Highest UID in the selected mailbox (0 if empty); for servers whose STATUS lacks UIDNEXT."""
+    result, data = conn.uid("FETCH", "*", "(UID)")
+    if result != "OK":
+        raise IMAPError(f"UID FETCH * failed: {data}")
+    uids = [int(match.group(1)) for item in data if item
+            for match in [UID.search(item[0] if isinstance(item, tuple) else item)] if match]
+    return max(uids, default=0)
+
+
+def fetch_range(conn, low: int, high: Any, preview_bytes: int = 2048) -> Dict[int, Dict[str, Any]]:
+    """
+    Summaries of messages with UIDs low..high in one UID FETCH (high may be "*").
+
+    Returns:
+        UID -> {"from", "subject", "date", "preview", "uid", "unread"}
+    """
+    query = f"(UID FLAGS BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})] BODY.PEEK[TEXT]<0.{preview_bytes}>)"
+    result, data = conn.uid("FETCH", f"{low}:{high}", query)
+    if result != "OK":
+        raise IMAPError(f"UID FETCH {low}:{high} failed: {data}")
+    return {uid: dict(summarize_message(message["header"], message["text"]), uid=uid,
+                      unread="\\Seen" not in message["flags"])
+            for uid, message in parse_fetch(data).items()}
+
+
+def fetch_recent(conn, uidnext: int, limit: int = 5, preview_bytes: int = 2048) -> List[Dict[str, Any]]:
+    """
+    The newest messages of the selected mailbox, newest first.
+
+    Fetches UIDs [uidnext - window, uidnext) in one batched UID FETCH,
+    widening the window below it until limit messages were found or UID 1
+    is reached.
+
+    Args:
+        conn: imaplib.IMAP4 with the mailbox selected
+        uidnext: UIDNEXT from STATUS
+        limit: Messages wanted
+        preview_bytes: Body bytes fetched per message
+    """
+    messages: Dict[int, Dict[str, Any]] = {}
+    high = uidnext - 1
+    window = max(limit * 2, 10)
+    while high >= 1 and len(messages) < limit:
+        low = max(1, high - window + 1)
+        messages.update(fetch_range(conn, low, high, preview_bytes))
+        high = low - 1
+        window = min(window * 4, MAX_WINDOW)
+    return [messages[uid] for uid in sorted(messages, reverse=True)[:limit]]
+
+
+def decode_header(value: Optional[str], default: str) -> str:
+    """RFC 2047 encoded header as plain text."""
+    if not value:
+        return default
+    try:
+        return str(email.header.make_header(email.header.decode_header(value)))
+    except (LookupError, ValueError):
+        return value
+
+
+def summarize_message(header: bytes, text: bytes, preview_chars: int = 200) -> Dict[str, str]:
+    """From/subject/date and a text preview from header fields plus the start of the body."""
+    msg = email.message_from_bytes(header.rstrip(b"\r\n") + b"\r\n\r\n" + text)
+    body = ""
+    for part in msg.walk() if msg.is_multipart() else [msg]:
+        if part.get_content_type() == "text/plain":
+            body = _decode_payload(part)
+            break
+    body = " ".join(body.split())
+    if len(body) > preview_chars:
+        body = body[:preview_chars] + "..."
+    return {
+        "from": decode_header(msg.get("From"), "Unknown"),
+        "subject": decode_header(msg.get("Subject"), "No Subject"),
+        "date": msg.get("Date", "Unknown"),
+        "preview": body,
+    }
+
+
+def _decode_payload(part) -> str:
+    """Decode a possibly truncated part body."""
+    payload = part.get_payload()
+    if not isinstance(payload, str):
+        return ""
+    encoding = part.get("Content-Transfer-Encoding", "").lower()
+    if encoding == "base64":
+        # Drop the incomplete last quantum left by the partial fetch
+        compact = "".join(payload.split())
+        part.set_payload(compact[:len(compact) - len(compact) % 4])
+    try:
+        data = part.get_payload(decode=True) or b""
+        return data.decode(part.get_content_charset() or "utf-8", errors="replace")
+    except (LookupError, ValueError):
+        return "Unable to decode"
@@ -0,0 +1,232 @@
+"""
+Background outbound mail queue with a persisted spool.
+
+send_email only serializes the message into the spool and wakes the
+worker, so the voice command returns immediately. The worker sends every
+due message over one authenticated SMTP session. It keeps that session
+open for keepalive seconds after the last send, so a burst of messages
+pays for the connection, STARTTLS and login once. Temporary failures are
+retried with exponential backoff. Permanent ones (5xx) are marked failed
+and reported. The spool is a JournalStore, so queued mail survives a
+restart and is sent when the worker starts again.
+"""
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Outbox:
+    """Queues messages in a spool and sends them from a worker thread."""
+
+    def __init__(self, connect: Callable[[], Any], store, keepalive: float = 60, max_attempts: int = 6,
+                 base_delay: float = 30, max_delay: float = 1800,
+                 on_failed: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            connect: Returns a connected, logged-in smtplib.SMTP
+            store: Spool with get/put/delete/all/close (e.g. JournalStore)
+            keepalive: Seconds an idle SMTP session is kept open for the next message
+            max_attempts: Sends tried before a message is given up on
+            base_delay: Seconds before the first retry; doubles with each attempt
+            max_delay: Longest wait between retries
+            on_failed: Called with the spool record of a message given up on
+        """
+        self.logger = logging.getLogger('jarvis.outbox')
+        self.connect = connect
+        self.store = store
+        self.keepalive = keepalive
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_failed = on_failed
+        self.records: Dict[str, Dict[str, Any]] = dict(store.all())
+        self._cond = threading.Condition()
+        self._conn = None
+        self._last_used = 0.0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"queued": 0, "sent": 0, "retries": 0, "failed": 0, "connections": 0, "reused": 0}
+
+    def start(self):
+        """Start the worker; anything left in the spool is sent first."""
+        if self._thread is None:
+            pending = len(self.pending())
+            if pending:
+                self.logger.info(f"Resuming {pending} queued email(s) from the spool")
+            self._thread = threading.Thread(target=self._run, name="mail-outbox", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, sender: str, recipients: List[str], raw: str, description: str = "") -> str:
+        """
+        Add a serialized message to the spool and wake the worker.
+
+        Returns:
+            Spool id of the message
+        """
+        message_id = uuid.uuid4().hex
+        record = {"id": message_id, "from": sender, "to": list(recipients), "raw": raw,
+                  "description": description, "queued_at": time.time(), "next_attempt": 0.0,
+                  "attempts": 0, "failed": False, "last_error": None}
+        self.store.put(message_id, record)
+        with self._cond:
+            self.records[message_id] = record
+            self.stats["queued"] += 1
+            self._cond.notify()
+        return message_id
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Messages still to be sent, oldest first."""
+        with self._cond:
+            records = [dict(r) for r in self.records.values() if not r["failed"]]
+        return sorted(records, key=lambda r: r["queued_at"])
+
+    def failed(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            return [dict(r) for r in self.records.values() if r["failed"]]
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until nothing is due; False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify()
+            while any(not r["failed"] and r["next_attempt"] <= time.time() for r in self.records.values()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.5))
+        return True
+
+    def report(self) -> Dict[str, Any]:
+        """Stats for the health status."""
+        with self._cond:
+            report = dict(self.stats)
+            report["pending"] = len([r for r in self.records.values() if not r["failed"]])
+            report["connected"] = self._conn is not None
+        return report
+
+    def close(self, timeout: float = 5.0):
+        """Stop the worker; unsent mail stays in the spool."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._disconnect()
+        self.store.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                waiting = [r for r in self.records.values() if not r["failed"]]
+                due = sorted((r for r in waiting if r["next_attempt"] <= now), key=lambda r: r["queued_at"])
+                idle_left = self._last_used + self.keepalive - time.monotonic()
+                if not due and (self._conn is None or idle_left > 0):
+                    waits = [r["next_attempt"] - now for r in waiting]
+                    if self._conn is not None:
+                        waits.append(idle_left)
+                    self._cond.wait(max(0.0, min(waits, default=60)))
+                    continue
+            if due:
+                self._send_batch(due)
+            else:
+                # Idle past keepalive: release the server's connection slot
+                self._disconnect()
+
+    def _send_batch(self, due: List[Dict[str, Any]]):
+        """Send due messages in order over one session."""
+        import smtplib
+
+        for index, record in enumerate(due):
+            if self._stopped:
+                return
+            for attempt in (1, 2):
+                if self._conn is None:
+                    try:
+                        self._conn = self.connect()
+                    except Exception as e:
+                        # No session (network, TLS or login): nothing else can go either
+                        for waiting in due[index:]:
+                            self._retry(waiting, e)
+                        return
+                    reused = False
+                    self.stats["connections"] += 1
+                else:
+                    reused = True
+                    self.stats["reused"] += 1
+                try:
+                    refused = self._conn.sendmail(record["from"], record["to"], record["raw"])
+                    self._last_used = time.monotonic()
+                except smtplib.SMTPServerDisconnected as e:
+                    self._disconnect()
+                    if reused and attempt == 1:
+                        continue  # The server closed the idle session; retry on a fresh one
+                    self._retry(record, e)
+                except smtplib.SMTPRecipientsRefused as e:
+                    if all(code >= 500 for code, _ in e.recipients.values()):
+                        self._give_up(record, e)
+                    else:
+                        self._retry(record, e)
+                except smtplib.SMTPResponseException as e:
+                    if e.smtp_code >= 500:
+                        self._give_up(record, e)
+                    else:
+                        self._retry(record, e)
+                except (smtplib.SMTPException, OSError) as e:
+                    self._disconnect()
+                    self._retry(record, e)
+                else:
+                    if refused:
+                        self.logger.warning(f"Email {record['description']} refused for: {', '.join(refused)}")
+                    self._sent(record)
+                break
+
+    def _sent(self, record: Dict[str, Any]):
+        self.store.delete(record["id"])
+        with self._cond:
+            self.records.pop(record["id"], None)
+            self.stats["sent"] += 1
+            self._cond.notify_all()
+
+    def _retry(self, record: Dict[str, Any], error: Exception):
+        attempts = record["attempts"] + 1
+        if attempts >= self.max_attempts:
+            self._give_up(record, error)
+            return
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+        self.logger.warning(f"Email {record['description']} not sent ({error}); retrying in {delay:.0f}s")
+        self._update(record, attempts=attempts, next_attempt=time.time() + delay, last_error=str(error))
+        with self._cond:
+            self.stats["retries"] += 1
+
+    def _give_up(self, record: Dict[str, Any], error: Exception):
+        self.logger.error(f"Giving up on email {record['description']}: {error}")
+        record = self._update(record, attempts=record["attempts"] + 1, failed=True, last_error=str(error))
+        with self._cond:
+            self.stats["failed"] += 1
+        if self.on_failed:
+            try:
+                self.on_failed(record)
+            except Exception as e:
+                self.logger.error(f"Outbox failure callback raised: {e}")
+
+    def _update(self, record: Dict[str, Any], **changes) -> Dict[str, Any]:
+        record = dict(record, **changes)
+        self.store.put(record["id"], record)
+        with self._cond:
+            self.records[record["id"]] = record
+            self._cond.notify_all()
+        return record
+
+    def _disconnect(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.quit()
+            except Exception:
+                pass
@@ -0,0 +1,315 @@
+"""
+Long-lived IMAP session with IDLE push and an in-memory header cache.
+
+One background thread owns the connection. It logs in once, selects the
+mailbox read-only, and keeps the newest messages' headers and previews in
+a HeaderCache that is valid for one UIDVALIDITY. Between syncs it sits in
+IDLE. When the server reports EXISTS, EXPUNGE or a flag change, the thread
+leaves IDLE and syncs incrementally:
+
+- new messages are fetched from the cached UIDNEXT upwards;
+- flags and deletions are re-read for the cached UID range only.
+
+"Check email" and "unread count" read the cache and never touch the network.
+Any failure drops the connection; the thread reconnects with exponential
+backoff. Servers without IDLE are polled instead.
+"""
+import logging
+import select
+import ssl
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .mail_fetch import IMAPError, fetch_range, fetch_recent, latest_uid, mailbox_status, parse_fetch
+
+CHANGE_EVENTS = (b"EXISTS", b"EXPUNGE", b"FETCH")
+
+
+class HeaderCache:
+    """Headers and previews of a mailbox's newest messages, keyed by (UIDVALIDITY, UID)."""
+
+    def __init__(self, size: int = 50):
+        self.size = size
+        self.uidvalidity: Optional[int] = None
+        self.uidnext = 0
+        self.unseen = 0
+        self.total = 0
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.synced_at: Optional[float] = None
+
+    def reset(self, uidvalidity: Optional[int]):
+        """Forget everything; UIDs from another UIDVALIDITY mean nothing."""
+        self.uidvalidity = uidvalidity
+        self.uidnext = 0
+        self.messages.clear()
+
+    def add(self, messages: Dict[int, Dict[str, Any]]):
+        self.messages.update(messages)
+        excess = len(self.messages) - self.size
+        for uid in sorted(self.messages)[:max(0, excess)]:
+            del self.messages[uid]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """Newest first."""
+        return [dict(self.messages[uid]) for uid in sorted(self.messages, reverse=True)[:limit]]
+
+
+class MailSession:
+    """Keeps one IMAP connection open and the header cache current."""
+
+    def __init__(self, connect: Callable[[], Any], mailbox: str = "INBOX", cache_size: int = 50,
+                 preview_bytes: int = 2048, idle_timeout: float = 540, poll_interval: float = 120,
+                 max_backoff: float = 300, on_new_mail: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        """
+        Args:
+            connect: Returns a logged-in imaplib.IMAP4
+            mailbox: Mailbox to watch
+            cache_size: Newest messages kept in the cache
+            preview_bytes: Body bytes fetched per message
+            idle_timeout: Seconds per IDLE before re-issuing it (servers drop IDLE after ~30 min)
+            poll_interval: Seconds between syncs for servers without IDLE
+            max_backoff: Longest wait between reconnect attempts
+            on_new_mail: Called with new messages (newest first) found after the first sync
+        """
+        self.logger = logging.getLogger('jarvis.mail_session')
+        self.connect = connect
+        self.mailbox = mailbox
+        self.preview_bytes = preview_bytes
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.on_new_mail = on_new_mail
+        self.cache = HeaderCache(cache_size)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._synced = threading.Condition(self._lock)
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.connected = False
+        self.stats = {"connects": 0, "syncs": 0, "idle_wakeups": 0, "errors": 0, "last_error": None}
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="mail-session", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """True once the cache holds a completed sync."""
+        return self.cache.synced_at is not None
+
+    def wait_ready(self, timeout: float) -> bool:
+        with self._synced:
+            return self._synced.wait_for(lambda: self.ready, timeout)
+
+    def refresh(self, timeout: float = 10.0) -> bool:
+        """Ask for a sync now and wait for it; False if it did not finish in time."""
+        with self._synced:
+            syncs = self.stats["syncs"]
+        self._wake.set()
+        with self._synced:
+            return self._synced.wait_for(lambda: self.stats["syncs"] > syncs, timeout)
+
+    def recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.cache.recent(limit)
+
+    def unseen_count(self) -> int:
+        with self._lock:
+            return self.cache.unseen
+
+    def report(self) -> Dict[str, Any]:
+        """Stats for the health status."""
+        with self._lock:
+            report = dict(self.stats)
+            report.update(connected=self.connected, cached=len(self.cache.messages), unseen=self.cache.unseen,
+                          synced_at=self.cache.synced_at)
+        return report
+
+    def sync(self, conn) -> List[Dict[str, Any]]:
+        """
+        Bring the cache up to date over an open connection.
+
+        Returns:
+            Messages that arrived since the previous sync, newest first
+        """
+        # STATUS on the selected mailbox is discouraged by RFC 3501 but served
+        # correctly by common servers, and it is the only cheap unseen count
+        counters = mailbox_status(conn, self.mailbox)
+        uidvalidity = counters.get("uidvalidity")
+        # Some servers leave UIDNEXT out of STATUS; without it the cache never fills
+        uidnext = counters.get("uidnext") or latest_uid(conn) + 1
+        with self._lock:
+            if uidvalidity != self.cache.uidvalidity:
+                self.cache.reset(uidvalidity)
+            known_next = self.cache.uidnext
+            cached = sorted(self.cache.messages)
+
+        new: Dict[int, Dict[str, Any]] = {}
+        flags: Optional[Dict[int, Dict[str, Any]]] = None
+        if not known_next:
+            recent = fetch_recent(conn, uidnext, limit=self.cache.size, preview_bytes=self.preview_bytes)
+            loaded = {message["uid"]: message for message in recent}
+        else:
+            loaded = {}
+            if uidnext > known_next:
+                new = fetch_range(conn, known_next, "*", self.preview_bytes)
+                # "n:*" always matches the newest message, even if it is older than n
+                new = {uid: message for uid, message in new.items() if uid >= known_next}
+            if cached:
+                result, data = conn.uid("FETCH", f"{cached[0]}:{cached[-1]}", "(UID FLAGS)")
+                if result != "OK":
+                    raise IMAPError(f"UID FETCH flags failed: {data}")
+                flags = parse_fetch(data)
+
+        with self._synced:
+            if flags is not None:
+                for uid in cached:
+                    if uid not in flags:
+                        self.cache.messages.pop(uid, None)  # Expunged
+                    elif uid in self.cache.messages:
+                        self.cache.messages[uid]["unread"] = "\\Seen" not in flags[uid]["flags"]
+            self.cache.add(loaded)
+            self.cache.add(new)
+            self.cache.uidnext = max(uidnext, known_next)
+            self.cache.unseen = counters.get("unseen", 0)
+            self.cache.total = counters.get("messages", len(self.cache.messages))
+            self.cache.synced_at = time.time()
+            self.stats["syncs"] += 1
+            self._synced.notify_all()
+        return [new[uid] for uid in sorted(new, reverse=True)]
+
+    def _run(self):
+        backoff = 1.0
+        while not self._stopped:
+            conn = None
+            try:
+                conn = self.connect()
+                result, data = conn.select(self.mailbox, readonly=True)
+                if result != "OK":
+                    raise IMAPError(f"SELECT {self.mailbox} failed: {data}")
+                self.connected = True
+                self.stats["connects"] += 1
+                can_idle = "IDLE" in getattr(conn, "capabilities", ())
+                # After a reconnect, mail that came in while we were away is new
+                primed = self.ready
+                new = self.sync(conn)
+                if primed:
+                    self._notify(new)
+                backoff = 1.0
+                while not self._stopped:
+                    if can_idle:
+                        changed = self._idle(conn, self.idle_timeout)
+                    else:
+                        changed = self._wake.wait(self.poll_interval)
+                        conn.noop()
+                    self._wake.clear()
+                    if self._stopped:
+                        break
+                    if changed:
+                        self.stats["idle_wakeups"] += 1
+                    self._notify(self.sync(conn))
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.stats["last_error"] = str(e)
+                self.logger.warning(f"Mail session error, reconnecting in {backoff:.0f}s: {e}")
+            finally:
+                self.connected = False
+                self._close(conn)
+            if not self._stopped:
+                self._wake.wait(backoff)
+                self._wake.clear()
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def _notify(self, new: List[Dict[str, Any]]):
+        if new and self.on_new_mail:
+            self.on_new_mail(new)
+
+    def _idle(self, conn, timeout: float) -> bool:
+        """
+        IDLE until the mailbox changes, timeout passes, or a refresh/stop is requested.
+
+        imaplib has no IDLE before Python 3.14, so the exchange is done on its
+        send/readline primitives: the connection is not used for anything else
+        until DONE has been answered.
+
+        Returns:
+            True if the server reported a change
+        """
+        tag = conn._new_tag()
+        conn.send(tag + b" IDLE\r\n")
+        changed = False
+        while True:
+            line = conn.readline()
+            if not line:
+                raise IMAPError("Connection closed entering IDLE")
+            if line.startswith(b"+"):
+                break
+            if line.startswith(tag):
+                raise IMAPError(f"IDLE refused: {line.strip()!r}")
+            changed = changed or _is_change(line)
+
+        deadline = time.monotonic() + timeout
+        sock = conn.socket()
+        while not changed and not self._wake.is_set() and time.monotonic() < deadline:
+            # A response that came in the same packet as "+ idling" already sits
+            # in imaplib's read buffer, where select() cannot see it
+            if not _buffered(conn) and not select.select([sock], [], [], 1.0)[0]:
+                continue
+            line = conn.readline()
+            if not line:
+                raise IMAPError("Connection closed during IDLE")
+            changed = _is_change(line)
+
+        conn.send(b"DONE\r\n")
+        while True:
+            line = conn.readline()
+            if not line:
+                raise IMAPError("Connection closed leaving IDLE")
+            if line.startswith(tag):
+                if not line[len(tag):].lstrip().upper().startswith(b"OK"):
+                    raise IMAPError(f"IDLE ended with {line.strip()!r}")
+                return changed
+            changed = changed or _is_change(line)
+
+    @staticmethod
+    def _close(conn):
+        if conn is None:
+            return
+        try:
+            conn.logout()
+        except Exception:
+            pass
+
+
+def _buffered(conn) -> bool:
+    """
+    Whether a line can be read without waiting on the socket.
+
+    Peeks at imaplib's buffered reader with the socket briefly non-blocking,
+    which also picks up bytes an SSL socket has decrypted but not handed out.
+    """
+    reader = getattr(conn, "file", None)
+    if reader is None or not hasattr(reader, "peek"):
+        return False
+    sock = conn.socket()
+    timeout = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        return bool(reader.peek(1))
+    except (BlockingIOError, ssl.SSLWantReadError):
+        return False
+    finally:
+        sock.settimeout(timeout)
+
+
+def _is_change(line: bytes) -> bool:
+    """Untagged EXISTS, EXPUNGE or FETCH (flag change) response."""
+    return line.startswith(b"*") and any(event in line for event in CHANGE_EVENTS)
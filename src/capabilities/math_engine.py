@@ -0,0 +1,304 @@
+"""
+Spoken arithmetic without eval.
+
+Text is normalized (number words to digits, operator phrases to symbols),
+parsed with the ast module, checked against a whitelist of node types,
+functions and constants, and compiled into nested closures. Compiled
+expressions are cached by their normalized text, so repeating a calculation
+skips parsing entirely. The same compiler targets NumPy functions for
+evaluating one expression over whole arrays of inputs.
+"""
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+SMALL_NUMBERS = {
+    "zero": 0, "oh": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17,
+    "eighteen": 18, "nineteen": 19, "twenty": 20, "thirty": 30, "forty": 40,
+    "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+SCALES = {"hundred": 100, "thousand": 1_000, "million": 1_000_000, "billion": 1_000_000_000}
+FRACTIONS = {"half": 0.5, "quarter": 0.25, "third": 1 / 3}
+
+# Longest phrases first so "multiplied by" wins over "by"
+OPERATOR_PHRASES = [
+    ("to the power of", "**"), ("raised to", "**"), ("multiplied by", "*"), ("divided by", "/"),
+    ("square root of", "sqrt "), ("percent of", "/100*"), ("squared", "**2"), ("cubed", "**3"),
+    ("modulo", "%"), ("plus", "+"), ("minus", "-"), ("times", "*"), ("over", "/"), ("mod", "%"),
+]
+FILLER = re.compile(r"\b(?:what is|what's|whats|how much is|calculate|compute|equals?|the result of)\b|\?")
+PHRASE_PATTERN = re.compile(r"\b(?:" + "|".join(re.escape(p) for p, _ in OPERATOR_PHRASES) + r")\b")
+NUMBER_WORD_RUN = re.compile(
+    r"\b(?:(?:" + "|".join(list(SMALL_NUMBERS) + list(SCALES) + ["point", "and", "a", "an"] + list(FRACTIONS))
+    + r")(?:\s+|-|\b))+"
+)
+FUNCTION_ARGUMENT = re.compile(r"\b(sqrt|sin|cos|tan|log10|log|exp|abs)\s+(-?[\d.]+|pi|e|tau)\b")
+
+MAX_EXPONENT = 10_000
+MAX_RESULT_BITS = 100_000  # About 30,000 decimal digits
+
+
+def parse_number_words(words: List[str]) -> Optional[float]:
+    """
+    Value of a run of number words, e.g. "three hundred and two", "five and a half".
+
+    Returns:
+        The number, or None if the words do not form one
+    """
+    total = 0
+    current = 0
+    seen = False
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word in SMALL_NUMBERS:
+            current += SMALL_NUMBERS[word]
+            seen = True
+        elif word == "hundred" and seen:
+            current = (current or 1) * 100
+        elif word in SCALES and seen:
+            total += (current or 1) * SCALES[word]
+            current = 0
+        elif word == "point" and seen:
+            digits = []
+            for digit_word in words[i + 1:]:
+                if digit_word not in SMALL_NUMBERS or SMALL_NUMBERS[digit_word] > 9:
+                    break
+                digits.append(str(SMALL_NUMBERS[digit_word]))
+            if not digits:
+                return None
+            return total + current + float("0." + "".join(digits))
+        elif word in FRACTIONS and i > 0 and words[i - 1] in ("a", "an", "one"):
+            # "five and a half"; a bare "a half" is 0.5
+            if words[i - 1] == "one":
+                current -= 1
+            return total + current + FRACTIONS[word]
+        elif word not in ("and", "a", "an"):
+            return None
+        i += 1
+    return total + current if seen else None
+
+
+def replace_number_words(text: str) -> str:
+    """Replace each run of number words in text with digits."""
+    def substitute(match):
+        run = match.group(0)
+        words = run.replace("-", " ").split()
+        # Keep leading/trailing connectives ("plus a", "and") as plain words
+        lead = []
+        while words and words[0] in ("and", "a", "an") and not (
+                words[0] != "and" and len(words) > 1 and words[1] in FRACTIONS):
+            lead.append(words.pop(0))
+        trail = []
+        while words and words[-1] in ("and", "a", "an", "point"):
+            trail.insert(0, words.pop())
+        value = parse_number_words(words) if words else None
+        if value is None:
+            return run
+        number = str(int(value)) if float(value).is_integer() else repr(value)
+        return " ".join(lead + [number] + trail) + (" " if run[-1:].isspace() else "")
+    return NUMBER_WORD_RUN.sub(substitute, text)
+
+
+@lru_cache(maxsize=512)
+def normalize(text: str) -> str:
+    """Turn spoken math into an infix expression string (cached by raw text)."""
+    text = text.lower().strip()
+    text = FILLER.sub(" ", text)
+    text = replace_number_words(text)
+    text = PHRASE_PATTERN.sub(lambda m: f" {dict(OPERATOR_PHRASES)[m.group(0)]} ", text)
+    text = re.sub(r"(?<=\d)\s*x\s*(?=\d)", " * ", text)  # "5 x 3"
+    text = text.replace("^", "**").replace(",", "")
+    # "sqrt 144" / "log 100" -> function calls
+    text = FUNCTION_ARGUMENT.sub(r"\1(\2)", text)
+    return " ".join(text.split())
+
+
+def safe_pow(base, exponent):
+    """Power with a bounded exponent and result size so one request cannot hang the assistant."""
+    if isinstance(exponent, (int, float)) and abs(exponent) > MAX_EXPONENT:
+        raise ValueError("Exponent too large")
+    # Integer powers never overflow, so nested ones like (9**9999)**9999 must be bounded up front
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 \
+            and base.bit_length() * exponent > MAX_RESULT_BITS:
+        raise ValueError("Result too large")
+    return operator.pow(base, exponent)
+
+
+BINARY_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+    ast.Pow: safe_pow,
+}
+UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+MATH_FUNCTIONS = {
+    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "log": math.log, "log10": math.log10, "exp": math.exp, "abs": abs, "round": round,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+
+def numpy_functions() -> Dict[str, Callable]:
+    import numpy as np
+
+    return {
+        "sqrt": np.sqrt, "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "log": np.log, "log10": np.log10, "exp": np.exp, "abs": np.abs, "round": np.round,
+    }
+
+
+Compiled = Callable[[Dict[str, Any]], Any]
+
+
+def compile_node(node: ast.AST, functions: Dict[str, Callable], variables: Tuple[str, ...]) -> Tuple[Compiled, bool]:
+    """
+    Compile a validated AST node into a closure taking a variables dict.
+
+    Returns:
+        (closure, is_constant); constant subtrees are folded at compile time
+    """
+    if isinstance(node, ast.Expression):
+        return compile_node(node.body, functions, variables)
+
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = node.value
+        return (lambda env: value), True
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return (lambda env: value), True
+        if node.id in variables:
+            name = node.id
+            return (lambda env: env[name]), False
+        raise ValueError(f"Unknown name '{node.id}'")
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPS:
+        op = BINARY_OPS[type(node.op)]
+        left, left_const = compile_node(node.left, functions, variables)
+        right, right_const = compile_node(node.right, functions, variables)
+        if left_const and right_const:
+            value = op(left(None), right(None))
+            return (lambda env: value), True
+        return (lambda env: op(left(env), right(env))), False
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPS:
+        op = UNARY_OPS[type(node.op)]
+        operand, const = compile_node(node.operand, functions, variables)
+        if const:
+            value = op(operand(None))
+            return (lambda env: value), True
+        return (lambda env: op(operand(env))), False
+
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in functions and not node.keywords):
+        func = functions[node.func.id]
+        compiled = [compile_node(arg, functions, variables) for arg in node.args]
+        args = [closure for closure, _ in compiled]
+        if all(const for _, const in compiled):
+            value = func(*(arg(None) for arg in args))
+            return (lambda env: value), True
+        if len(args) == 1:
+            arg = args[0]
+            return (lambda env: func(arg(env))), False
+        return (lambda env: func(*(arg(env) for arg in args))), False
+
+    raise ValueError(f"Unsupported expression: {type(node).__name__}")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str, variables: Tuple[str, ...] = (), vectorized: bool = False) -> Compiled:
+    """
+    Parse and compile a normalized expression (cached by text).
+
+    Raises:
+        ValueError / SyntaxError: For anything outside the whitelist
+    """
+    tree = ast.parse(expression, mode="eval")
+    functions = numpy_functions() if vectorized else MATH_FUNCTIONS
+    closure, _ = compile_node(tree, functions, variables)
+    return closure
+
+
+def format_number(value: Any) -> str:
+    """Render a result the way it should be spoken."""
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.10g}"
+    if isinstance(value, int) and abs(value) >= 10 ** 15:
+        return _scientific(value)
+    return str(value)
+
+
+def _scientific(value: int) -> str:
+    """
+    Large integer in the same notation as a large float, without str(value).
+
+    str() of an int over sys.get_int_max_str_digits() digits raises, and
+    float() overflows past 1e308; both are reachable below MAX_RESULT_BITS.
+    """
+    magnitude = abs(value)
+    exponent = int(magnitude.bit_length() * 0.30102999566398)  # log10(2)
+    while 10 ** exponent > magnitude:
+        exponent -= 1
+    while 10 ** (exponent + 1) <= magnitude:
+        exponent += 1
+    leading = magnitude // 10 ** (exponent - 10)  # 11 significant digits
+    mantissa = f"{leading / 10 ** 10:.10g}"
+    if mantissa.startswith("10"):  # Rounded up to the next power of ten
+        mantissa, exponent = "1", exponent + 1
+    return f"{'-' if value < 0 else ''}{mantissa}e+{exponent}"
+
+
+class MathEngine:
+    """Evaluate spoken or typed math through the compiled-expression cache."""
+
+    def evaluate(self, text: str) -> Tuple[str, Any]:
+        """
+        Evaluate one expression.
+
+        Returns:
+            (normalized expression, result)
+        """
+        expression = normalize(text)
+        return expression, compile_expression(expression)({})
+
+    def evaluate_many(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch; failures are reported per item.
+
+        Returns:
+            [{"expression", "result"} or {"expression", "error"}]
+        """
+        results = []
+        for text in texts:
+            expression = normalize(text)
+            try:
+                results.append({"expression": expression, "result": compile_expression(expression)({})})
+            except (ValueError, SyntaxError, ArithmeticError, TypeError) as e:
+                results.append({"expression": expression, "error": str(e)})
+        return results
+
+    def evaluate_array(self, text: str, **arrays: Any) -> Any:
+        """
+        Evaluate one expression over NumPy arrays in a single vectorized pass.
+
+        Example:
+            engine.evaluate_array("x squared plus 1", x=np.arange(5))
+        """
+        import numpy as np
+
+        expression = normalize(text)
+        closure = compile_expression(expression, tuple(sorted(arrays)), vectorized=True)
+        return closure({name: np.asarray(values) for name, values in arrays.items()})
+
+    @staticmethod
+    def cache_info():
+        return compile_expression.cache_info()
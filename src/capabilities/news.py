@@ -0,0 +1,134 @@
+"""News headlines aggregated from RSS/Atom feeds."""
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote_plus
+
+from utils.feeds import Headline, dedupe, parse_feed
+from utils.http_cache import get_session
+from utils.ttl_cache import TTLCache
+
+
+class NewsAggregator:
+    """Fetches several topics or feeds concurrently and merges their headlines."""
+
+    GOOGLE_NEWS_RSS = "https://news.google.com/rss"
+
+    def __init__(self, topics: Optional[List[str]] = None, feeds: Optional[Dict[str, str]] = None,
+                 cache_ttl: float = 900, stale_ttl: float = 3600, timeout: float = 8,
+                 fetch_workers: int = 4, deadline: float = 6, max_items: int = 30,
+                 similarity: float = 0.6, cache_entries: int = 64):
+        """
+        Args:
+            topics: Topics read when no topic is asked for ("world" = top stories)
+            feeds: Topic name -> RSS/Atom URL; other topics use a Google News search feed
+            cache_ttl: Seconds a topic's headlines are served without refetching
+            stale_ttl: Further seconds old headlines are served while they refresh
+            timeout: HTTP timeout in seconds
+            fetch_workers: Feeds fetched concurrently
+            deadline: Seconds to wait for all topics before answering with what arrived
+            max_items: Items read per feed
+            similarity: Shingle similarity at which two headlines count as the same story
+            cache_entries: Topics kept in the cache
+        """
+        self.logger = logging.getLogger('jarvis.news')
+        self.topics = [topic.lower() for topic in (topics or ["world"])]
+        self.feeds = {name.lower(): url for name, url in (feeds or {}).items()}
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_items = max_items
+        self.similarity = similarity
+        self.cache = TTLCache(ttl=cache_ttl, stale_ttl=stale_ttl, refresh_workers=fetch_workers,
+                              max_entries=cache_entries, name="news-cache")
+        self._pool = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="news-fetch")
+        self._stopped = False
+
+    def feed_url(self, topic: str) -> str:
+        """Feed URL for a topic: configured feed, Google News top stories, or a Google News search."""
+        if topic in self.feeds:
+            return self.feeds[topic]
+        if topic in ("world", "top", "headlines", ""):
+            return f"{self.GOOGLE_NEWS_RSS}?hl=en-US&gl=US&ceid=US:en"
+        return f"{self.GOOGLE_NEWS_RSS}/search?q={quote_plus(topic)}&hl=en-US&gl=US&ceid=US:en"
+
+    def _fetch(self, topic: str) -> List[Headline]:
+        """Download and parse one topic's feed (raises on failure)."""
+        response = get_session().get(self.feed_url(topic), timeout=self.timeout)
+        if response.status_code != 200:
+            raise ConnectionError(f"News feed for {topic} returned HTTP {response.status_code}")
+        return parse_feed(response.content, topic=topic, max_items=self.max_items)
+
+    def get_topic(self, topic: str) -> List[Headline]:
+        """One topic's headlines, from cache when fresh enough."""
+        topic = topic.lower().strip()
+        return self.cache.get(topic, lambda: self._fetch(topic))
+
+    def get_headlines(self, topics: Optional[List[str]] = None, limit: int = 5) -> Dict[str, Any]:
+        """
+        Latest headlines across topics, near-duplicates removed.
+
+        Topics are fetched in parallel; any that miss the deadline are left
+        out (they keep loading into the cache for next time). Headlines are
+        interleaved across topics, newest first within each.
+
+        Returns:
+            {"success", "headlines": [Headline], "failed": [topic], "message"}
+        """
+        topics = [topic.lower().strip() for topic in (topics or self.topics)]
+        futures = {topic: self._pool.submit(self.get_topic, topic) for topic in dict.fromkeys(topics)}
+        wait(futures.values(), timeout=self.deadline)
+
+        per_topic, failed = [], []
+        for topic, future in futures.items():
+            if not future.done() or future.exception() is not None:
+                failed.append(topic)
+                if future.done():
+                    self.logger.warning(f"News for {topic} failed: {future.exception()}")
+                continue
+            items = sorted(future.result(), key=lambda h: h.published or 0, reverse=True)
+            per_topic.append(items)
+
+        # Round-robin so every topic is represented near the top
+        merged = [item for row in _interleave(per_topic) for item in row]
+        headlines = dedupe(merged, threshold=self.similarity)[:limit]
+        if not headlines:
+            return {"success": False, "headlines": [], "failed": failed,
+                    "message": "Could not fetch news headlines"}
+        return {"success": True, "headlines": headlines, "failed": failed,
+                "message": f"Here are the top {len(headlines)} headlines"}
+
+    def prefetch(self):
+        """Refresh every configured topic in the background."""
+        for topic in self.topics:
+            self.cache.refresh(topic, lambda topic=topic: self._fetch(topic))
+
+    def start_prefetch(self, scheduler, interval: float = 840, delay: float = 15):
+        """Refresh configured topics on a scheduler every interval seconds (keep below cache_ttl)."""
+        def run():
+            if self._stopped:
+                return
+            try:
+                self.prefetch()
+            finally:
+                if not self._stopped:
+                    scheduler.schedule(interval, run)
+        scheduler.schedule(delay, run)
+
+    def cache_report(self) -> Dict[str, Any]:
+        """Cache stats for the health status."""
+        return {
+            "cache_hit_rate": f"{self.cache.hit_ratio() * 100:.1f}%",
+            "cached_topics": len(self.cache),
+            "fetch_errors": self.cache.counters()["errors"],
+        }
+
+    def close(self):
+        self._stopped = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+
+def _interleave(rows: List[List[Headline]]) -> List[List[Headline]]:
+    """[[a1, a2], [b1]] -> [[a1, b1], [a2]]"""
+    depth = max((len(row) for row in rows), default=0)
+    return [[row[i] for row in rows if i < len(row)] for i in range(depth)]
@@ -3,7 +3,7 @@ import os
 import sys
 import platform
 import subprocess
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class SystemController:
@@ -34,12 +34,13 @@ class SystemController:
             return False
         return True
     
-    def open_application(self, app_name: str) -> Dict[str, Any]:
+    def open_application(self, app_name: str, argv: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Open an application.
         
         Args:
             app_name: Name of the application
+            argv: Already resolved command line; skips name mapping when given
             
         Returns:
             Result dictionary with success status and message
@@ -48,6 +49,10 @@ class SystemController:
             return {"success": False, "message": "Authorization required for system control"}
         
         try:
+            if argv:
+                subprocess.Popen(argv)
+                return {"success": True, "message": f"Opening {app_name}"}
+            
             app_name_lower = app_name.lower()
             
             if self.platform == "windows":
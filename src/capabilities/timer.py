@@ -1,24 +1,59 @@
 """Timer and reminder capabilities."""
+import math
 import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
-import winsound  # For Windows beep
+
+from utils.lazy_import import lazy_import
+from utils.scheduler import Scheduler, get_scheduler
+from utils.journal_store import JournalStore
+
+winsound = lazy_import('winsound')  # For Windows beep; absent on other platforms
 
 
 class TimerManager:
-    """Manage timers and alarms."""
+    """Manage timers, alarms and recurring reminders."""
     
-    def __init__(self, speak_callback=None):
+    def __init__(self, speak_callback=None, scheduler: Optional[Scheduler] = None,
+                 store_path: Optional[str] = None):
         """
         Initialize timer manager.
         
         Args:
             speak_callback: Function to call for voice notifications
+            scheduler: Scheduler to run timers on (default: the shared one)
+            store_path: Base path for durable storage; timers are memory-only if None
         """
         self.speak_callback = speak_callback
-        self.timers: List[Dict[str, Any]] = []
+        self.scheduler = scheduler or get_scheduler()
+        self.timers: Dict[int, Dict[str, Any]] = {}  # id -> timer, in creation order
         self.timer_id_counter = 0
+        self._lock = threading.Lock()
+        self.store = JournalStore(store_path) if store_path else None
+        if self.store:
+            self._restore()
+    
+    def _restore(self):
+        """Reschedule persisted timers; overdue ones fire immediately."""
+        records = sorted(self.store.all().values(), key=lambda r: r['id'])
+        with self._lock:
+            for record in records:
+                self.timer_id_counter = max(self.timer_id_counter, record['id'])
+                self._schedule(record)
+    
+    def _schedule(self, record: Dict[str, Any]):
+        """Schedule a timer record (lock held) and track it in memory."""
+        timer = dict(record)
+        timer['start_time'] = datetime.fromtimestamp(record['start'])
+        timer['end_time'] = datetime.fromtimestamp(record['due'])
+        timer['task'] = self.scheduler.schedule(record['due'] - time.time(), self._on_timer, record['id'])
+        self.timers[record['id']] = timer
+    
+    @staticmethod
+    def _record(timer: Dict[str, Any]) -> Dict[str, Any]:
+        """The persisted form of a timer."""
+        return {k: v for k, v in timer.items() if k not in ('task', 'start_time', 'end_time')}
     
     def _beep(self):
         """Play a beep sound."""
@@ -31,21 +66,75 @@ class TimerManager:
             # Fallback - just print
             print("\a" * 3)
     
-    def _timer_thread(self, timer_id: int, duration: int, label: str):
-        """Thread function for timer countdown."""
-        time.sleep(duration)
-        
-        # Find and remove the timer
-        self.timers = [t for t in self.timers if t['id'] != timer_id]
+    def _on_timer(self, timer_id: int):
+        """Scheduler callback when a timer expires."""
+        with self._lock:
+            timer = self.timers.pop(timer_id, None)
+            if timer is None:
+                return  # Cancelled after the scheduler had already dispatched it
+            
+            if timer.get('interval'):
+                # Recurring: next occurrence after now, skipping any missed while offline
+                record = self._record(timer)
+                now = time.time()
+                periods = max(1, math.ceil((now - record['due']) / record['interval']))
+                record['due'] += periods * record['interval']
+                self._schedule(record)
+                if self.store:
+                    self.store.put(str(timer_id), record)
+            elif self.store:
+                self.store.delete(str(timer_id))
         
         # Alert
         self._beep()
-        message = f"Timer finished: {label}" if label else "Timer finished!"
+        if timer.get('message'):
+            message = f"Reminder: {timer['message']}"
+        else:
+            label = timer['label']
+            message = f"Timer finished: {label}" if label else "Timer finished!"
         print(f"\n🔔 {message}")
         
         if self.speak_callback:
             self.speak_callback(message)
     
+    def _add(self, duration: int, label: str, message: Optional[str] = None,
+             interval: Optional[int] = None) -> int:
+        """Create, persist and schedule a timer; returns its id."""
+        with self._lock:
+            self.timer_id_counter += 1
+            timer_id = self.timer_id_counter
+            
+            now = time.time()
+            record = {
+                'id': timer_id,
+                'duration': duration,
+                'label': label or f"Timer {timer_id}",
+                'message': message,
+                'interval': interval,
+                'start': now,
+                'due': now + duration
+            }
+            self._schedule(record)
+            if self.store:
+                # Queued for the journal writer; never waits on disk
+                self.store.put(str(timer_id), record)
+        return timer_id
+    
+    @staticmethod
+    def _format_duration(duration: int) -> str:
+        minutes = duration // 60
+        seconds = duration % 60
+        
+        time_str = ""
+        if minutes > 0:
+            time_str += f"{minutes} minute{'s' if minutes != 1 else ''}"
+        if seconds > 0:
+            if time_str:
+                time_str += f" and {seconds} second{'s' if seconds != 1 else ''}"
+            else:
+                time_str += f"{seconds} second{'s' if seconds != 1 else ''}"
+        return time_str
+    
     def set_timer(self, duration: int, label: Optional[str] = None) -> Dict[str, Any]:
         """
         Set a timer.
@@ -58,54 +147,60 @@ class TimerManager:
             Result dictionary
         """
         try:
-            self.timer_id_counter += 1
-            timer_id = self.timer_id_counter
-            
-            timer_data = {
-                'id': timer_id,
-                'duration': duration,
-                'label': label or f"Timer {timer_id}",
-                'start_time': datetime.now(),
-                'end_time': datetime.now() + timedelta(seconds=duration)
+            timer_id = self._add(duration, label)
+            return {
+                "success": True,
+                "message": f"Timer set for {self._format_duration(duration)}",
+                "timer_id": timer_id
             }
             
-            self.timers.append(timer_data)
-            
-            # Start timer thread
-            thread = threading.Thread(
-                target=self._timer_thread,
-                args=(timer_id, duration, timer_data['label']),
-                daemon=True
-            )
-            thread.start()
-            
-            minutes = duration // 60
-            seconds = duration % 60
-            
-            time_str = ""
-            if minutes > 0:
-                time_str += f"{minutes} minute{'s' if minutes != 1 else ''}"
-            if seconds > 0:
-                if time_str:
-                    time_str += f" and {seconds} second{'s' if seconds != 1 else ''}"
-                else:
-                    time_str += f"{seconds} second{'s' if seconds != 1 else ''}"
+        except Exception as e:
+            return {
+                "success": False,
+                "message": f"Failed to set timer: {str(e)}"
+            }
+    
+    def set_reminder(self, message: str, delay: int, interval: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Set a reminder, optionally repeating.
+        
+        Args:
+            message: What to remind about
+            delay: Seconds until the first reminder
+            interval: Seconds between repeats, or None for a one-off reminder
             
+        Returns:
+            Result dictionary
+        """
+        try:
+            timer_id = self._add(delay, f"Reminder: {message}", message=message, interval=interval)
+            if interval:
+                text = f"I'll remind you to {message} every {self._format_duration(interval)}"
+            else:
+                text = f"I'll remind you to {message} in {self._format_duration(delay)}"
             return {
                 "success": True,
-                "message": f"Timer set for {time_str}",
+                "message": text,
                 "timer_id": timer_id
             }
             
         except Exception as e:
             return {
                 "success": False,
-                "message": f"Failed to set timer: {str(e)}"
+                "message": f"Failed to set reminder: {str(e)}"
             }
     
+    def close(self):
+        """Flush pending storage writes."""
+        if self.store:
+            self.store.close()
+    
     def list_timers(self) -> Dict[str, Any]:
         """List active timers."""
-        if not self.timers:
+        with self._lock:
+            timers = list(self.timers.values())
+        
+        if not timers:
             return {
                 "success": True,
                 "message": "No active timers"
@@ -114,7 +209,7 @@ class TimerManager:
         now = datetime.now()
         timer_list = []
         
-        for timer in self.timers:
+        for timer in timers:
             remaining = (timer['end_time'] - now).total_seconds()
             if remaining > 0:
                 minutes = int(remaining // 60)
@@ -128,31 +223,36 @@ class TimerManager:
         return {
             "success": True,
             "message": message,
-            "timers": self.timers
+            "timers": [{k: v for k, v in t.items() if k != 'task'} for t in timers]
         }
     
     def cancel_timer(self, timer_id: Optional[int] = None) -> Dict[str, Any]:
         """Cancel a timer."""
-        if not self.timers:
+        with self._lock:
+            if not self.timers:
+                return {
+                    "success": False,
+                    "message": "No active timers to cancel"
+                }
+            
+            if timer_id is None:
+                # Cancel most recent
+                timer_id = next(reversed(self.timers))
+            timer = self.timers.pop(timer_id, None)
+            if timer and self.store:
+                self.store.delete(str(timer_id))
+        
+        if timer is None:
             return {
                 "success": False,
-                "message": "No active timers to cancel"
+                "message": f"No timer with id {timer_id}"
             }
         
-        if timer_id is None:
-            # Cancel most recent
-            timer = self.timers.pop()
-            return {
-                "success": True,
-                "message": f"Cancelled timer: {timer['label']}"
-            }
-        else:
-            # Cancel specific timer
-            self.timers = [t for t in self.timers if t['id'] != timer_id]
-            return {
-                "success": True,
-                "message": f"Cancelled timer {timer_id}"
-            }
+        self.scheduler.cancel(timer['task'])
+        return {
+            "success": True,
+            "message": f"Cancelled timer: {timer['label']}"
+        }
     
     def parse_duration(self, text: str) -> Optional[int]:
         """
@@ -0,0 +1,243 @@
+"""
+Unit registry with dimensional analysis.
+
+Every unit is defined once against its dimension's base unit (value in base
+= value * factor + offset), optionally expanded with SI or binary prefixes,
+and reachable through its name, plural, symbol and aliases. Conversions
+between every pair of units of the same dimension are computed once into a
+factor table, so converting is a dictionary lookup and one multiply-add,
+and a whole array converts in a single vectorized pass. Units of different
+dimensions never convert.
+"""
+import re
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .math_engine import replace_number_words
+
+
+class Unit(NamedTuple):
+    name: str
+    plural: str
+    dimension: str
+    factor: float
+    offset: float = 0.0
+
+
+SI_PREFIXES = {
+    "nano": ("n", 1e-9), "micro": ("u", 1e-6), "milli": ("m", 1e-3), "centi": ("c", 1e-2),
+    "deci": ("d", 1e-1), "kilo": ("k", 1e3), "mega": ("M", 1e6), "giga": ("G", 1e9), "tera": ("T", 1e12),
+}
+BINARY_PREFIXES = {"kibi": ("Ki", 2 ** 10), "mebi": ("Mi", 2 ** 20), "gibi": ("Gi", 2 ** 30), "tebi": ("Ti", 2 ** 40)}
+
+# (name, plural, dimension, factor, offset, symbols, aliases, prefixes)
+# Factors are relative to the dimension's base unit (the one with factor 1).
+UNIT_DEFINITIONS: List[Tuple[str, str, str, float, float, Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = [
+    # Length (base: meter)
+    ("meter", "meters", "length", 1.0, 0.0, ("m",), ("metre",), ("nano", "micro", "milli", "centi", "deci", "kilo")),
+    ("inch", "inches", "length", 0.0254, 0.0, ("in", '"'), (), ()),
+    ("foot", "feet", "length", 0.3048, 0.0, ("ft", "'"), (), ()),
+    ("yard", "yards", "length", 0.9144, 0.0, ("yd",), (), ()),
+    ("mile", "miles", "length", 1609.344, 0.0, ("mi",), (), ()),
+    ("nautical mile", "nautical miles", "length", 1852.0, 0.0, ("nmi",), (), ()),
+    # Mass (base: gram)
+    ("gram", "grams", "mass", 1.0, 0.0, ("g",), ("gramme",), ("micro", "milli", "kilo")),
+    ("tonne", "tonnes", "mass", 1e6, 0.0, ("t",), ("metric ton",), ()),
+    ("ounce", "ounces", "mass", 28.349523125, 0.0, ("oz",), (), ()),
+    ("pound", "pounds", "mass", 453.59237, 0.0, ("lb", "lbs"), (), ()),
+    ("stone", "stone", "mass", 6350.29318, 0.0, ("st",), ("stones",), ()),
+    ("ton", "tons", "mass", 907184.74, 0.0, (), ("short ton",), ()),
+    # Volume (base: liter)
+    ("liter", "liters", "volume", 1.0, 0.0, ("l", "L"), ("litre",), ("milli", "centi", "deci")),
+    ("cubic meter", "cubic meters", "volume", 1000.0, 0.0, ("m3",), ("cubic metre",), ()),
+    ("teaspoon", "teaspoons", "volume", 0.00492892159375, 0.0, ("tsp",), (), ()),
+    ("tablespoon", "tablespoons", "volume", 0.01478676478125, 0.0, ("tbsp",), (), ()),
+    ("fluid ounce", "fluid ounces", "volume", 0.0295735295625, 0.0, ("fl oz",), (), ()),
+    ("cup", "cups", "volume", 0.2365882365, 0.0, (), (), ()),
+    ("pint", "pints", "volume", 0.473176473, 0.0, ("pt",), (), ()),
+    ("quart", "quarts", "volume", 0.946352946, 0.0, ("qt",), (), ()),
+    ("gallon", "gallons", "volume", 3.785411784, 0.0, ("gal",), (), ()),
+    # Temperature (base: kelvin)
+    ("kelvin", "kelvin", "temperature", 1.0, 0.0, ("K",), ("kelvins",), ()),
+    ("degree celsius", "degrees celsius", "temperature", 1.0, 273.15, ("c", "°c"), ("celsius", "centigrade"), ()),
+    ("degree fahrenheit", "degrees fahrenheit", "temperature", 5 / 9, 273.15 - 32 * 5 / 9,
+     ("f", "°f"), ("fahrenheit",), ()),
+    # Time (base: second)
+    ("second", "seconds", "time", 1.0, 0.0, ("s", "sec", "secs"), (), ("nano", "micro", "milli")),
+    ("minute", "minutes", "time", 60.0, 0.0, ("min", "mins"), (), ()),
+    ("hour", "hours", "time", 3600.0, 0.0, ("h", "hr", "hrs"), (), ()),
+    ("day", "days", "time", 86400.0, 0.0, ("d",), (), ()),
+    ("week", "weeks", "time", 604800.0, 0.0, ("wk",), (), ()),
+    ("year", "years", "time", 31557600.0, 0.0, ("yr",), (), ()),
+    # Speed (base: meter per second)
+    ("meter per second", "meters per second", "speed", 1.0, 0.0, ("m/s",), ("metre per second",), ()),
+    ("kilometer per hour", "kilometers per hour", "speed", 1000 / 3600, 0.0, ("km/h", "kph", "kmh"),
+     ("kilometre per hour",), ()),
+    ("mile per hour", "miles per hour", "speed", 1609.344 / 3600, 0.0, ("mph",), (), ()),
+    ("knot", "knots", "speed", 1852 / 3600, 0.0, ("kn", "kt"), (), ()),
+    # Area (base: square meter)
+    ("square meter", "square meters", "area", 1.0, 0.0, ("m2", "sq m"), ("square metre",), ()),
+    ("square kilometer", "square kilometers", "area", 1e6, 0.0, ("km2", "sq km"), ("square kilometre",), ()),
+    ("square foot", "square feet", "area", 0.09290304, 0.0, ("ft2", "sq ft"), (), ()),
+    ("square mile", "square miles", "area", 2589988.110336, 0.0, ("mi2", "sq mi"), (), ()),
+    ("acre", "acres", "area", 4046.8564224, 0.0, ("ac",), (), ()),
+    ("hectare", "hectares", "area", 10000.0, 0.0, ("ha",), (), ()),
+    # Energy (base: joule)
+    ("joule", "joules", "energy", 1.0, 0.0, ("J",), (), ("kilo", "mega")),
+    ("calorie", "calories", "energy", 4.184, 0.0, ("cal",), (), ("kilo",)),
+    ("kilowatt hour", "kilowatt hours", "energy", 3.6e6, 0.0, ("kWh", "kwh"), (), ()),
+    # Data (base: byte)
+    ("byte", "bytes", "data", 1.0, 0.0, ("B",), (), ("kilo", "mega", "giga", "tera", "kibi", "mebi", "gibi", "tebi")),
+    ("bit", "bits", "data", 0.125, 0.0, ("bit",), (), ("kilo", "mega", "giga")),
+]
+
+SEPARATOR = re.compile(r"\s+(?:to|into|in|as)(?=\s)")
+HOW_MANY = re.compile(r"^how many (?P<to>.+?) (?:are (?:there )?)?in (?P<quantity>.+)$")
+QUANTITY = re.compile(r"^(?P<value>[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)?\s*(?P<unit>.+)$")
+FILLER = re.compile(r"^(?:please |can you |could you )?(?:convert |what is |what's |whats )?")
+
+
+class UnitRegistry:
+    """All known units plus the precomputed conversion table."""
+
+    def __init__(self, definitions: Optional[Iterable[tuple]] = None):
+        """
+        Args:
+            definitions: UNIT_DEFINITIONS-style tuples (default: the built-in set)
+        """
+        self.units: Dict[str, Unit] = {}
+        self.aliases: Dict[str, str] = {}
+        for definition in (definitions if definitions is not None else UNIT_DEFINITIONS):
+            self._define(*definition)
+        self.table = self._build_table()
+
+    def _add(self, unit: Unit, names: Iterable[str], symbols: Iterable[str]):
+        self.units[unit.name] = unit
+        for name in names:
+            self.aliases.setdefault(name.lower(), unit.name)
+        for symbol in symbols:
+            # Symbols are case-sensitive ("Mm" vs "mm"); lowercase is only a fallback
+            self.aliases.setdefault(symbol, unit.name)
+            self.aliases.setdefault(symbol.lower(), unit.name)
+
+    def _define(self, name: str, plural: str, dimension: str, factor: float, offset: float,
+                symbols: Tuple[str, ...], aliases: Tuple[str, ...], prefixes: Tuple[str, ...]):
+        words = (name, plural) + aliases + tuple(alias + "s" for alias in aliases)
+        self._add(Unit(name, plural, dimension, factor, offset), words, symbols)
+        for prefix in prefixes:
+            prefix_symbol, scale = SI_PREFIXES.get(prefix) or BINARY_PREFIXES[prefix]
+            prefixed = Unit(prefix + name, prefix + plural, dimension, factor * scale, offset)
+            self._add(prefixed, (prefix + word for word in words), (prefix_symbol + s for s in symbols))
+
+    def _build_table(self) -> Dict[Tuple[str, str], Tuple[float, float]]:
+        """(from, to) -> (scale, offset) for every pair of units sharing a dimension."""
+        by_dimension: Dict[str, List[Unit]] = {}
+        for unit in self.units.values():
+            by_dimension.setdefault(unit.dimension, []).append(unit)
+
+        table = {}
+        for units in by_dimension.values():
+            for source in units:
+                for target in units:
+                    # base = x * f1 + o1; y = (base - o2) / f2
+                    table[source.name, target.name] = (
+                        source.factor / target.factor,
+                        (source.offset - target.offset) / target.factor,
+                    )
+        return table
+
+    def resolve(self, text: str) -> Optional[Unit]:
+        """Unit for a name, plural, symbol or alias ("km", "Miles", "degrees celsius")."""
+        text = " ".join(text.strip().split()).rstrip(".")
+        for candidate in (text, text.lower(), re.sub(r"^degrees? ", "", text.lower())):
+            if candidate in self.aliases:
+                return self.units[self.aliases[candidate]]
+        return None
+
+    def _pair(self, from_unit: str, to_unit: str) -> Tuple[Unit, Unit, Tuple[float, float]]:
+        source = self.resolve(from_unit)
+        if source is None:
+            raise ValueError(f"Unknown unit '{from_unit}'")
+        target = self.resolve(to_unit)
+        if target is None:
+            raise ValueError(f"Unknown unit '{to_unit}'")
+        if source.dimension != target.dimension:
+            raise ValueError(f"Cannot convert {source.dimension} ({source.plural}) to "
+                             f"{target.dimension} ({target.plural})")
+        return source, target, self.table[source.name, target.name]
+
+    def convert(self, value: float, from_unit: str, to_unit: str) -> float:
+        """
+        Convert one value.
+
+        Raises:
+            ValueError: Unknown unit or mismatched dimensions
+        """
+        _, _, (scale, offset) = self._pair(from_unit, to_unit)
+        return value * scale + offset
+
+    def convert_array(self, values: Any, from_unit: str, to_unit: str) -> Any:
+        """Convert a NumPy array (or anything array-like) in one vectorized pass."""
+        import numpy as np
+
+        _, _, (scale, offset) = self._pair(from_unit, to_unit)
+        result = np.asarray(values, dtype=float) * scale
+        if offset:
+            result += offset
+        return result
+
+    def parse(self, text: str) -> Optional[Tuple[float, Unit, Unit]]:
+        """
+        Parse a spoken conversion.
+
+        Handles "convert 5 km to miles", "five and a half miles in km" and
+        "how many feet in a mile".
+
+        Returns:
+            (value, from unit, to unit) or None if the text is not a conversion
+        """
+        text = " ".join(text.lower().strip().rstrip("?").split())
+        how_many = HOW_MANY.match(text)
+        if how_many:
+            quantity, to_text = how_many.group("quantity"), how_many.group("to")
+        else:
+            text = FILLER.sub("", text)
+            separators = list(SEPARATOR.finditer(text))
+            if not separators:
+                return None
+            # Split at the last separator, so "in" can still be a unit on the left ("5 in to cm")
+            last = separators[-1]
+            quantity, to_text = text[:last.start()], text[last.end():]
+
+        match = QUANTITY.match(replace_number_words(quantity).strip())
+        if not match:
+            return None
+        unit_text = re.sub(r"^(?:a|an|one) ", "", match.group("unit"))
+        source = self.resolve(unit_text)
+        target = self.resolve(to_text)
+        if source is None or target is None:
+            return None
+        value = float(match.group("value")) if match.group("value") else 1.0
+        return value, source, target
+
+
+def format_quantity(value: float, unit: Unit) -> str:
+    """Render a value with its unit the way it should be spoken."""
+    if abs(value) >= 1 or value == 0:
+        number = f"{value:,.2f}".rstrip("0").rstrip(".")
+    else:
+        number = f"{value:.3g}"
+    return f"{number} {unit.name if number == '1' else unit.plural}"
+
+
+_registry: Optional[UnitRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> UnitRegistry:
+    """Get the process-wide unit registry, building its table on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = UnitRegistry()
+        return _registry
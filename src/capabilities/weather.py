@@ -1,15 +1,123 @@
 """Weather information capabilities."""
-import requests
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from capabilities.weather_prefetch import WeatherPrefetcher
+from utils.http_cache import get_session
+from utils.journal_store import JournalStore
+from utils.ttl_cache import TTLCache
+
 
 class WeatherService:
     """Get weather information using wttr.in (no API key needed)."""
     
-    def __init__(self):
-        """Initialize weather service."""
+    def __init__(self, cache_ttl: float = 600, stale_ttl: float = 3600, timeout: float = 10,
+                 history_path: Optional[str] = None, fetch_workers: int = 2, cache_entries: int = 256):
+        """
+        Initialize weather service.
+        
+        Args:
+            cache_ttl: Seconds a fetched report is served without refetching
+            stale_ttl: Further seconds an old report is served while it refreshes
+            timeout: HTTP timeout in seconds
+            history_path: Base path for per-location query counts; memory-only if None
+            fetch_workers: Threads for background refreshes and prefetches
+            cache_entries: Locations kept in the cache
+        """
         self.base_url = "https://wttr.in"
+        self.timeout = timeout
+        # One wttr.in payload per location serves both current conditions and the forecast
+        self.cache = TTLCache(ttl=cache_ttl, stale_ttl=stale_ttl, refresh_workers=fetch_workers,
+                              max_entries=cache_entries, name="weather-cache")
+        self.history = JournalStore(history_path) if history_path else None
+        self.query_counts: Counter = Counter(
+            {location: record["count"] for location, record in self.history.all().items()}
+            if self.history else {}
+        )
+        self._counts_lock = threading.Lock()  # get_report runs on caller and prefetch threads
+        self.prefetcher: Optional[WeatherPrefetcher] = None
+    
+    @staticmethod
+    def _key(location: Optional[str]) -> str:
+        return " ".join((location or "").lower().split())
+    
+    def _fetch(self, location: str) -> Dict[str, Any]:
+        """Fetch and parse the wttr.in JSON report for a location ("" = auto-detect)."""
+        response = get_session().get(f"{self.base_url}/{location}?format=j1", timeout=self.timeout)
+        if response.status_code != 200:
+            raise ConnectionError(f"wttr.in returned HTTP {response.status_code}")
+        return response.json()
+    
+    def get_report(self, location: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parsed wttr.in report, from cache when fresh enough.
+        
+        Concurrent callers for the same location share one request.
+        """
+        key = self._key(location)
+        self._count_query(key)
+        return self.cache.get(key, lambda: self._fetch(key))
+    
+    def _count_query(self, key: str):
+        with self._counts_lock:
+            self.query_counts[key] += 1
+            if self.history:
+                self.history.put(key, {"count": self.query_counts[key], "last": time.time()})
+    
+    def top_locations(self, n: int = 3) -> List[str]:
+        """Locations asked about most often ("" = auto-detected location)."""
+        with self._counts_lock:
+            return [location for location, _ in self.query_counts.most_common(n)]
+    
+    def prefetch(self, location: Optional[str] = None):
+        """Refresh a location's report in the background (not counted as a query)."""
+        key = self._key(location)
+        return self.cache.refresh(key, lambda: self._fetch(key))
+    
+    def start_prefetch(self, scheduler, locations: Optional[List[str]] = None, interval: float = 540,
+                       top_n: int = 3, active_hours: Optional[List[int]] = None) -> WeatherPrefetcher:
+        """
+        Keep configured and frequently asked locations warm in the cache.
+        
+        Args:
+            scheduler: Scheduler to run on
+            locations: Locations always prefetched
+            interval: Seconds between runs; keep below the cache TTL
+            top_n: Most queried locations to add
+            active_hours: Local hours in which to prefetch (default: all)
+        """
+        if self.prefetcher is None:
+            self.prefetcher = WeatherPrefetcher(
+                self, locations or (), top_n=top_n, interval=interval,
+                max_concurrent=self.cache.refresh_workers, active_hours=active_hours
+            )
+            self.prefetcher.start(scheduler)
+        return self.prefetcher
+    
+    def cache_report(self) -> Dict[str, Any]:
+        """Cache and prefetch stats for the health status."""
+        stats = self.cache.counters()
+        report = {
+            "cache_hit_rate": f"{self.cache.hit_ratio() * 100:.1f}%",
+            "cached_locations": len(self.cache),
+            "coalesced": stats["coalesced"],
+            "fetch_errors": stats["errors"],
+            "evictions": stats["evictions"],
+        }
+        if self.prefetcher:
+            report["prefetch"] = self.prefetcher.report()
+        return report
+    
+    def close(self):
+        """Stop prefetching and flush the query history."""
+        if self.prefetcher:
+            self.prefetcher.stop()
+        self.cache.close()
+        if self.history:
+            self.history.close()
     
     def get_weather(self, location: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -22,55 +130,43 @@ class WeatherService:
             Result dictionary with weather data
         """
         try:
-            # Use wttr.in - simple weather API that doesn't need API key
-            location_param = location if location else ""
-            url = f"{self.base_url}/{location_param}?format=j1"
+            data = self.get_report(location)
             
-            response = requests.get(url, timeout=10)
+            # Extract current conditions
+            current = data['current_condition'][0]
+            location_info = data['nearest_area'][0]
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Extract current conditions
-                current = data['current_condition'][0]
-                location_info = data['nearest_area'][0]
-                
-                temp_c = current['temp_C']
-                temp_f = current['temp_F']
-                condition = current['weatherDesc'][0]['value']
-                feels_like_c = current['FeelsLikeC']
-                feels_like_f = current['FeelsLikeF']
-                humidity = current['humidity']
-                wind_speed = current['windspeedKmph']
-                
-                location_name = location_info['areaName'][0]['value']
-                country = location_info['country'][0]['value']
-                
-                weather_text = (
-                    f"Weather in {location_name}, {country}: "
-                    f"{condition}, {temp_f}°F ({temp_c}°C). "
-                    f"Feels like {feels_like_f}°F. "
-                    f"Humidity {humidity}%, Wind {wind_speed} km/h."
-                )
-                
-                return {
-                    "success": True,
-                    "message": weather_text,
-                    "data": {
-                        "location": f"{location_name}, {country}",
-                        "temperature_f": temp_f,
-                        "temperature_c": temp_c,
-                        "condition": condition,
-                        "feels_like_f": feels_like_f,
-                        "humidity": humidity,
-                        "wind_speed": wind_speed
-                    }
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": "Could not retrieve weather information"
+            temp_c = current['temp_C']
+            temp_f = current['temp_F']
+            condition = current['weatherDesc'][0]['value']
+            feels_like_c = current['FeelsLikeC']
+            feels_like_f = current['FeelsLikeF']
+            humidity = current['humidity']
+            wind_speed = current['windspeedKmph']
+            
+            location_name = location_info['areaName'][0]['value']
+            country = location_info['country'][0]['value']
+            
+            weather_text = (
+                f"Weather in {location_name}, {country}: "
+                f"{condition}, {temp_f}°F ({temp_c}°C). "
+                f"Feels like {feels_like_f}°F. "
+                f"Humidity {humidity}%, Wind {wind_speed} km/h."
+            )
+            
+            return {
+                "success": True,
+                "message": weather_text,
+                "data": {
+                    "location": f"{location_name}, {country}",
+                    "temperature_f": temp_f,
+                    "temperature_c": temp_c,
+                    "condition": condition,
+                    "feels_like_f": feels_like_f,
+                    "humidity": humidity,
+                    "wind_speed": wind_speed
                 }
+            }
                 
         except Exception as e:
             return {
@@ -90,34 +186,23 @@ class WeatherService:
             Result dictionary with forecast data
         """
         try:
-            location_param = location if location else ""
-            url = f"{self.base_url}/{location_param}?format=j1"
+            data = self.get_report(location)
+            weather_data = data['weather'][:days]
             
-            response = requests.get(url, timeout=10)
+            forecast_text = f"Forecast for {location if location else 'your location'}:\n"
             
-            if response.status_code == 200:
-                data = response.json()
-                weather_data = data['weather'][:days]
-                
-                forecast_text = f"Forecast for {location if location else 'your location'}:\n"
+            for day_data in weather_data:
+                date = day_data['date']
+                max_temp_f = day_data['maxtempF']
+                min_temp_f = day_data['mintempF']
+                condition = day_data['hourly'][0]['weatherDesc'][0]['value']
                 
-                for day_data in weather_data:
-                    date = day_data['date']
-                    max_temp_f = day_data['maxtempF']
-                    min_temp_f = day_data['mintempF']
-                    condition = day_data['hourly'][0]['weatherDesc'][0]['value']
-                    
-                    forecast_text += f"{date}: {condition}, High {max_temp_f}°F, Low {min_temp_f}°F. "
-                
-                return {
-                    "success": True,
-                    "message": forecast_text
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": "Could not retrieve forecast"
-                }
+                forecast_text += f"{date}: {condition}, High {max_temp_f}°F, Low {min_temp_f}°F. "
+            
+            return {
+                "success": True,
+                "message": forecast_text
+            }
                 
         except Exception as e:
             return {
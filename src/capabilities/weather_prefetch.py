@@ -0,0 +1,137 @@
+"""
+Scheduled refresh of the weather cache for the user's usual locations.
+
+Weather questions cluster at predictable times, so the locations the user
+configured, plus the ones asked about most often, are refreshed on a fixed
+interval shorter than the cache TTL. Spoken answers for those locations are
+then served from memory. A run can be limited to active hours, and at most
+max_concurrent fetches are in flight at once. A run only queues its
+locations; each finished fetch starts the next one, so the scheduler
+callback never waits on the network.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class WeatherPrefetcher:
+    """Keeps the weather cache warm for configured and frequently asked locations."""
+
+    def __init__(self, service, locations: Iterable[str] = (), top_n: int = 3, interval: float = 540.0,
+                 max_concurrent: int = 2, active_hours: Optional[Iterable[int]] = None):
+        """
+        Args:
+            service: Anything with prefetch(location) -> Future and top_locations(n)
+            locations: Locations always prefetched ("" = auto-detected location)
+            top_n: Most queried locations added to the configured ones
+            interval: Seconds between runs; keep below the cache TTL
+            max_concurrent: Fetches allowed in flight at once
+            active_hours: Local hours (0-23) in which runs happen; every hour if None
+        """
+        self.logger = logging.getLogger('jarvis.weather_prefetch')
+        self.service = service
+        self.locations = [" ".join(location.lower().split()) for location in locations]
+        self.top_n = top_n
+        self.interval = interval
+        self.max_concurrent = max(1, max_concurrent)
+        self.active_hours = set(active_hours) if active_hours else None
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._queue: deque = deque()
+        self._stats_lock = threading.Lock()
+        self._stopped = False
+        self.stats = {"runs": 0, "skipped_runs": 0, "prefetched": 0, "failed": 0,
+                      "in_flight": 0, "peak_concurrency": 0, "last_run": None}
+
+    def targets(self) -> List[str]:
+        """Configured locations first, then the most queried ones, without duplicates."""
+        targets = list(dict.fromkeys(self.locations))
+        for location in self.service.top_locations(self.top_n):
+            if location not in targets:
+                targets.append(location)
+        return targets
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Queue a refresh of every target and start as many as there are free slots.
+
+        Returns without waiting; the rest start as earlier fetches finish.
+
+        Returns:
+            Number of fetches queued (0 outside active hours)
+        """
+        now = now or datetime.now()
+        if self.active_hours is not None and now.hour not in self.active_hours:
+            with self._stats_lock:
+                self.stats["skipped_runs"] += 1
+            return 0
+
+        queued = 0
+        with self._stats_lock:
+            for location in self.targets():
+                if location not in self._queue:  # Still waiting from the previous run
+                    self._queue.append(location)
+                    queued += 1
+            self.stats["runs"] += 1
+            self.stats["last_run"] = time.time()
+        self._start_next()
+        return queued
+
+    def _start_next(self):
+        """Start queued fetches while slots are free."""
+        while self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                if not self._queue or self._stopped:
+                    self._slots.release()
+                    return
+                location = self._queue.popleft()
+                self.stats["in_flight"] += 1
+                self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self.stats["in_flight"])
+            try:
+                future = self.service.prefetch(location)
+            except Exception as e:
+                self._done(location, e)
+                continue
+            future.add_done_callback(lambda f, location=location: self._done(location, f.exception()))
+
+    def _done(self, location: str, error: Optional[BaseException]):
+        with self._stats_lock:
+            self.stats["in_flight"] -= 1
+            if error is None:
+                self.stats["prefetched"] += 1
+            else:
+                self.stats["failed"] += 1
+        self._slots.release()
+        if error is not None:
+            self.logger.warning(f"Prefetching weather for {location or 'current location'} failed: {error}")
+        self._start_next()
+
+    def start(self, scheduler, delay: float = 10.0):
+        """Run on a scheduler every interval seconds, the first run after delay."""
+        def run():
+            if self._stopped:
+                return
+            try:
+                self.run_once()
+            except Exception as e:
+                self.logger.error(f"Weather prefetch failed: {e}")
+            finally:
+                if not self._stopped:
+                    scheduler.schedule(self.interval, run)
+        scheduler.schedule(delay, run)
+
+    def stop(self):
+        self._stopped = True
+        with self._stats_lock:
+            self._queue.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """Stats for the health status."""
+        with self._stats_lock:
+            report = dict(self.stats)
+            report["queued"] = len(self._queue)
+        report["max_concurrent"] = self.max_concurrent
+        report["targets"] = len(self.targets())
+        return report
@@ -3,29 +3,70 @@ Web automation capabilities - browse, search, fetch information.
 """
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any
 import webbrowser
 from urllib.parse import quote_plus
 
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from utils.downloader import Downloader, ProgressCallback
+from utils.fetch_race import fetch_all
+from utils.html_extract import extract_text
+from utils.http_cache import get_session
+from utils.lazy_import import lazy_import, is_available
+
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
+REQUESTS_AVAILABLE = is_available('requests') and is_available('bs4')
+if not REQUESTS_AVAILABLE:
     logging.warning("requests/bs4 not available - web fetching limited")
 
 
 class WebAutomation:
     """Web browsing and information fetching."""
     
-    def __init__(self):
+    def __init__(self, fetch_workers: int = 4, fetch_timeout: float = 10, fetch_deadline: float = 12,
+                 max_page_bytes: int = 2_000_000, max_page_chars: int = 5000,
+                 download_workers: int = 4, download_parallel_mb: float = 16):
+        """
+        Args:
+            fetch_workers: Pages fetched concurrently by search_and_fetch
+            fetch_timeout: Per-request timeout in seconds
+            fetch_deadline: Seconds search_and_fetch waits for result pages in total
+            max_page_bytes: Bytes of a page downloaded at most
+            max_page_chars: Characters of page text kept
+            download_workers: Parallel range requests per large download
+            download_parallel_mb: Downloads at least this large are split into ranges
+        """
         self.logger = logging.getLogger('jarvis.web_automation')
-        self.session = requests.Session() if REQUESTS_AVAILABLE else None
+        self._session = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.fetch_workers = fetch_workers
+        self.fetch_timeout = fetch_timeout
+        self.fetch_deadline = fetch_deadline
+        self.max_page_bytes = max_page_bytes
+        self.max_page_chars = max_page_chars
+        self.download_workers = download_workers
+        self.download_parallel_mb = download_parallel_mb
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
     
+    @property
+    def session(self):
+        """Shared pooled, caching HTTP session."""
+        if self._session is None and REQUESTS_AVAILABLE:
+            self._session = get_session()
+        return self._session
+    
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """Threads for concurrent page fetches, started on first use."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="web-fetch")
+        return self._pool
+
     def search_web(self, query: str, engine: str = "google") -> str:
         """Open web search in browser."""
         try:
@@ -61,38 +102,14 @@ class WebAutomation:
             self.logger.error(f"Failed to open website: {e}")
             return f"Failed to open website: {e}"
     
-    def fetch_webpage_content(self, url: str) -> Optional[str]:
-        """Fetch and extract text content from webpage."""
+    def fetch_webpage_content(self, url: str, timeout: Optional[float] = None,
+                              max_chars: Optional[int] = None) -> Optional[str]:
+        """Fetch and extract text content from webpage (at most max_chars, default max_page_chars)."""
         if not REQUESTS_AVAILABLE:
             return "Web fetching requires 'requests' and 'beautifulsoup4' packages"
         
         try:
-            # Add protocol if missing
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
-            
-            response = self.session.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text()
-            
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
-            
-            # Limit length
-            if len(text) > 5000:
-                text = text[:5000] + "..."
-            
+            text = self._fetch_text(url, timeout or self.fetch_timeout, max_chars=max_chars)
             self.logger.info(f"Fetched content from: {url}")
             return text
             
@@ -100,19 +117,70 @@ class WebAutomation:
             self.logger.error(f"Failed to fetch webpage: {e}")
             return None
     
-    def search_and_fetch(self, query: str, num_results: int = 3) -> Dict[str, Any]:
-        """Search and fetch top results (requires requests)."""
+    def _fetch_text(self, url: str, timeout: float, cancel: Optional[threading.Event] = None,
+                    max_chars: Optional[int] = None) -> str:
+        """
+        Stream a page and return its visible text (raises on failure).
+        
+        At most max_page_bytes are downloaded and max_page_chars of text kept;
+        the connection is dropped as soon as either budget is reached or
+        cancel is set.
+        """
+        # Add protocol if missing
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        
+        response = self.session.get(url, headers=self.headers, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            # Only trust a charset the server actually sent; otherwise sniff <meta>
+            content_type = response.headers.get('Content-Type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+            extracted = extract_text(
+                response.iter_content(chunk_size=16384),
+                max_bytes=self.max_page_bytes,
+                max_chars=max_chars or self.max_page_chars,
+                encoding=encoding,
+                cancel=cancel,
+            )
+        finally:
+            response.close()
+        return extracted.text
+    
+    def search_and_fetch(self, query: str, num_results: int = 3, deadline: Optional[float] = None,
+                         min_results: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Search and fetch the top result pages concurrently (requires requests).
+        
+        Pages are fetched in parallel on a bounded pool. The call returns when
+        every page is in, when min_results pages have succeeded, or when the
+        deadline passes, whichever comes first; unfinished fetches are
+        cancelled and their results left out.
+        
+        Args:
+            query: Search query
+            num_results: Result pages to fetch
+            deadline: Seconds to wait for pages (default: fetch_deadline)
+            min_results: Return as soon as this many pages succeeded (default: all)
+            
+        Returns:
+            {"query", "results": [{"title", "url", "snippet"}], "timing"}; per-URL
+            timings and outcomes are in timing["fetches"]
+        """
         if not REQUESTS_AVAILABLE:
             return {"error": "Requires 'requests' and 'beautifulsoup4' packages"}
         
+        start = time.perf_counter()
+        deadline = self.fetch_deadline if deadline is None else deadline
+        timing: Dict[str, Any] = {}
         try:
             # Use DuckDuckGo HTML search (no API key needed)
             search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
             
-            response = self.session.get(search_url, headers=self.headers, timeout=10)
+            response = self.session.get(search_url, headers=self.headers, timeout=self.fetch_timeout)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = bs4.BeautifulSoup(response.content, 'html.parser')
             
             results = []
             for result in soup.find_all('a', class_='result__a', limit=num_results):
@@ -123,17 +191,30 @@ class WebAutomation:
                     results.append({
                         'title': title,
                         'url': url,
-                        'snippet': self.fetch_webpage_content(url)
+                        'snippet': None
                     })
+            timing["search_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            
+            timing["fetches"] = self._fetch_concurrently(results, deadline, min_results or len(results))
+            timing["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
             
             return {
                 'query': query,
-                'results': results
+                'results': results,
+                'timing': timing
             }
             
         except Exception as e:
             self.logger.error(f"Search and fetch error: {e}")
-            return {"error": str(e)}
+            return {"error": str(e), "timing": timing}
+    
+    def _fetch_concurrently(self, results: list, deadline: float, min_results: int) -> list:
+        """Fill in each result's snippet in parallel; returns per-URL timings."""
+        snippets, trace = fetch_all(self.pool, self._fetch_text, [r["url"] for r in results],
+                                    deadline, min_results, self.fetch_timeout)
+        for result, snippet in zip(results, snippets):
+            result["snippet"] = snippet
+        return trace
     
     def get_weather_web(self, location: str) -> Optional[str]:
         """Fetch weather from web (fallback if API unavailable)."""
@@ -162,7 +243,7 @@ class WebAutomation:
             response = self.session.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = bs4.BeautifulSoup(response.content, 'html.parser')
             
             headlines = []
             for article in soup.find_all('article', limit=5):
@@ -176,20 +257,34 @@ class WebAutomation:
             self.logger.error(f"News fetch error: {e}")
             return []
     
-    def download_file(self, url: str, save_path: str) -> bool:
-        """Download file from URL."""
+    def download_file(self, url: str, save_path: str, sha256: Optional[str] = None,
+                      expected_size: Optional[int] = None, progress: Optional[ProgressCallback] = None) -> bool:
+        """
+        Download file from URL, streaming to disk.
+        
+        An interrupted download is resumed from save_path + ".part" on the
+        next call; large files are fetched as parallel byte ranges when the
+        server allows it. The file only appears at save_path once its length
+        (and sha256, if given) checks out.
+        
+        Args:
+            url: File to download
+            save_path: Destination path
+            sha256: Expected hex digest
+            expected_size: Expected length in bytes
+            progress: Called with (bytes done, total or None, bytes/second)
+        """
         if not REQUESTS_AVAILABLE:
             return False
         
         try:
-            response = self.session.get(url, headers=self.headers, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            self.logger.info(f"Downloaded file to: {save_path}")
+            downloader = Downloader(self.session, workers=self.download_workers,
+                                    parallel_threshold=int(self.download_parallel_mb * 1024 * 1024),
+                                    headers=self.headers)
+            result = downloader.download(url, save_path, expected_size=expected_size, sha256=sha256,
+                                         progress=progress)
+            self.logger.info(f"Downloaded file to: {result.path} "
+                             f"({result.size} bytes, {result.bytes_per_second / 1024:.0f} KiB/s)")
             return True
             
         except Exception as e:
@@ -1,9 +1,10 @@
 """Web search and browsing capabilities."""
 import webbrowser
-import requests
 from typing import Dict, Any, Optional
 from urllib.parse import quote_plus
 
+from utils.http_cache import get_session
+
 
 class WebSearcher:
     """Handle web searches and browser operations."""
@@ -94,7 +95,7 @@ class WebSearcher:
         try:
             # DuckDuckGo Instant Answer API
             api_url = f"https://api.duckduckgo.com/?q={quote_plus(query)}&format=json"
-            response = requests.get(api_url, timeout=5)
+            response = get_session().get(api_url, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,216 @@
+"""Local intent classification and deadline-aware hedging of LLM intent extraction."""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+
+# (intent, action, pattern, confidence, needs_permission)
+# Named groups in a pattern become intent parameters.
+INTENT_RULES: List[Tuple[str, str, str, float, bool]] = [
+    ("timer", "set_timer", r"\b(?:set (?:a )?timer|timer for|countdown)\b", 0.95, False),
+    ("timer", "list_timers", r"\b(?:list|active|show) (?:my )?timers?\b", 0.95, False),
+    ("timer", "set_reminder", r"\b(?:remind me|set a reminder)\b", 0.95, False),
+    ("timer", "cancel_timer", r"\b(?:cancel|stop) (?:the |my )?timers?\b", 0.95, False),
+    ("weather", "forecast", r"\bforecast\b(?: (?:for|in) (?P<location>[a-z .'-]+))?", 0.9, False),
+    ("weather", "get_weather", r"\b(?:weather|temperature outside)\b(?: (?:in|for|at) (?P<location>[a-z .'-]+))?", 0.9, False),
+    ("media_control", "next_track", r"\b(?:next|skip (?:this |the )?)(?:song|track)\b", 0.9, False),
+    ("media_control", "previous_track", r"\b(?:previous|last) (?:song|track)\b", 0.9, False),
+    ("media_control", "play_pause", r"\b(?:pause|resume|unpause)\b(?: (?:the )?(?:music|song|video))?", 0.85, False),
+    ("media_control", "volume_up", r"\b(?:volume up|louder|turn (?:it |the volume )?up)\b", 0.9, False),
+    ("media_control", "volume_down", r"\b(?:volume down|quieter|turn (?:it |the volume )?down)\b", 0.9, False),
+    ("media_control", "mute", r"\b(?:mute|unmute)\b", 0.9, False),
+    ("email", "unread_count", r"\b(?:unread|how many) (?:e-?mails?|messages?)\b", 0.9, False),
+    ("email", "check_email", r"\b(?:check|any|new) (?:my |new )?e-?mails?\b", 0.9, False),
+    ("email", "read_email", r"\bread (?:my |the )?(?:first |latest |second |third )?e-?mail\b", 0.9, False),
+    ("calculation", "convert",
+     r"\bconvert (?:\d|(?:a|an|one|two|three|four|five|six|seven|eight|nine|ten|twenty|hundred|thousand|half)\b)"
+     r"|\bhow many [a-z]+(?: [a-z]+)? (?:are (?:there )?)?in (?:a|an|one|\d)", 0.85, False),
+    # "5 km to miles" has no keyword and looks like "send one email to john": medium confidence only
+    ("calculation", "convert",
+     r"(?:\d|\b(?:one|two|three|four|five|six|seven|eight|nine|ten|twenty|hundred|thousand|half)\b)"
+     r"[a-z ]*?\s*[a-z°/]+ (?:to|in|into) [a-z°/]+(?: [a-z]+)?$", 0.7, False),
+    ("calculation", "calculate",
+     r"\b(?:calculate|compute)\b|\d+(?:\.\d+)?\s*(?:plus|minus|times|divided by|multiplied by|[-+*/x^])\s*\d", 0.9, False),
+    ("file_operation", "open_explorer", r"\b(?:file )?explorer\b", 0.85, False),
+    ("file_operation", "open_folder",
+     r"\b(?:open|show)(?: me)?(?: my| the)? (?P<location>downloads|documents|pictures|photos|desktop|music|videos)\b", 0.9, False),
+    ("system_control", "lock_screen", r"\block (?:the |my )?(?:screen|computer|pc)\b", 0.9, True),
+    ("system_control", "shutdown", r"\b(?:shut ?down|power off) (?:the |my )?(?:computer|pc)\b", 0.9, True),
+    ("system_control", "restart", r"\b(?:restart|reboot) (?:the |my )?(?:computer|pc)\b", 0.9, True),
+    ("system_control", "screenshot", r"\b(?:take a |take )?screen ?shot\b", 0.85, False),
+    ("web_browsing", "get_news", r"\b(?:news|headlines)\b(?: (?:about|on) (?P<topic>[a-z .'-]+))?", 0.85, False),
+    ("web_browsing", "search_web", r"\b(?:search (?:for|the web for)|google|look up) (?P<query>.+)", 0.85, False),
+    ("app_automation", "type_text", r"\b(?:type|write) (?P<text>.+?) in (?P<app>word|notepad|excel)\b", 0.85, False),
+    ("system_control", "open_app", r"^(?:please )?(?:open|launch|start) (?P<app>[a-z0-9 .+-]+)$", 0.7, False),
+]
+
+
+def _fallback_intent(action: str = "chat", **extra) -> Dict[str, Any]:
+    """Build the default general-conversation intent."""
+    result = {"intent": "general", "action": action, "parameters": {}, "needs_permission": False}
+    result.update(extra)
+    return result
+
+
+class KeywordIntentClassifier:
+    """Rule-based intent classifier that answers in microseconds without the LLM."""
+
+    def __init__(self, rules: Optional[List[Tuple[str, str, str, float, bool]]] = None,
+                 validators: Optional[Dict[str, Callable[[str], bool]]] = None):
+        """
+        Initialize the classifier.
+
+        Args:
+            rules: (intent, action, pattern, confidence, needs_permission) tuples
+            validators: action -> check of the command; a rule match whose check
+                fails is ignored (e.g. "convert" needs two known units)
+        """
+        self.validators = validators or {}
+        self.rules = [
+            (intent, action, re.compile(pattern, re.IGNORECASE), confidence, needs_permission)
+            for intent, action, pattern, confidence, needs_permission in (rules or INTENT_RULES)
+        ]
+
+    def classify(self, text: str) -> Dict[str, Any]:
+        """
+        Classify a command.
+
+        Args:
+            text: The user's command
+
+        Returns:
+            Intent dictionary with an extra "confidence" (0-1) and "source" key
+        """
+        text = text.lower().strip()
+        best = None
+        matched_intents = set()
+
+        for intent, action, pattern, confidence, needs_permission in self.rules:
+            match = pattern.search(text)
+            if not match:
+                continue
+            if action in self.validators and not self.validators[action](text):
+                continue
+            matched_intents.add(intent)
+            if best is None or confidence > best[3]:
+                params = {k: v.strip() for k, v in match.groupdict().items() if v}
+                best = (intent, action, params, confidence, needs_permission)
+
+        if best is None:
+            return _fallback_intent(confidence=0.0, source="local")
+
+        intent, action, params, confidence, needs_permission = best
+        # Several competing intents means the command is ambiguous
+        if len(matched_intents) > 1:
+            confidence *= 0.6
+
+        return {
+            "intent": intent,
+            "action": action,
+            "parameters": params,
+            "needs_permission": needs_permission,
+            "confidence": round(confidence, 3),
+            "source": "local",
+        }
+
+
+class HedgedIntentResolver:
+    """Race the local classifier against the LLM within a per-command latency budget."""
+
+    def __init__(self, llm, classifier: Optional[KeywordIntentClassifier] = None,
+                 budget_ms: int = 2500, hedge_ms: int = 600,
+                 accept_confidence: float = 0.85, hedge_confidence: float = 0.6):
+        """
+        Initialize the resolver.
+
+        Args:
+            llm: LocalLLM instance used for intent extraction
+            classifier: Local classifier (default: KeywordIntentClassifier)
+            budget_ms: Hard deadline for an intent answer
+            hedge_ms: How long a medium-confidence local answer waits for the LLM
+            accept_confidence: Local answers at or above this skip the LLM entirely
+            hedge_confidence: Local answers at or above this win once hedge_ms elapses
+        """
+        self.llm = llm
+        self.classifier = classifier or KeywordIntentClassifier()
+        self.budget = budget_ms / 1000.0
+        self.hedge_delay = min(hedge_ms, budget_ms) / 1000.0
+        self.accept_confidence = accept_confidence
+        self.hedge_confidence = hedge_confidence
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="intent")
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "local_wins": 0,
+            "llm_wins": 0,
+            "hedge_wins": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+        }
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def resolve(self, command: str) -> Dict[str, Any]:
+        """
+        Resolve the intent of a command.
+
+        Returns:
+            Intent dictionary with "source" and "latency_ms" keys. Commands that
+            exhaust the budget get "timed_out": True instead of a silent chat intent.
+        """
+        start = time.perf_counter()
+        self._count("requests")
+
+        local = self.classifier.classify(command)
+        if local["confidence"] >= self.accept_confidence:
+            self._count("local_wins")
+            return self._finish(local, start)
+
+        cancel_event = threading.Event()
+        future = self._executor.submit(
+            self.llm.extract_intent, command, timeout=self.budget, cancel_event=cancel_event
+        )
+
+        # Medium-confidence local answer: give the LLM a short head start only
+        if local["confidence"] >= self.hedge_confidence:
+            try:
+                result = future.result(timeout=self.hedge_delay)
+                if not result.get("timed_out"):
+                    self._count("llm_wins")
+                    return self._finish(dict(result, source="llm"), start)
+            except FutureTimeout:
+                pass
+            cancel_event.set()
+            future.cancel()
+            self._count("cancelled")
+            self._count("hedge_wins")
+            return self._finish(local, start)
+
+        remaining = max(self.budget - (time.perf_counter() - start), 0.0)
+        try:
+            result = future.result(timeout=remaining)
+        except FutureTimeout:
+            cancel_event.set()
+            future.cancel()
+            self._count("cancelled")
+            result = _fallback_intent("timeout", timed_out=True)
+
+        if result.get("timed_out"):
+            self._count("timeouts")
+            return self._finish(dict(result, source="timeout"), start)
+
+        self._count("llm_wins")
+        return self._finish(dict(result, source="llm"), start)
+
+    @staticmethod
+    def _finish(result: Dict[str, Any], start: float) -> Dict[str, Any]:
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    def shutdown(self):
+        """Stop the worker pool without waiting for in-flight LLM calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
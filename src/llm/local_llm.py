@@ -1,8 +1,14 @@
 """Local LLM integration using Ollama."""
-import requests
 import json
+import threading
+import time
 from typing import Optional, List, Dict, Any
 
+from utils.http_cache import get_session
+from utils.lazy_import import lazy_import
+
+requests = lazy_import('requests')
+
 
 class LocalLLM:
     """Interface to local Ollama LLM for intelligent conversations."""
@@ -22,6 +28,8 @@ class LocalLLM:
 You are helpful, concise, and proactive. You can control the computer, manage files, 
 search the web, and assist with various tasks. Keep responses brief and actionable.
 When the user asks you to perform an action, respond with clear intent."""
+        self.intent_stats = {"requests": 0, "timeouts": 0, "cancelled": 0, "errors": 0}
+        self._stats_lock = threading.Lock()  # extract_intent runs on resolver threads
         
     def chat(self, user_message: str, include_history: bool = True) -> str:
         """
@@ -47,7 +55,7 @@ When the user asks you to perform an action, respond with clear intent."""
                 messages.append({"role": "user", "content": user_message})
             
             # Call Ollama API
-            response = requests.post(
+            response = get_session().post(
                 f"{self.host}/api/chat",
                 json={
                     "model": self.model,
@@ -81,15 +89,60 @@ When the user asks you to perform an action, respond with clear intent."""
             print(f"LLM Error: {e}")
             return "I encountered an error processing that request."
     
-    def extract_intent(self, user_message: str) -> Dict[str, Any]:
+    def complete(self, prompt: str, max_tokens: int = 150, timeout: float = 30) -> Optional[str]:
+        """
+        One-off generation that leaves conversation history untouched.
+        
+        Used for background work such as summaries, which should neither see
+        nor pollute the chat context.
+        
+        Args:
+            prompt: Full prompt
+            max_tokens: Tokens generated at most
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Generated text, or None on failure
+        """
+        try:
+            response = get_session().post(
+                f"{self.host}/api/generate",
+                json={
+                    "model": self.model,
+                    "prompt": prompt,
+                    "system": self.system_prompt,
+                    "stream": False,
+                    "options": {
+                        "temperature": 0.3,
+                        "num_predict": max_tokens,
+                    }
+                },
+                timeout=timeout
+            )
+            if response.status_code != 200:
+                return None
+            return response.json().get("response", "").strip() or None
+        except Exception as e:
+            print(f"LLM completion error: {e}")
+            return None
+    
+    def extract_intent(self, user_message: str, timeout: float,
+                       cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
         """
         Extract intent and entities from user message.
         
+        The response is streamed so the request can be abandoned as soon as the
+        deadline passes or the caller sets cancel_event; closing the connection
+        also stops generation on the Ollama side.
+        
         Args:
             user_message: The user's message
+            timeout: Deadline in seconds; the resolver passes its latency budget
+            cancel_event: Set by the caller when the answer is no longer needed
             
         Returns:
-            Dictionary with intent, action, and parameters
+            Dictionary with intent, action, and parameters. Timeouts and
+            cancellations carry "timed_out" / "cancelled" flags.
         """
         prompt = f"""Analyze this command and extract the intent: "{user_message}"
 
@@ -125,32 +178,61 @@ Examples:
 {{"intent": "web_browsing", "action": "search_web", "parameters": {{"query": "AI news", "engine": "google"}}, "needs_permission": false}}
 {{"intent": "app_automation", "action": "type_text", "parameters": {{"app": "word", "text": "Meeting notes"}}, "needs_permission": false}}"""
         
+        deadline = time.monotonic() + timeout
+        fallback = {"intent": "general", "action": "chat", "parameters": {}, "needs_permission": False}
+        self._count("requests")
+        
         try:
-            response = requests.post(
+            response = get_session().post(
                 f"{self.host}/api/generate",
                 json={
                     "model": self.model,
                     "prompt": prompt,
-                    "stream": False,
+                    "stream": True,
                     "format": "json",
                     "options": {
                         "temperature": 0.1,  # Very low for speed
                         "num_predict": 50,  # Short response
                     }
                 },
-                timeout=5  # Fast timeout for intent
+                stream=True,
+                timeout=timeout
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                response_text = result.get("response", "{}")
-                return json.loads(response_text)
-            else:
-                return {"intent": "general", "action": "chat", "parameters": {}, "needs_permission": False}
+            if response.status_code != 200:
+                response.close()
+                self._count("errors")
+                return fallback
+            
+            parts = []
+            with response:
+                for line in response.iter_lines():
+                    if cancel_event is not None and cancel_event.is_set():
+                        self._count("cancelled")
+                        return dict(fallback, action="cancelled", cancelled=True)
+                    if time.monotonic() > deadline:
+                        self._count("timeouts")
+                        return dict(fallback, action="timeout", timed_out=True)
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        break
+            
+            return json.loads("".join(parts) or "{}")
                 
+        except requests.exceptions.Timeout:
+            self._count("timeouts")
+            return dict(fallback, action="timeout", timed_out=True)
         except Exception as e:
             print(f"Intent extraction error: {e}")
-            return {"intent": "general", "action": "chat", "parameters": {}, "needs_permission": False}
+            self._count("errors")
+            return fallback
+    
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.intent_stats[name] += 1
     
     def clear_history(self):
         """Clear conversation history."""
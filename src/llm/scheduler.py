@@ -0,0 +1,98 @@
+"""
+Bounded scheduling of background LLM requests.
+
+The local model serves only a few generations at a time; firing every
+request at once just queues them inside Ollama where they cannot be
+cancelled. Work such as summarizing page sections goes through one small
+shared pool instead, so at most max_concurrent generations are in flight
+and the rest wait here, where queued requests can still be dropped.
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class LLMScheduler:
+    """Runs LLM calls on a bounded pool and tracks their concurrency."""
+
+    def __init__(self, max_concurrent: int = 2):
+        """
+        Args:
+            max_concurrent: Generations in flight at once; match OLLAMA_NUM_PARALLEL
+        """
+        self.logger = logging.getLogger('jarvis.llm_scheduler')
+        self.max_concurrent = max(1, max_concurrent)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0,
+                      "in_flight": 0, "peak_concurrency": 0}
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Queue fn(*args, **kwargs); returns its Future."""
+        with self._lock:
+            self.stats["submitted"] += 1
+        return self._pool.submit(self._run, fn, args, kwargs)
+
+    def _run(self, fn: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            self.stats["in_flight"] += 1
+            self.stats["peak_concurrency"] = max(self.stats["peak_concurrency"], self.stats["in_flight"])
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self.stats["in_flight"] -= 1
+        with self._lock:
+            self.stats["completed"] += 1
+        return result
+
+    def map(self, fn: Callable, items: Iterable[Any], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Run fn over items concurrently and return results in order.
+
+        Items that fail, or are not done within timeout seconds, yield None;
+        unfinished ones still queued are dropped.
+        """
+        futures = [self.submit(fn, item) for item in items]
+        done, not_done = wait(futures, timeout=timeout)
+        for future in not_done:
+            if future.cancel():
+                with self._lock:
+                    self.stats["dropped"] += 1
+        results = []
+        for future in futures:
+            if future in done and future.exception() is None:
+                results.append(future.result())
+            else:
+                if future in done:
+                    self.logger.warning(f"LLM request failed: {future.exception()}")
+                results.append(None)
+        return results
+
+    def report(self) -> Dict[str, Any]:
+        """Stats for the health status."""
+        with self._lock:
+            report = dict(self.stats)
+        report["max_concurrent"] = self.max_concurrent
+        return report
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler(max_concurrent: int = 2) -> LLMScheduler:
+    """Get the process-wide LLM scheduler; max_concurrent applies on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler(max_concurrent)
+        return _scheduler
@@ -0,0 +1,197 @@
+"""
+Cached map-reduce summaries of fetched pages.
+
+Long pages are split into chunks at paragraph boundaries, every chunk is
+summarized concurrently on the LLM scheduler (map), and the chunk summaries
+are combined into one answer (reduce), so nothing past the first couple of
+thousand characters is silently dropped. Summaries are cached per URL
+together with a hash of the text they were made from. Within the TTL a
+repeat request is answered without fetching; after it the page is fetched
+again through the shared HTTP cache, which revalidates its stored copy with
+ETag/Last-Modified when the server sent them, and the old summary is reused
+if the text hash is unchanged.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .scheduler import LLMScheduler
+
+MAP_PROMPT = "Summarize this part of a web page in two sentences:\n\n{text}"
+REDUCE_PROMPT = "Combine these notes on one web page into a brief summary:\n\n{text}"
+SINGLE_PROMPT = "Summarize this content briefly:\n\n{text}"
+
+
+def content_hash(text: str) -> str:
+    """Hash of page text, insensitive to whitespace changes."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+def split_chunks(text: str, chunk_chars: int) -> List[str]:
+    """Split text into pieces of at most chunk_chars, preferring line breaks."""
+    chunks: List[str] = []
+    current = ""
+    for line in text.splitlines():
+        while len(line) > chunk_chars:
+            cut = line.rfind(" ", 0, chunk_chars)
+            cut = cut if cut > 0 else chunk_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:cut])
+            line = line[cut:].lstrip()
+        if current and len(current) + len(line) + 1 > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+class PageSummarizer:
+    """Summarizes page text with map-reduce and caches the result per URL."""
+
+    def __init__(self, complete: Callable[[str], Optional[str]], scheduler: Optional[LLMScheduler] = None,
+                 store=None, ttl: float = 3600, chunk_chars: int = 3000, max_chunks: int = 8,
+                 max_entries: int = 200, map_timeout: float = 60, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            complete: Stateless prompt -> text call (None on failure)
+            scheduler: Pool the chunk summaries run on (sequential if None)
+            store: Optional persistent store with get/put/delete/all (e.g. JournalStore)
+            ttl: Seconds a summary is served without looking at the page again
+            chunk_chars: Characters of text per map prompt
+            max_chunks: Chunks summarized per page; longer text is cut and reported
+            max_entries: Cached summaries kept
+            map_timeout: Seconds to wait for all chunk summaries
+            clock: Time source (for tests)
+        """
+        self.logger = logging.getLogger('jarvis.summarizer')
+        self.complete = complete
+        self.scheduler = scheduler
+        self.store = store
+        self.ttl = ttl
+        self.chunk_chars = chunk_chars
+        self.max_chunks = max_chunks
+        self.max_entries = max_entries
+        self.map_timeout = map_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = dict(store.all()) if store is not None else {}
+        self.stats = {"hits": 0, "revalidated": 0, "summarized": 0, "chunks": 0, "failures": 0}
+
+    def summarize(self, text: str) -> Dict[str, Any]:
+        """
+        Summarize text, in chunks if it is long.
+
+        Returns:
+            {"summary": str or None, "chunks": int, "truncated": bool}
+        """
+        chunks = split_chunks(text, self.chunk_chars)
+        truncated = len(chunks) > self.max_chunks
+        if truncated:
+            self.logger.info(f"Summarizing the first {self.max_chunks} of {len(chunks)} chunks")
+            chunks = chunks[:self.max_chunks]
+        with self._lock:
+            self.stats["chunks"] += len(chunks)
+        if len(chunks) <= 1:
+            summary = self.complete(SINGLE_PROMPT.format(text=chunks[0])) if chunks else None
+            return {"summary": summary, "chunks": len(chunks), "truncated": truncated}
+
+        prompts = [MAP_PROMPT.format(text=chunk) for chunk in chunks]
+        if self.scheduler is not None:
+            notes = self.scheduler.map(self.complete, prompts, timeout=self.map_timeout)
+        else:
+            notes = [self.complete(prompt) for prompt in prompts]
+        notes = [note.strip() for note in notes if note]
+        if not notes:
+            return {"summary": None, "chunks": len(chunks), "truncated": truncated}
+
+        summary = self.complete(REDUCE_PROMPT.format(text="\n".join(f"- {note}" for note in notes)))
+        return {"summary": summary or " ".join(notes), "chunks": len(chunks), "truncated": truncated}
+
+    def summarize_page(self, url: str, fetch: Callable[[str], Optional[str]]) -> Dict[str, Any]:
+        """
+        Summary of the page at url, from cache when possible.
+
+        Args:
+            url: Page URL (the cache key)
+            fetch: url -> page text, or None on failure
+
+        Returns:
+            {"success", "summary", "source": "cache" | "revalidated" | "fresh" | "stale",
+             "chunks", "truncated"}; "message" on failure
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self.entries.get(url)
+        if entry and now - entry["checked_at"] < self.ttl:
+            with self._lock:
+                self.stats["hits"] += 1
+            return self._answer(entry, "cache")
+
+        text = fetch(url)
+        if not text:
+            if entry:
+                # Better an old summary than none when the page is unreachable
+                return self._answer(entry, "stale")
+            return {"success": False, "message": "Failed to fetch webpage content"}
+
+        digest = content_hash(text)
+        if entry and entry["hash"] == digest:
+            entry = dict(entry, checked_at=now)
+            self._remember(url, entry)
+            with self._lock:
+                self.stats["revalidated"] += 1
+            return self._answer(entry, "revalidated")
+
+        result = self.summarize(text)
+        if not result["summary"]:
+            with self._lock:
+                self.stats["failures"] += 1
+            return {"success": False, "message": "I couldn't summarize that page"}
+        entry = {"hash": digest, "summary": result["summary"].strip(), "checked_at": now,
+                 "chunks": result["chunks"], "truncated": result["truncated"]}
+        self._remember(url, entry)
+        with self._lock:
+            self.stats["summarized"] += 1
+        return self._answer(entry, "fresh")
+
+    @staticmethod
+    def _answer(entry: Dict[str, Any], source: str) -> Dict[str, Any]:
+        return {"success": True, "summary": entry["summary"], "source": source,
+                "chunks": entry.get("chunks", 1), "truncated": entry.get("truncated", False)}
+
+    def _remember(self, url: str, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries[url] = entry
+            evicted = []
+            if len(self.entries) > self.max_entries:
+                oldest = sorted(self.entries, key=lambda key: self.entries[key]["checked_at"])
+                evicted = oldest[:len(self.entries) - self.max_entries]
+                for key in evicted:
+                    del self.entries[key]
+        if self.store is not None:
+            self.store.put(url, entry)
+            for key in evicted:
+                self.store.delete(key)
+
+    def invalidate(self, url: str):
+        with self._lock:
+            self.entries.pop(url, None)
+        if self.store is not None:
+            self.store.delete(url)
+
+    def report(self) -> Dict[str, Any]:
+        """Stats for the health status."""
+        with self._lock:
+            report = dict(self.stats)
+            report["entries"] = len(self.entries)
+        return report
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
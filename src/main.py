@@ -1,10 +1,14 @@
 """Main entry point for the voice-controlled personal assistant."""
+import time
+PROCESS_START = time.perf_counter()
+
 import sys
 import signal
 import logging
 from pathlib import Path
 from assistant.core import Assistant
 from utils.config_manager import get_config
+from utils.http_cache import close_session
 from utils.logging_config import setup_production_logging, HealthMonitor
 
 # Version
@@ -53,6 +57,12 @@ def main():
             sys.exit(1)
         
         logger.info("Assistant initialized successfully")
+        
+        # Startup cost up to the first "listening" state
+        startup_ms = (time.perf_counter() - PROCESS_START) * 1000
+        logger.info(f"Time to listening: {startup_ms:.0f}ms")
+        logger.info("Capability startup report:\n" + assistant.capabilities.format_report())
+        print(f"Ready in {startup_ms / 1000:.2f}s")
         print("\nStarting always-on mode...")
         print("The assistant will now continuously listen for wake words.")
         print("Logs: logs/jarvis.log | Health: logs/health.json")
@@ -74,16 +84,37 @@ def main():
             if 'assistant' in locals():
                 assistant.running = False
                 assistant.speak("Goodbye!")
+                logger.info("Capability load report:\n" + assistant.capabilities.format_report())
+                if assistant.capabilities.is_loaded("timer_manager"):
+                    assistant.timer_manager.close()
+                if assistant.capabilities.is_loaded("weather_service"):
+                    assistant.weather_service.close()
+                if assistant.capabilities.is_loaded("email_manager"):
+                    assistant.email_manager.close()
+                if assistant.capabilities.is_loaded("news"):
+                    assistant.news.close()
+                if assistant._page_summarizer is not None:
+                    assistant._page_summarizer.close()
             
             # Save health report
             if 'health_monitor' in locals():
                 health_monitor.save_health_report()
                 status = health_monitor.get_health_status()
                 logger.info(f"Final health status: {status}")
+            close_session()
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
         sys.exit(0)
 
 
+def profile_startup():
+    """Print a per-module import time tree for a cold start (--profile-startup)."""
+    from utils.startup_profiler import run_profile
+    print(run_profile())
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+    else:
+        main()
\ No newline at end of file
@@ -57,8 +57,11 @@ class Config:
                 "host": "http://localhost:11434",
                 "temperature": 0.3,
                 "timeout": 10,
-                "intent_timeout": 5,
-                "max_tokens": 100
+                "intent_budget_ms": 2500,
+                "intent_hedge_ms": 600,
+                "local_intent_confidence": 0.85,
+                "max_tokens": 100,
+                "max_concurrent": 2
             },
             "audio": {
                 "sample_rate": 16000,
@@ -91,7 +94,72 @@ class Config:
                 "enable_cache": True,
                 "cache_size": 100,
                 "enable_fast_commands": True,
-                "enable_timing": False
+                "fast_commands": {},
+                "enable_timing": False,
+                "prewarm_capabilities": True,
+                "prewarm_delay": 2.0
+            },
+            "storage": {
+                "persist_timers": True,
+                "timers_path": "data/timers",
+                "weather_history_path": "data/weather_history",
+                "summary_cache_path": "data/page_summaries",
+                "mail_spool_path": "data/mail_spool"
+            },
+            "news": {
+                "topics": ["world"],
+                "feeds": {},
+                "cache_ttl": 900,
+                "stale_ttl": 3600,
+                "cache_entries": 64,
+                "fetch_workers": 4,
+                "deadline": 6,
+                "prefetch_enabled": True,
+                "prefetch_interval": 840
+            },
+            "mail": {
+                "preview_bytes": 2048,
+                "session_enabled": True,
+                "cache_size": 50,
+                "idle_timeout": 540,
+                "announce_new_mail": False,
+                "smtp_keepalive": 60,
+                "send_attempts": 6
+            },
+            "summary": {
+                "ttl": 3600,
+                "chunk_chars": 3000,
+                "max_chunks": 8,
+                "max_entries": 200,
+                "max_page_chars": 24000
+            },
+            "weather": {
+                "cache_ttl": 600,
+                "stale_ttl": 3600,
+                "cache_entries": 256,
+                "timeout": 10,
+                "prefetch_enabled": True,
+                "prefetch_locations": [],
+                "prefetch_top_locations": 3,
+                "prefetch_interval": 540,
+                "prefetch_concurrency": 2,
+                "prefetch_hours": None
+            },
+            "web": {
+                "fetch_workers": 4,
+                "fetch_timeout": 10,
+                "fetch_deadline": 12,
+                "max_page_bytes": 2000000,
+                "max_page_chars": 5000,
+                "download_workers": 4,
+                "download_parallel_mb": 16
+            },
+            "http_cache": {
+                "enabled": True,
+                "path": "data/http_cache.db",
+                "max_mb": 50,
+                "memory_entries": 128,
+                "pool_maxsize": 16
             },
             "security": {
                 "require_auth_for_system": True,
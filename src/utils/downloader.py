@@ -0,0 +1,283 @@
+"""
+Streaming, resumable downloads with optional parallel byte ranges.
+
+The body is written to "<dest>.part" in fixed-size chunks as it arrives, so
+memory use does not depend on file size. Progress per byte range is
+recorded in "<dest>.part.json"; after an interruption the download
+continues from there with HTTP Range requests, provided the server still
+reports the same validator (ETag / Last-Modified) and length. Large files
+from servers that accept ranges are split into segments fetched
+concurrently into their offsets of a preallocated file. The result is
+checked against the expected length (and SHA-256 if given) before it is
+renamed into place. Requests ask for the identity encoding and bodies are
+read undecoded, so lengths and range offsets always count the bytes the
+server's Content-Length refers to.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# progress(bytes_done, total_bytes or None, bytes_per_second)
+ProgressCallback = Callable[[int, Optional[int], float], None]
+
+
+class DownloadError(Exception):
+    """A download failed or did not verify."""
+
+
+class DownloadResult(NamedTuple):
+    path: str
+    size: int
+    seconds: float
+    bytes_per_second: float
+    resumed_from: int
+    segments: int
+    sha256: Optional[str]
+
+
+class Downloader:
+    """Chunked downloader with resume, parallel ranges and verification."""
+
+    def __init__(self, session=None, chunk_size: int = 256 * 1024, workers: int = 4,
+                 parallel_threshold: int = 16 * 1024 * 1024, timeout: float = 30,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            session: requests-style session (default: the shared one from utils.http_cache)
+            chunk_size: Bytes read and written at a time
+            workers: Concurrent range requests for large files
+            parallel_threshold: Files at least this large are fetched in ranges
+            timeout: Per-request connect/read timeout in seconds
+            headers: Extra request headers
+        """
+        if session is None:
+            from .http_cache import get_session
+            session = get_session()
+        self.logger = logging.getLogger('jarvis.downloader')
+        self.session = session
+        self.chunk_size = chunk_size
+        self.workers = max(1, workers)
+        self.parallel_threshold = parallel_threshold
+        self.timeout = timeout
+        # Content-Length and Range count encoded bytes, so a gzip-decoded body would
+        # not match; no-store keeps large files out of the shared response cache
+        self.headers = {"Accept-Encoding": "identity", "Cache-Control": "no-store", **(headers or {})}
+
+    def probe(self, url: str) -> Dict[str, Any]:
+        """
+        Learn a resource's size, range support and validator without downloading it.
+
+        Returns:
+            {"size": int or None, "ranges": bool, "validator": str or None}
+        """
+        headers = {}
+        try:
+            response = self.session.request("HEAD", url, headers=self.headers, timeout=self.timeout,
+                                            allow_redirects=True)
+            response.close()
+            # Some servers refuse HEAD; the GET that follows reports real errors
+            if response.status_code < 400:
+                headers = response.headers
+        except Exception as e:
+            self.logger.debug(f"HEAD {url} failed: {e}")
+        size = headers.get("Content-Length")
+        return {
+            "size": int(size) if size and size.isdigit() else None,
+            "ranges": headers.get("Accept-Ranges", "").lower() == "bytes",
+            "validator": headers.get("ETag") or headers.get("Last-Modified"),
+        }
+
+    def download(self, url: str, dest: str, expected_size: Optional[int] = None, sha256: Optional[str] = None,
+                 progress: Optional[ProgressCallback] = None) -> DownloadResult:
+        """
+        Download url to dest, resuming a previous partial download if possible.
+
+        Args:
+            url: Resource to download
+            dest: Final file path
+            expected_size: Length to verify against (default: server's Content-Length)
+            sha256: Hex digest to verify against
+            progress: Called after each chunk with (done, total, bytes/second)
+
+        Raises:
+            DownloadError: On HTTP errors or failed verification; the partial
+                file is kept so the next attempt can resume
+        """
+        part_path = dest + ".part"
+        state_path = dest + ".part.json"
+        info = self.probe(url)
+        total = info["size"]
+        if expected_size is not None and total is not None and expected_size != total:
+            raise DownloadError(f"Server reports {total} bytes, expected {expected_size}")
+        total = total if total is not None else expected_size
+
+        state = self._load_state(state_path, url, total, info["validator"], part_path)
+        if state is None:
+            segments = 1
+            if info["ranges"] and total and total >= self.parallel_threshold:
+                segments = min(self.workers, max(1, total // self.parallel_threshold * 2))
+            state = {"url": url, "size": total, "validator": info["validator"],
+                     "ranges": self._split(total, segments) if info["ranges"] and total else [[0, None, 0]]}
+            with open(part_path, "wb") as f:
+                if total and len(state["ranges"]) > 1:
+                    f.truncate(total)  # Preallocate so each range writes at its own offset
+            self._save_state(state_path, state)
+
+        resumed_from = sum(done for _, _, done in state["ranges"])
+        meter = _Meter(total, resumed_from, progress)
+        start = time.perf_counter()
+        lock = threading.Lock()
+
+        def fetch(index: int):
+            self._fetch_range(url, part_path, state, index, meter, lock, state_path, info["ranges"])
+
+        ranges = [i for i, (begin, end, done) in enumerate(state["ranges"])
+                  if end is None or begin + done <= end]
+        if len(ranges) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="download") as pool:
+                for future in [pool.submit(fetch, i) for i in ranges]:
+                    future.result()
+        elif ranges:
+            fetch(ranges[0])
+        self._save_state(state_path, state)
+
+        size = os.path.getsize(part_path)
+        expected = expected_size if expected_size is not None else total
+        if expected is not None and size != expected:
+            raise DownloadError(f"Downloaded {size} bytes, expected {expected}")
+        digest = None
+        if sha256:
+            digest = self.file_sha256(part_path)
+            if digest.lower() != sha256.lower():
+                # A corrupt partial file must not be resumed
+                os.remove(part_path)
+                os.remove(state_path)
+                raise DownloadError(f"SHA-256 mismatch: got {digest}")
+
+        os.replace(part_path, dest)
+        os.remove(state_path)
+        seconds = time.perf_counter() - start
+        result = DownloadResult(dest, size, seconds, (size - resumed_from) / seconds if seconds else 0.0,
+                                resumed_from, len(state["ranges"]), digest)
+        self.logger.debug(f"Downloaded {url} -> {dest}: {size} bytes in {seconds:.1f}s "
+                         f"({result.bytes_per_second / 1024:.0f} KiB/s, {result.segments} segment(s), "
+                         f"resumed from {resumed_from})")
+        return result
+
+    @staticmethod
+    def _split(total: int, segments: int) -> List[List[Optional[int]]]:
+        """[start, end inclusive, bytes done] per segment."""
+        step = -(-total // segments)
+        return [[begin, min(begin + step, total) - 1, 0] for begin in range(0, total, step)]
+
+    def _load_state(self, state_path: str, url: str, total: Optional[int], validator: Optional[str],
+                    part_path: str) -> Optional[Dict[str, Any]]:
+        """Saved progress, if it belongs to the same unchanged resource."""
+        if not (os.path.exists(state_path) and os.path.exists(part_path)):
+            return None
+        try:
+            with open(state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get("url") != url or state.get("size") != total or not validator
+                or state.get("validator") != validator):
+            self.logger.info(f"Restarting {url}: the resource changed or cannot be validated")
+            return None
+        if len(state["ranges"]) == 1:
+            # Trust the file, not the last saved count, for a single stream
+            state["ranges"][0][2] = os.path.getsize(part_path)
+        return state
+
+    @staticmethod
+    def _save_state(state_path: str, state: Dict[str, Any]):
+        tmp = state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, state_path)
+
+    def _fetch_range(self, url: str, part_path: str, state: Dict[str, Any], index: int, meter: "_Meter",
+                     lock: threading.Lock, state_path: str, ranges_supported: bool):
+        segment = state["ranges"][index]
+        begin, end, done = segment
+        headers = dict(self.headers)
+        if done or len(state["ranges"]) > 1:
+            if not ranges_supported:
+                done = segment[2] = 0
+            else:
+                headers["Range"] = f"bytes={begin + done}-{'' if end is None else end}"
+
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        try:
+            if response.status_code >= 400:
+                raise DownloadError(f"HTTP {response.status_code} for {url}")
+            if "Range" in headers and response.status_code != 206:
+                if len(state["ranges"]) > 1:
+                    raise DownloadError("Server ignored the range request")
+                done = segment[2] = 0  # Server sent the whole body; start over
+
+            with open(part_path, "r+b" if len(state["ranges"]) > 1 or done else "wb") as f:
+                f.seek(begin + done)
+                if len(state["ranges"]) == 1:
+                    f.truncate()
+                last_saved = time.monotonic()
+                for chunk in self._body(response):
+                    if not chunk:
+                        continue
+                    if end is not None and begin + done + len(chunk) > end + 1:
+                        chunk = chunk[:end + 1 - begin - done]
+                    f.write(chunk)
+                    done += len(chunk)
+                    meter.add(len(chunk))
+                    with lock:
+                        segment[2] = done
+                        if time.monotonic() - last_saved > 1.0:
+                            f.flush()
+                            self._save_state(state_path, state)
+                            last_saved = time.monotonic()
+                    if end is not None and begin + done > end:
+                        break
+        finally:
+            response.close()
+            with lock:
+                segment[2] = done
+                self._save_state(state_path, state)
+
+    def _body(self, response):
+        """Body chunks as sent, even if the server applied a Content-Encoding anyway."""
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+        if encoding != "identity" and hasattr(getattr(response, "raw", None), "stream"):
+            return response.raw.stream(self.chunk_size, decode_content=False)
+        return response.iter_content(chunk_size=self.chunk_size)
+
+    def file_sha256(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+
+class _Meter:
+    """Thread-safe byte counter that reports progress and throughput."""
+
+    def __init__(self, total: Optional[int], done: int, callback: Optional[ProgressCallback]):
+        self.total = total
+        self.done = done
+        self.start_done = done
+        self.callback = callback
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        with self._lock:
+            self.done += count
+            done = self.done
+        if self.callback:
+            elapsed = time.perf_counter() - self.start
+            self.callback(done, self.total, (done - self.start_done) / elapsed if elapsed else 0.0)
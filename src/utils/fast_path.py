@@ -0,0 +1,192 @@
+"""
+Fast-path command matching without the LLM.
+
+FAST_COMMANDS phrases are compiled into an Aho-Corasick automaton over word
+tokens, so matching is one linear pass over the command regardless of how
+many phrases are configured, and a phrase only ever matches whole words
+("date" does not match "update", "time" does not match "sometimes").
+"""
+import re
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
+
+from .performance import FAST_COMMANDS, FILLER_WORDS, SLOT_MAX_TOKENS, SLOT_STOP_WORDS
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+SLOT_PATTERN = re.compile(r"^\{(\w+)\}$")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TokenAutomaton:
+    """Aho-Corasick automaton whose alphabet is word tokens instead of characters."""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self.lengths: List[int] = []
+        self._built = False
+
+    def add(self, tokens: List[str]) -> int:
+        """
+        Add a token sequence.
+
+        Returns:
+            Pattern id reported by search()
+        """
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][token] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        pattern_id = len(self.lengths)
+        self.lengths.append(len(tokens))
+        self.output[state].append(pattern_id)
+        self._built = False
+        return pattern_id
+
+    def build(self):
+        """Compute failure links breadth-first."""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                if self.fail[child] == child:
+                    self.fail[child] = 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self._built = True
+
+    def search(self, tokens: List[str]) -> List[Tuple[int, int, int]]:
+        """
+        Find every pattern occurrence in one pass.
+
+        Returns:
+            (start, end, pattern_id) tuples, end exclusive
+        """
+        if not self._built:
+            self.build()
+
+        matches = []
+        state = 0
+        for index, token in enumerate(tokens):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for pattern_id in self.output[state]:
+                matches.append((index + 1 - self.lengths[pattern_id], index + 1, pattern_id))
+        return matches
+
+
+class FastCommandEngine:
+    """Resolve short, unambiguous commands to a fast action with extracted slots."""
+
+    def __init__(self, commands: Optional[Dict[str, List[str]]] = None,
+                 overrides: Optional[Dict[str, List[str]]] = None,
+                 filler_words: Optional[set] = None):
+        """
+        Compile the phrase table.
+
+        Args:
+            commands: action -> phrases table (default: FAST_COMMANDS)
+            overrides: Extra action -> phrases merged on top, e.g. from config
+            filler_words: Words allowed around a phrase (default: FILLER_WORDS)
+        """
+        table: Dict[str, List[str]] = {
+            action: list(phrases) for action, phrases in (commands or FAST_COMMANDS).items()
+        }
+        for action, phrases in (overrides or {}).items():
+            table.setdefault(action, []).extend(phrases)
+
+        self.filler_words = FILLER_WORDS if filler_words is None else filler_words
+        self.automaton = TokenAutomaton()
+        self.patterns: List[Tuple[str, Optional[str]]] = []  # (action, slot name)
+
+        for action, phrases in table.items():
+            for phrase in phrases:
+                words = phrase.lower().split()
+                slot = None
+                if words and SLOT_PATTERN.match(words[-1]):
+                    slot = SLOT_PATTERN.match(words.pop()).group(1)
+                tokens = tokenize(" ".join(words))
+                if tokens:
+                    self.automaton.add(tokens)
+                    self.patterns.append((action, slot))
+        self.automaton.build()
+
+    @staticmethod
+    def _slot_end(tokens: List[str], start: int) -> int:
+        """End of a slot value starting at start: a few words, cut at the first time word."""
+        stop = min(len(tokens), start + SLOT_MAX_TOKENS)
+        for index in range(start, stop):
+            if tokens[index] in SLOT_STOP_WORDS:
+                return index
+        return stop
+
+    def match(self, command: str) -> Optional[Dict[str, Any]]:
+        """
+        Match a command against the fast-path table.
+
+        A command qualifies only if every non-filler word is covered by phrases
+        for a single action; anything else is left to intent extraction.
+
+        Returns:
+            {"action": str, "slots": dict, "phrase_tokens": int} or None
+        """
+        tokens = tokenize(command)
+        if not tokens:
+            return None
+
+        spans = []
+        for start, end, pattern_id in self.automaton.search(tokens):
+            action, slot = self.patterns[pattern_id]
+            spans.append((start, self._slot_end(tokens, end) if slot else end, end, action, slot))
+        if not spans:
+            return None
+
+        # Drop matches nested inside a longer match ("today" inside "weather today")
+        kept = [
+            span for span in spans
+            if not any(
+                other is not span and other[0] <= span[0] and span[1] <= other[1]
+                and (other[1] - other[0]) > (span[1] - span[0])
+                for other in spans
+            )
+        ]
+
+        actions = {span[3] for span in kept}
+        if len(actions) != 1:
+            return None
+
+        covered = set()
+        slots = {}
+        for start, stop, end, action, slot in kept:
+            covered.update(range(start, stop))
+            if slot and stop > end:
+                slots[slot] = " ".join(tokens[end:stop])
+
+        if any(i not in covered and token not in self.filler_words for i, token in enumerate(tokens)):
+            return None
+
+        return {
+            "action": actions.pop(),
+            "slots": slots,
+            "phrase_tokens": len(covered),
+        }
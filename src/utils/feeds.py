@@ -0,0 +1,167 @@
+"""
+RSS/Atom parsing and near-duplicate removal for headlines.
+
+Feeds are parsed incrementally with ElementTree's iterparse, and each item
+is cleared as soon as it has been read, so memory does not grow with the
+size of the feed. The same story syndicated by several outlets shows up
+with slightly different titles; titles are compared by the overlap of
+their hashed character shingles and only the first of a group of
+near-identical ones is kept.
+"""
+import io
+import re
+import zlib
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Callable, FrozenSet, Iterable, List, NamedTuple, Optional, Union
+from xml.etree import ElementTree
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+# Google News and many aggregators append " - Publisher" to titles
+SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{2,60}$")
+
+
+class Headline(NamedTuple):
+    title: str
+    link: str
+    source: Optional[str]
+    published: Optional[float]
+    topic: Optional[str] = None
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return parsedate_to_datetime(value).timestamp()  # RSS: RFC 822
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()  # Atom: RFC 3339
+    except ValueError:
+        return None
+
+
+def parse_feed(data: Union[bytes, Iterable[bytes]], topic: Optional[str] = None,
+               max_items: int = 50) -> List[Headline]:
+    """
+    Headlines from an RSS 2.0 or Atom document.
+
+    Args:
+        data: Feed body, whole or as byte chunks
+        topic: Stored on every headline
+        max_items: Items read at most; parsing stops there
+
+    Returns:
+        Headlines in feed order (items without a title are skipped)
+    """
+    source = io.BytesIO(data) if isinstance(data, bytes) else _ChunkReader(data)
+    headlines: List[Headline] = []
+    feed_title = None
+    try:
+        for _, element in ElementTree.iterparse(source, events=("end",)):
+            tag = _local(element.tag)
+            if tag == "title" and feed_title is None and not headlines:
+                # Channel/feed title, used when items carry no source of their own
+                feed_title = (element.text or "").strip() or None
+            if tag not in ("item", "entry"):
+                continue
+            fields = {}
+            link = None
+            for child in element:
+                name = _local(child.tag)
+                if name == "link":
+                    # Atom links are in href; prefer rel="alternate" (the default)
+                    href = child.get("href")
+                    if href and child.get("rel", "alternate") == "alternate":
+                        link = link or href
+                    elif child.text and child.text.strip():
+                        link = link or child.text.strip()
+                elif name not in fields:
+                    fields[name] = (child.text or "").strip()
+            element.clear()
+            title = fields.get("title")
+            if not title:
+                continue
+            headlines.append(Headline(
+                title=title,
+                link=link or fields.get("guid", ""),
+                source=fields.get("source") or feed_title,
+                published=_timestamp(fields.get("pubdate") or fields.get("published") or fields.get("updated")),
+                topic=topic,
+            ))
+            if len(headlines) >= max_items:
+                break
+    except ElementTree.ParseError:
+        if not headlines:
+            raise
+    return headlines
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like view of an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        count = min(len(target), len(self._buffer))
+        target[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase title without publisher suffix, punctuation or extra spaces."""
+    title = SOURCE_SUFFIX.sub("", title)
+    return " ".join(PUNCTUATION.sub(" ", title.lower()).split())
+
+
+def shingles(text: str, size: int = 5) -> FrozenSet[int]:
+    """Hashed overlapping character shingles of normalized text."""
+    text = normalize_title(text)
+    if len(text) <= size:
+        return frozenset({zlib.crc32(text.encode("utf-8"))})
+    return frozenset(zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1))
+
+
+def similarity(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def dedupe(items: Iterable, threshold: float = 0.6, key: Callable = lambda item: item.title) -> list:
+    """
+    Drop items whose key is near-identical to an earlier item's.
+
+    Args:
+        items: Items in order of preference
+        threshold: Shingle similarity at or above which two keys count as the same
+        key: Text compared for each item
+    """
+    kept = []
+    seen: List[FrozenSet[int]] = []
+    for item in items:
+        signature = shingles(key(item))
+        if any(similarity(signature, other) >= threshold for other in seen):
+            continue
+        seen.append(signature)
+        kept.append(item)
+    return kept
@@ -0,0 +1,82 @@
+"""
+Concurrent fetches under one deadline, stopping early once enough succeed.
+
+Every URL is submitted to a shared pool. The call returns when all are in,
+when min_results have succeeded, or when the deadline passes. The cancel
+event is then set so running fetches stop at their next chunk, queued ones
+are dropped, and each URL's trace entry records what actually happened.
+"""
+import threading
+import time
+from concurrent.futures import Executor, Future, TimeoutError as FutureTimeout, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# fetch(url, timeout, cancel) -> value; raises on failure
+Fetch = Callable[[str, float, threading.Event], Any]
+
+
+def fetch_all(pool: Executor, fetch: Fetch, urls: List[str], deadline: float, min_results: int,
+              max_timeout: float) -> Tuple[List[Optional[Any]], List[Dict[str, Any]]]:
+    """
+    Fetch urls concurrently until min_results succeeded or deadline seconds passed.
+
+    Args:
+        pool: Executor the fetches run on
+        fetch: Called with (url, timeout, cancel event)
+        urls: URLs in result order
+        deadline: Seconds to wait in total
+        min_results: Successes after which the rest are cancelled
+        max_timeout: Per-fetch timeout; never longer than the time left
+
+    Returns:
+        (values, trace): values[i] is fetch's result or None; trace[i] is
+        {"url", "status": ok|failed|cancelled|timeout, "ms"[, "error"]}
+    """
+    start = time.perf_counter()
+    end = start + deadline
+    cancel = threading.Event()
+
+    def run(url):
+        t0 = time.perf_counter()
+        try:
+            # Never wait past the overall deadline
+            timeout = max(0.5, min(max_timeout, end - time.perf_counter()))
+            return "ok", fetch(url, timeout, cancel), None, time.perf_counter() - t0
+        except Exception as e:
+            return "failed", None, str(e), time.perf_counter() - t0
+
+    futures: Dict[Future, int] = {pool.submit(run, url): i for i, url in enumerate(urls)}
+    values: List[Optional[Any]] = [None] * len(urls)
+    trace = [{"url": url, "status": "timeout", "ms": None} for url in urls]
+
+    def record(future: Future, i: int) -> bool:
+        status, value, error, elapsed = future.result()
+        values[i] = value
+        trace[i].update(status=status, ms=round(elapsed * 1000, 2))
+        if error:
+            trace[i]["error"] = error
+        return status == "ok"
+
+    succeeded = 0
+    try:
+        for future in as_completed(futures, timeout=max(0.0, end - time.perf_counter())):
+            if record(future, futures[future]):
+                succeeded += 1
+                if succeeded >= min_results:
+                    break
+    except FutureTimeout:
+        pass
+
+    # Stragglers: queued ones are dropped, running ones stop at their next chunk
+    cancel.set()
+    for future, i in futures.items():
+        if trace[i]["ms"] is not None:
+            continue
+        if future.cancel():
+            trace[i]["status"] = "cancelled"
+        elif future.done():
+            # Finished after the loop stopped looking; report what it really did
+            record(future, i)
+            continue
+        trace[i]["ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return values, trace
@@ -0,0 +1,196 @@
+"""
+Streaming, size-bounded extraction of readable text from HTML.
+
+The response body is decoded and fed to an incremental parser chunk by
+chunk, and no DOM is built: a small collector receives start tags, end tags
+and text, drops everything inside script, style and similar elements, and
+stops the download as soon as either the byte budget or the character
+budget is reached. lxml's event-driven parser is used when installed, the
+standard library's html.parser otherwise.
+"""
+import codecs
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Iterable, List, NamedTuple, Optional, Union
+
+from .lazy_import import is_available
+
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "iframe", "object"})
+BLOCK_TAGS = frozenset({
+    "p", "div", "br", "li", "ul", "ol", "tr", "table", "section", "article", "header", "footer",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "title", "nav", "aside", "main", "dd", "dt",
+})
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+LXML_AVAILABLE = is_available("lxml")
+
+
+class Extracted(NamedTuple):
+    text: str
+    bytes_read: int
+    truncated: bool
+    parser: str
+
+
+class BudgetReached(Exception):
+    """Raised inside a parser callback to stop parsing early."""
+
+
+class TextCollector:
+    """Parser target: keeps visible text, up to max_chars characters."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.chars = 0
+        self.skip_depth = 0
+        self.full = False
+
+    def start(self, tag: str, attrib=None):
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def end(self, tag: str):
+        tag = tag.lower()
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def data(self, text: str):
+        if not self.skip_depth:
+            self._append(WHITESPACE.sub(" ", text))
+
+    def _append(self, text: str):
+        if self.full or not text:
+            return
+        if text.strip():
+            self.chars += len(text)
+        self.parts.append(text)
+        if self.chars >= self.max_chars:
+            self.full = True
+            raise BudgetReached()
+
+    def close(self) -> str:
+        lines = (line.strip() for line in "".join(self.parts).splitlines())
+        text = "\n".join(line for line in lines if line)
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars]
+        return text
+
+
+class _StdlibParser(HTMLParser):
+    """html.parser front end for a TextCollector."""
+
+    def __init__(self, target: TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag.lower() not in SKIP_TAGS:
+            self.target.start(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def make_parser(target: TextCollector, prefer_lxml: bool = True):
+    """
+    Incremental parser feeding target, and its name.
+
+    Returns:
+        (parser with feed()/close(), "lxml" or "html.parser")
+    """
+    if prefer_lxml and LXML_AVAILABLE:
+        from lxml import etree
+
+        # With a target, lxml reports events and builds no tree
+        return etree.HTMLParser(target=target, recover=True, no_network=True), "lxml"
+    return _StdlibParser(target), "html.parser"
+
+
+def sniff_encoding(head: bytes, default: str = "utf-8") -> str:
+    """Charset from a <meta> tag in the first bytes of a page, else default."""
+    match = META_CHARSET.search(head[:2048])
+    if match:
+        name = match.group(1).decode("ascii", "ignore")
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return default
+
+
+def extract_text(chunks: Iterable[Union[bytes, str]], max_bytes: int = 2_000_000, max_chars: int = 5000,
+                 encoding: Optional[str] = None, cancel: Optional[threading.Event] = None,
+                 prefer_lxml: bool = True) -> Extracted:
+    """
+    Extract visible text from HTML arriving in chunks.
+
+    Reading stops after max_bytes, once max_chars characters of text have
+    been collected, or when cancel is set.
+
+    Args:
+        chunks: Body chunks, e.g. response.iter_content(16384)
+        max_bytes: Bytes read at most
+        max_chars: Characters of text kept at most
+        encoding: Body encoding; sniffed from <meta charset> (else UTF-8) if None
+        cancel: Event that abandons the read when set
+        prefer_lxml: Use lxml when it is installed
+
+    Returns:
+        Extracted(text, bytes_read, truncated, parser)
+    """
+    collector = TextCollector(max_chars)
+    parser, parser_name = make_parser(collector, prefer_lxml)
+    decoder = None
+    bytes_read = 0
+    truncated = False
+
+    try:
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                truncated = True
+                break
+            if not chunk:
+                continue
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding or sniff_encoding(chunk))(errors="replace")
+                if bytes_read + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - bytes_read]
+                    truncated = True
+                bytes_read += len(chunk)
+                chunk = decoder.decode(chunk)
+            else:
+                bytes_read += len(chunk)
+            parser.feed(chunk)
+            if truncated:
+                break
+        else:
+            if decoder is not None:
+                parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+    except BudgetReached:
+        truncated = True
+    except Exception:
+        # lxml wraps exceptions raised in target callbacks
+        if not collector.full:
+            raise
+        truncated = True
+
+    text = collector.close()
+    if truncated and text:
+        text += "..."
+    return Extracted(text, bytes_read, truncated, parser_name)
@@ -0,0 +1,537 @@
+"""
+Shared HTTP session with a private, on-disk response cache.
+
+Every capability gets its HTTP session from get_session(), so they all share
+one connection pool. Cacheable GET responses are stored in SQLite with a
+small in-memory LRU in front and served without a request while they are
+fresh (Cache-Control max-age, Expires, or a heuristic from Last-Modified).
+Once stale, they are revalidated with If-None-Match / If-Modified-Since, and
+a 304 reply refreshes the stored copy instead of downloading it again. The
+store is size-bounded and evicts the least recently used responses first.
+
+Streamed GETs go through the cache too. A stored body is handed back as an
+already-read response whose iter_content replays it, and a fresh download
+is copied into the store while the caller reads it. Callers that stop
+reading early (page byte or text budgets, cancelled fetches) close the
+response as usual. The copy is then finished in the background only if a
+few kilobytes are left; otherwise it is dropped and the connection closed,
+so the caller's byte budget holds.
+"""
+import email.utils
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .lazy_import import lazy_import
+
+requests = lazy_import('requests')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access);
+"""
+
+CACHEABLE_STATUS = frozenset({200, 203, 300, 301, 308, 404, 410})
+HEURISTIC_FRACTION = 0.1  # Of the time since Last-Modified, as RFC 9111 suggests
+HEURISTIC_MAX = 86400.0
+DRAIN_CHUNK = 64 * 1024
+DRAIN_MAX_BYTES = 16 * 1024  # Largest remainder read after the caller closed a stream
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """'max-age=60, no-cache' -> {"max-age": "60", "no-cache": None}."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _lower_keys(headers) -> Dict[str, str]:
+    return {k.lower(): v for k, v in headers.items()}
+
+
+def is_storable(status: int, response_headers, request_headers=None) -> bool:
+    """Whether a GET response may be kept by a private cache."""
+    headers = _lower_keys(response_headers)
+    response_cc = parse_cache_control(headers.get("cache-control"))
+    request_cc = parse_cache_control(_lower_keys(request_headers or {}).get("cache-control"))
+    return (status in CACHEABLE_STATUS
+            and "no-store" not in response_cc and "no-store" not in request_cc
+            and headers.get("vary", "").strip() != "*")
+
+
+def freshness_lifetime(response_headers, now: Optional[float] = None) -> float:
+    """Seconds a response stays fresh after it was received (0 = revalidate every time)."""
+    headers = _lower_keys(response_headers)
+    cc = parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in cc:
+        return 0.0
+    if cc.get("max-age") is not None:
+        try:
+            return max(0.0, float(cc["max-age"]))
+        except ValueError:
+            return 0.0
+
+    now = now or time.time()
+    date = _http_date(headers.get("date")) or now
+    expires = headers.get("expires")
+    if expires is not None:
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified and last_modified < date:
+        return min(HEURISTIC_MAX, (date - last_modified) * HEURISTIC_FRACTION)
+    return 0.0
+
+
+class HTTPCacheStore:
+    """SQLite response store with an in-memory LRU front and a size bound."""
+
+    def __init__(self, path: str = "data/http_cache.db", max_bytes: int = 50 * 1024 * 1024,
+                 memory_entries: int = 128, max_entry_bytes: int = 5 * 1024 * 1024):
+        """
+        Args:
+            path: SQLite database file
+            max_bytes: Total body bytes kept on disk before evicting
+            memory_entries: Responses also kept in memory
+            max_entry_bytes: Larger responses are not cached
+        """
+        self.logger = logging.getLogger('jarvis.http_cache')
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._touched: Dict[str, float] = {}  # Memory hits not yet written to last_access
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "memory_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection, opened on first use."""
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(self.path, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.executescript(SCHEMA)
+                    self._total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                    self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored entry {"status", "headers", "body", "stored_at", "expires_at"}, or None."""
+        with self._lock:
+            entry = self._load(key)
+            self.stats["hits" if entry is not None else "misses"] += 1
+            return entry
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        # Caller holds self._lock
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self._touched[key] = now
+            self.stats["memory_hits"] += 1
+            return entry
+
+        row = self.conn.execute(
+            "SELECT status, headers, body, stored_at, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        entry = {"status": row[0], "headers": json.loads(row[1]), "body": row[2],
+                 "stored_at": row[3], "expires_at": row[4]}
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes, expires_at: float) -> bool:
+        """Store a response; returns False if it is too large to cache."""
+        if len(body) > self.max_entry_bytes:
+            return False
+        now = time.time()
+        entry = {"status": status, "headers": dict(headers), "body": body,
+                 "stored_at": now, "expires_at": expires_at}
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, status, headers, body, stored_at, expires_at, size, "
+                    "last_access) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, status, json.dumps(entry["headers"]), sqlite3.Binary(body), now, expires_at,
+                     len(body), now)
+                )
+            self._total += len(body) - (old[0] if old else 0)
+            self._remember(key, entry)
+            self.stats["stores"] += 1
+            if self._total > self.max_bytes:
+                self._evict()
+        return True
+
+    def refresh(self, key: str, headers: Dict[str, str], expires_at: float):
+        """Apply a 304 reply: merge its headers and extend the entry's freshness."""
+        with self._lock:
+            entry = self._load(key)
+            if entry is None:
+                return
+            merged = dict(entry["headers"])
+            merged.update(headers)
+            entry.update(headers=merged, stored_at=time.time(), expires_at=expires_at)
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET headers = ?, stored_at = ?, expires_at = ? WHERE key = ?",
+                    (json.dumps(merged), entry["stored_at"], expires_at, key)
+                )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            row = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                with self.conn:
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total -= row[0]
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Drop least recently used responses until under max_bytes (lock held)."""
+        with self.conn:
+            if self._touched:
+                self.conn.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                      [(at, key) for key, at in self._touched.items()])
+                self._touched.clear()
+            target = self.max_bytes * 0.9  # Leave headroom so each store does not evict again
+            victims = []
+            for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                if self._total <= target:
+                    break
+                victims.append((key,))
+                self._total -= size
+            self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        for (key,) in victims:
+            self._memory.pop(key, None)
+        self.stats["evictions"] += len(victims)
+        self.logger.debug(f"Evicted {len(victims)} cached responses")
+
+    def size(self) -> int:
+        """Total body bytes on disk."""
+        with self._lock:
+            return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                if self._touched:
+                    with self._conn:
+                        self._conn.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                               [(at, key) for key, at in self._touched.items()])
+                    self._touched.clear()
+                self._conn.close()
+                self._conn = None
+
+
+class CachedSession:
+    """requests.Session front end that answers cacheable GETs from an HTTPCacheStore."""
+
+    def __init__(self, store: Optional[HTTPCacheStore] = None, pool_maxsize: int = 16, session=None):
+        """
+        Args:
+            store: Response store; caching is off if None
+            pool_maxsize: Pooled connections kept per host
+            session: Underlying requests.Session (default: a new pooled one)
+        """
+        self.logger = logging.getLogger('jarvis.http_cache')
+        self.store = store
+        self.pool_maxsize = pool_maxsize
+        self._session = session
+        self._drain_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "served_from_cache": 0, "revalidated": 0, "not_modified": 0,
+                      "streams_stored": 0}
+
+    @property
+    def session(self):
+        """Underlying requests.Session, created on first request."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_maxsize,
+                                                            pool_maxsize=self.pool_maxsize)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url: str, params=None, headers: Optional[Dict[str, str]] = None, stream: bool = False,
+            **kwargs):
+        """
+        GET through the cache.
+
+        Ranged requests and requests sent with Cache-Control: no-store (such
+        as file downloads) bypass it and go straight to the network. Streamed
+        responses are stored as the caller reads them (see _StreamCopy).
+        """
+        self.stats["requests"] += 1
+        headers = dict(headers or {})
+        request_cc = parse_cache_control(_lower_keys(headers).get("cache-control"))
+        if self.store is None or "no-store" in request_cc or any(k.lower() == "range" for k in headers):
+            return self.session.get(url, params=params, headers=headers, stream=stream, **kwargs)
+
+        key = requests.Request('GET', url, params=params).prepare().url
+        entry = self.store.get(key)
+        now = time.time()
+        if entry is not None and now < entry["expires_at"] and "no-cache" not in request_cc:
+            self.stats["served_from_cache"] += 1
+            return self._build_response(key, entry)
+
+        if entry is not None:
+            cached_headers = _lower_keys(entry["headers"])
+            if cached_headers.get("etag"):
+                headers["If-None-Match"] = cached_headers["etag"]
+            if cached_headers.get("last-modified"):
+                headers["If-Modified-Since"] = cached_headers["last-modified"]
+            self.stats["revalidated"] += 1
+
+        response = self.session.get(url, params=params, headers=headers, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            lifetime = freshness_lifetime({**entry["headers"], **response.headers}, now)
+            self.store.refresh(key, dict(response.headers), now + lifetime)
+            response.close()
+            return self._build_response(key, entry)
+
+        if is_storable(response.status_code, response.headers, headers):
+            lifetime = freshness_lifetime(response.headers, now)
+            lowered = _lower_keys(response.headers)
+            # Responses that are neither fresh nor revalidatable would never be reused
+            if stream:
+                if lifetime > 0 or "etag" in lowered or "last-modified" in lowered:
+                    _StreamCopy(self, key, response, now + lifetime)
+            elif lifetime > 0 or "etag" in lowered or "last-modified" in lowered:
+                self.store.put(key, response.status_code, dict(response.headers), response.content,
+                               now + lifetime)
+        return response
+
+    def _drain(self, copy: "_StreamCopy"):
+        """Finish reading an abandoned stream in the background."""
+        with self._lock:
+            if self._drain_pool is None:
+                self._drain_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="http-cache-drain")
+            pool = self._drain_pool
+        try:
+            pool.submit(copy.drain)
+        except RuntimeError:
+            copy.abandon()  # Session closed
+
+    def _build_response(self, url: str, entry: Dict[str, Any]):
+        response = requests.models.Response()
+        response.status_code = entry["status"]
+        response.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+        response._content = entry["body"]
+        response._content_consumed = True  # iter_content replays the body
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def post(self, url: str, **kwargs):
+        """POSTs are never cached."""
+        self.stats["requests"] += 1
+        return self.session.post(url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs):
+        if method.upper() == "GET":
+            return self.get(url, **kwargs)
+        self.stats["requests"] += 1
+        return self.session.request(method, url, **kwargs)
+
+    def report(self) -> Dict[str, Any]:
+        """Session and cache stats for the health status."""
+        report = dict(self.stats)
+        if self.store is not None:
+            report["cache"] = dict(self.store.stats, bytes=self.store.size())
+        return report
+
+    def close(self):
+        if self._drain_pool is not None:
+            self._drain_pool.shutdown(wait=True, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+        if self.store is not None:
+            self.store.close()
+
+
+class _StreamCopy:
+    """
+    Copies a streamed response body into the store while the caller reads it.
+
+    Installs itself as the response's iter_content and close. The body is
+    stored once it has been read to the end. A response closed early is
+    finished on the session's drain pool when its Content-Length says at
+    most DRAIN_MAX_BYTES are left, and abandoned otherwise. Bodies larger
+    than the store's entry limit are dropped.
+    """
+
+    def __init__(self, session: CachedSession, key: str, response, expires_at: float):
+        self.session = session
+        self.key = key
+        self.response = response
+        self.expires_at = expires_at
+        self.limit = session.store.max_entry_bytes
+        self.chunks = []
+        self.size = 0
+        self.source = None
+        try:
+            self.copying = int(response.headers.get("Content-Length", 0)) <= self.limit
+        except ValueError:
+            self.copying = True
+        self._iter_content = response.iter_content
+        self._close = response.close
+        response.iter_content = self.iter_content
+        response.close = self.close
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        if self.source is not None or decode_unicode:
+            self.copying = False
+            yield from self._iter_content(chunk_size, decode_unicode)
+            return
+        self.source = self._iter_content(chunk_size)
+        for chunk in self.source:
+            self._keep(chunk)
+            yield chunk
+        self._store()
+
+    def close(self):
+        remaining = self._remaining()
+        if self.copying and remaining is not None and remaining <= DRAIN_MAX_BYTES:
+            self.session._drain(self)
+        else:
+            self.abandon()
+
+    def _remaining(self) -> Optional[int]:
+        """Body bytes not read yet, if the headers tell (encoded lengths do not match decoded reads)."""
+        headers = self.response.headers
+        if headers.get("Content-Encoding", "identity").lower() != "identity":
+            return None
+        try:
+            return int(headers["Content-Length"]) - self.size
+        except (KeyError, ValueError):
+            return None
+
+    def drain(self):
+        try:
+            for chunk in self.source or self._iter_content(DRAIN_CHUNK):
+                self._keep(chunk)
+                if not self.copying:
+                    return
+            self._store()
+        except Exception as e:
+            self.session.logger.debug(f"Not caching {self.key}: {e}")
+        finally:
+            self._close()
+
+    def abandon(self):
+        self.copying = False
+        self.chunks = []
+        self._close()
+
+    def _keep(self, chunk: bytes):
+        if not self.copying:
+            return
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.size > self.limit:
+            self.copying = False
+            self.chunks = []
+
+    def _store(self):
+        if self.copying:
+            self.copying = False
+            body = b"".join(self.chunks)
+            self.chunks = []
+            if self.session.store.put(self.key, self.response.status_code, dict(self.response.headers), body,
+                                      self.expires_at):
+                self.session.stats["streams_stored"] += 1
+
+
+_session: Optional[CachedSession] = None
+_session_lock = threading.Lock()
+
+
+def configure_session(cache_path: Optional[str] = "data/http_cache.db", max_bytes: int = 50 * 1024 * 1024,
+                      memory_entries: int = 128, pool_maxsize: int = 16) -> CachedSession:
+    """Set up the process-wide session; call before the first get_session() to change defaults."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        store = HTTPCacheStore(cache_path, max_bytes, memory_entries) if cache_path else None
+        _session = CachedSession(store, pool_maxsize=pool_maxsize)
+        return _session
+
+
+def get_session() -> CachedSession:
+    """Get the process-wide pooled, caching HTTP session."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = CachedSession(HTTPCacheStore())
+        return _session
+
+
+def close_session():
+    """Close the process-wide session and its store, if one was created."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,177 @@
+"""
+Durable key -> record store backed by an append-only journal.
+
+Writes update memory immediately and are appended to the journal by a
+background thread, which groups everything queued within flush_interval into
+one write and one fsync. Once the journal grows past compact_after entries it
+is folded into a snapshot (written to a temp file and atomically renamed) and
+truncated. On load the snapshot is read and the journal replayed over it; a
+torn final line from a crash is cut off so later appends start on a clean
+line.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class JournalStore:
+    """Keyed records persisted via journal + snapshot with batched fsync."""
+
+    def __init__(self, path: str, flush_interval: float = 0.2, compact_after: int = 500):
+        """
+        Args:
+            path: Base path; "<path>.journal" and "<path>.snapshot" are created
+            flush_interval: Seconds to collect writes before one fsync
+            compact_after: Journal entries before compacting into a snapshot
+        """
+        self.logger = logging.getLogger('jarvis.storage')
+        self.journal_path = Path(f"{path}.journal")
+        self.snapshot_path = Path(f"{path}.snapshot")
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._durable: Dict[str, Dict[str, Any]] = {}  # State as of the last fsync
+        self._journal_entries = 0
+        self.stats = {"writes": 0, "fsyncs": 0, "compactions": 0}
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def _load(self):
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    self._durable = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+
+        if self.journal_path.exists():
+            good = 0  # Byte offset just past the last complete entry
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated entry")
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn write at the tail
+                    self._apply(self._durable, entry)
+                    self._journal_entries += 1
+                    good += len(line)
+            if good < self.journal_path.stat().st_size:
+                # Otherwise the next append would continue the torn line and
+                # everything written after it would be unreadable on reload
+                self.logger.warning(f"Dropping torn tail of {self.journal_path} at byte {good}")
+                os.truncate(self.journal_path, good)
+
+        self.records = {key: dict(value) for key, value in self._durable.items()}
+
+    @staticmethod
+    def _apply(state: Dict[str, Dict[str, Any]], entry: Dict[str, Any]):
+        if entry["op"] == "put":
+            state[entry["key"]] = entry["value"]
+        else:
+            state.pop(entry["key"], None)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.records.get(key)
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of every record."""
+        with self._lock:
+            return dict(self.records)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a JSON-serializable record; returns without waiting for disk."""
+        with self._lock:
+            self.records[key] = value
+        self._queue.put({"op": "put", "key": key, "value": value})
+
+    def delete(self, key: str):
+        """Remove a record; returns without waiting for disk."""
+        with self._lock:
+            self.records.pop(key, None)
+        self._queue.put({"op": "delete", "key": key})
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._journal.close()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            # Group commit: collect whatever arrives within the flush window,
+            # cutting it short when someone is waiting on flush()/close()
+            deadline = time.monotonic() + self.flush_interval
+            try:
+                while isinstance(batch[-1], dict):
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                pass
+
+            try:
+                self._write_batch([item for item in batch if isinstance(item, dict)])
+            except Exception as e:
+                # Keep the writer alive: a dead writer would leave flush() waiting forever
+                self.logger.error(f"Journal write failed: {e}")
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if None in batch:
+                return
+
+    def _write_batch(self, entries: List[Dict[str, Any]]):
+        written, lines = [], []
+        for entry in entries:
+            try:
+                lines.append(json.dumps(entry) + "\n")
+                written.append(entry)
+            except (TypeError, ValueError) as e:
+                self.logger.error(f"Not persisting {entry['key']!r}: {e}")
+        if not lines:
+            return
+        self._journal.write("".join(lines))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self.stats["writes"] += len(written)
+        self.stats["fsyncs"] += 1
+        for entry in written:
+            self._apply(self._durable, entry)
+        self._journal_entries += len(written)
+        if self._journal_entries >= self.compact_after:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._durable, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # The journal is fully reflected in the snapshot now
+        self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._journal_entries = 0
+        self.stats["compactions"] += 1
@@ -0,0 +1,69 @@
+"""Deferred imports for heavy or platform-specific third-party modules."""
+import importlib
+import importlib.util
+import threading
+import types
+from typing import Callable, Optional
+
+
+def is_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that performs the real import on first attribute access."""
+
+    def __init__(self, name: str, on_load: Optional[Callable] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_name"] = name
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_on_load"] = on_load
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with self.__dict__["_lazy_lock"]:
+            if self.__dict__["_lazy_module"] is None:
+                module = importlib.import_module(self.__dict__["_lazy_name"])
+                on_load = self.__dict__["_lazy_on_load"]
+                if on_load:
+                    on_load(module)
+                self.__dict__["_lazy_module"] = module
+        return self.__dict__["_lazy_module"]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_lazy_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+def lazy_import(name: str, on_load: Optional[Callable] = None) -> LazyModule:
+    """
+    Defer importing a module until it is first used.
+
+    Args:
+        name: Module name, e.g. "bs4" or "email.mime.text"
+        on_load: Called with the real module right after it is imported
+
+    Returns:
+        Proxy that behaves like the module once touched
+    """
+    return LazyModule(name, on_load)
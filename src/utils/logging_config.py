@@ -115,9 +115,15 @@ class HealthMonitor:
             "commands_processed": 0,
             "errors": 0,
             "cache_hits": 0,
+            "intent_timeouts": 0,
             "avg_response_time": 0,
             "last_error": None
         }
+        self.sources = {}  # name -> callable returning extra status for that component
+    
+    def add_source(self, name, report):
+        """Include a component's report (a no-argument callable) in the health status."""
+        self.sources[name] = report
     
     def record_command(self, success=True, response_time=0):
         """Record command execution."""
@@ -131,9 +137,10 @@ class HealthMonitor:
         current_avg = self.stats["avg_response_time"]
         self.stats["avg_response_time"] = (current_avg * (total - 1) + response_time) / total
     
-    def record_error(self, error_msg):
-        """Record error occurrence."""
-        self.stats["errors"] += 1
+    def record_error(self, error_msg, count=True):
+        """Record error occurrence (count=False if record_command will count it)."""
+        if count:
+            self.stats["errors"] += 1
         self.stats["last_error"] = {
             "time": datetime.now().isoformat(),
             "message": str(error_msg)
@@ -144,6 +151,10 @@ class HealthMonitor:
         """Record cache hit."""
         self.stats["cache_hits"] += 1
     
+    def record_intent_timeout(self):
+        """Record an intent extraction that exceeded its latency budget."""
+        self.stats["intent_timeouts"] += 1
+    
     def save_health_report(self):
         """Save health statistics to file."""
         try:
@@ -151,8 +162,10 @@ class HealthMonitor:
                 datetime.now() - datetime.fromisoformat(self.stats["start_time"])
             ).total_seconds()
             
+            report = dict(self.stats)
+            report.update(self.get_health_status())
             with open(self.health_log, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+                json.dump(report, f, indent=2)
         except Exception as e:
             self.logger.error(f"Failed to save health report: {e}")
     
@@ -169,9 +182,16 @@ class HealthMonitor:
             "commands_processed": self.stats["commands_processed"],
             "error_rate": f"{error_rate:.1f}%",
             "cache_hit_rate": f"{cache_rate:.1f}%",
+            "intent_timeouts": self.stats["intent_timeouts"],
             "avg_response_ms": f"{self.stats['avg_response_time']:.2f}"
         }
         
+        for name, report in self.sources.items():
+            try:
+                status[name] = report()
+            except Exception as e:
+                self.logger.error(f"Health source {name} failed: {e}")
+        
         return status
 
 def setup_production_logging(config=None):
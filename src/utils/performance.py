@@ -15,13 +15,24 @@ LLM_INTENT_TIMEOUT = 5     # seconds for intent extraction
 LLM_MAX_TOKENS = 100       # Limit response length
 
 # Fast Command Patterns (skip LLM)
+# Phrases match whole words only. A trailing {slot} captures up to
+# SLOT_MAX_TOKENS following words, stopping at SLOT_STOP_WORDS, e.g.
+# 'weather in {location}'. Extra phrases can be added under
+# performance.fast_commands in config/settings.json.
 FAST_COMMANDS = {
+    # Greetings
+    'greeting': ['hello', 'hi', 'hey', 'good morning', 'good evening'],
+    
     # Time queries
     'time': ['time', 'what time', "what's the time"],
     
     # Date queries
     'date': ['date', 'what day', 'today', 'what date'],
     
+    # Weather
+    'weather': ['weather', "what's the weather", 'weather today', 'weather in {location}',
+                'weather for {location}'],
+    
     # Applications
     'calculator': ['calculator', 'calc', 'open calc'],
     'explorer': ['file explorer', 'open explorer', 'explorer'],
@@ -35,10 +46,10 @@ FAST_COMMANDS = {
     'desktop': ['desktop', 'open desktop'],
     
     # Media
-    'play': ['play', 'resume'],
-    'pause': ['pause', 'stop music'],
+    'play': ['play', 'resume', 'play music', 'resume music'],
+    'pause': ['pause', 'stop music', 'pause music'],
     'next': ['next', 'next song', 'skip'],
-    'previous': ['previous', 'last song', 'back'],
+    'previous': ['previous', 'last song', 'previous song'],
     
     # Volume
     'volume up': ['volume up', 'louder', 'increase volume'],
@@ -46,6 +57,23 @@ FAST_COMMANDS = {
     'mute': ['mute', 'silence'],
 }
 
+# Words that may surround a fast command without changing its meaning.
+# Any other unmatched word sends the command to intent extraction instead.
+FILLER_WORDS = {
+    'a', 'an', 'the', 'is', 'it', "it's", 'what', "what's", 'whats', 'please', 'jarvis',
+    'me', 'my', 'show', 'open', 'tell', 'now', 'current', 'right', 'ok', 'okay',
+    'can', 'you', 'could', 'would', 'i', 'go', 'to', 'up', 'folder', 'app',
+    'start', 'launch', 'in', 'on', 'of', 'for', 'there',
+}
+
+# Slot values are short names; time words end them ("weather in paris
+# tomorrow"), and a command with words left over goes to intent extraction
+SLOT_MAX_TOKENS = 4
+SLOT_STOP_WORDS = {
+    'today', 'tonight', 'tomorrow', 'now', 'later', 'this', 'next', 'weekend', 'week',
+    'morning', 'afternoon', 'evening',
+}
+
 # Cache Settings
 ENABLE_CACHE = True
 CACHE_SIZE = 100  # Number of commands to cache
@@ -0,0 +1,178 @@
+"""
+Single-thread deadline scheduler.
+
+All delayed work (timers, reminders, background refreshes) shares one thread
+that sleeps on a condition variable until the earliest deadline in a min-heap,
+so thread count stays constant no matter how many timers are pending.
+Callbacks run on a small fixed worker pool so a slow callback (beeping,
+speaking) cannot delay the next deadline.
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+
+class ScheduledTask:
+    """Handle for a scheduled callback."""
+
+    __slots__ = ("deadline", "callback", "args", "kwargs", "cancelled", "done")
+
+    def __init__(self, deadline: float, callback: Callable, args: tuple, kwargs: dict):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self.done = False
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        """Seconds until the task fires (0 if overdue)."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.deadline - now)
+
+
+class Scheduler:
+    """Min-heap of monotonic deadlines served by one thread."""
+
+    # Rebuild the heap once cancelled entries outnumber live ones by this much
+    COMPACT_RATIO = 2
+
+    def __init__(self, name: str = "jarvis-scheduler", workers: int = 2):
+        """
+        Args:
+            name: Name of the scheduler thread
+            workers: Threads available to run callbacks
+        """
+        self.logger = logging.getLogger('jarvis.scheduler')
+        self.name = name
+        self._heap: List[list] = []  # [deadline, seq, task]
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._cancelled = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-worker")
+        self.stats = {"scheduled": 0, "fired": 0, "cancelled": 0, "errors": 0}
+
+    def start(self):
+        """Start the scheduler thread (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def schedule(self, delay: float, callback: Callable, *args: Any, **kwargs: Any) -> ScheduledTask:
+        """
+        Run callback(*args, **kwargs) after delay seconds.
+
+        Returns:
+            Task handle for cancel()
+        """
+        return self.schedule_at(time.monotonic() + max(0.0, delay), callback, *args, **kwargs)
+
+    def schedule_at(self, deadline: float, callback: Callable, *args: Any, **kwargs: Any) -> ScheduledTask:
+        """Run callback at a time.monotonic() deadline."""
+        task = ScheduledTask(deadline, callback, args, kwargs)
+        with self._cond:
+            if not self._running:
+                self.start()
+            heapq.heappush(self._heap, [deadline, next(self._seq), task])
+            self.stats["scheduled"] += 1
+            # Only wake the thread if this task is now the earliest
+            if self._heap[0][2] is task:
+                self._cond.notify()
+        return task
+
+    def cancel(self, task: ScheduledTask) -> bool:
+        """
+        Cancel a pending task; it is guaranteed not to run afterwards.
+
+        Returns:
+            False if the task already ran or was already cancelled
+        """
+        with self._cond:
+            if task.cancelled or task.done:
+                return False
+            task.cancelled = True
+            self._cancelled += 1
+            self.stats["cancelled"] += 1
+            # Entries are dropped lazily; compact when they dominate the heap
+            if self._cancelled > self.COMPACT_RATIO * (len(self._heap) - self._cancelled) + 64:
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            return True
+
+    def pending(self) -> int:
+        """Number of live tasks waiting to fire."""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def shutdown(self, wait: bool = False):
+        """Stop the scheduler; pending tasks are discarded."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if wait and self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running:
+                    # Discard cancelled entries sitting on top
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    timeout = self._heap[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                if not self._running:
+                    return
+
+                # Take everything that is due in one pass
+                due = []
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    task = heapq.heappop(self._heap)[2]
+                    if task.cancelled:
+                        self._cancelled -= 1
+                        continue
+                    task.done = True
+                    due.append(task)
+                self.stats["fired"] += len(due)
+
+            for task in due:
+                self._executor.submit(self._invoke, task)
+
+    def _invoke(self, task: ScheduledTask):
+        try:
+            task.callback(*task.args, **task.kwargs)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.error(f"Scheduled callback {getattr(task.callback, '__name__', task.callback)} failed: {e}")
+
+
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Get the process-wide scheduler, starting it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+            _scheduler.start()
+        return _scheduler
@@ -0,0 +1,129 @@
+"""Startup import profiling (python src/main.py --profile-startup)."""
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a cold start pulls in: the assistant core, every capability module the
+# loader registers, and the helpers they or the prewarm step import lazily.
+# Keep in step with Assistant._register_capabilities (tests check this).
+STARTUP_MODULES = [
+    "assistant.core",
+    "auth.voice_auth",
+    "capabilities.system_control",
+    "capabilities.web_search",
+    "capabilities.weather",
+    "capabilities.calculator",
+    "capabilities.timer",
+    "capabilities.media_control",
+    "capabilities.app_discovery",
+    "capabilities.email_manager",
+    "capabilities.web_automation",
+    "capabilities.news",
+    "capabilities.app_automation",
+    "capabilities.weather_prefetch",
+    "capabilities.mail_session",
+    "capabilities.mail_outbox",
+    "capabilities.units",
+    "capabilities.math_engine",
+    "llm.intent",
+    "llm.summarizer",
+    "utils.http_cache",
+    "utils.journal_store",
+    "utils.ttl_cache",
+    "utils.scheduler",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+class ImportNode:
+    """One module in the import tree."""
+
+    def __init__(self, name: str, self_us: int, cumulative_us: int):
+        self.name = name
+        self.self_ms = self_us / 1000.0
+        self.cumulative_ms = cumulative_us / 1000.0
+        self.children: List["ImportNode"] = []
+
+
+def parse_importtime(output: str) -> List[ImportNode]:
+    """
+    Build the import tree from `python -X importtime` output.
+
+    The interpreter prints children before their parent, indenting names by
+    nesting level, so pending nodes are attached when their parent appears.
+    """
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = ImportNode(name, int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def format_tree(nodes: List[ImportNode], min_ms: float = 1.0, indent: str = "") -> List[str]:
+    """Render nodes heaviest first, hiding subtrees cheaper than min_ms."""
+    lines = []
+    for node in sorted(nodes, key=lambda n: n.cumulative_ms, reverse=True):
+        if node.cumulative_ms < min_ms:
+            continue
+        lines.append(f"{node.cumulative_ms:9.1f} {node.self_ms:9.1f}  {indent}{node.name}")
+        lines.extend(format_tree(node.children, min_ms, indent + "  "))
+    return lines
+
+
+def profile_imports(modules: Optional[List[str]] = None) -> Dict[str, object]:
+    """
+    Import modules in a fresh interpreter with -X importtime.
+
+    Returns:
+        {"roots": [ImportNode], "returncode": int, "errors": str}
+    """
+    modules = modules or STARTUP_MODULES
+    # Import each module separately so one missing dependency does not hide the rest
+    # (importlib.import_module bypasses -X importtime for the module itself,
+    # so each name goes through a real import statement)
+    script = (
+        f"for name in {list(modules)!r}:\n"
+        "    try:\n"
+        "        exec('import ' + name)\n"
+        "    except Exception as e:\n"
+        "        print(f'{name}: {e}')\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True, text=True, cwd=SRC_DIR, env=env
+    )
+    return {
+        "roots": parse_importtime(proc.stderr),
+        "returncode": proc.returncode,
+        "errors": proc.stdout.strip(),
+    }
+
+
+def run_profile(modules: Optional[List[str]] = None, min_ms: float = 1.0) -> str:
+    """Profile startup imports and return the report as text."""
+    result = profile_imports(modules)
+    roots = result["roots"]
+    total = sum(node.cumulative_ms for node in roots)
+
+    lines = [
+        "JARVIS startup import profile",
+        f"Total import time: {total:.1f}ms ({len(roots)} top-level imports)",
+        "",
+        f"{'cumul ms':>9} {'self ms':>9}  module",
+    ]
+    lines.extend(format_tree(roots, min_ms))
+    if result["errors"]:
+        lines.extend(["", "Import failures:", result["errors"]])
+    return "\n".join(lines)
@@ -0,0 +1,171 @@
+"""
+Time-to-live cache with stale-while-revalidate and single-flight loads.
+
+An entry younger than ttl is served as is. Until it is ttl + stale_ttl old
+it is still served immediately, but a background refresh is started so the
+next caller gets fresh data. Older or missing entries are loaded in the
+caller's thread. Whichever way a key is loaded, only one load runs at a
+time: concurrent callers wait on the in-flight load instead of starting
+their own. Past max_entries, the least recently used entry is evicted.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Per-key cache of loader results that expire after ttl seconds."""
+
+    def __init__(self, ttl: float = 600.0, stale_ttl: float = 0.0, refresh_workers: int = 2,
+                 max_entries: int = 256, clock: Callable[[], float] = time.monotonic,
+                 name: str = "ttl-cache"):
+        """
+        Args:
+            ttl: Seconds an entry is fresh
+            stale_ttl: Further seconds a stale entry may be served while it refreshes
+            refresh_workers: Threads used for background refreshes
+            max_entries: Entries kept before the least recently used is evicted
+            clock: Monotonic time source (injectable for tests)
+            name: Used for the refresh threads and log messages
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_workers = refresh_workers
+        self.max_entries = max_entries
+        self.clock = clock
+        self.name = name
+        self.logger = logging.getLogger(f'jarvis.{name}')
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "loads": 0, "coalesced": 0,
+                      "refreshes": 0, "errors": 0, "evictions": 0}
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Value for key, calling loader() only when needed.
+
+        Raises:
+            Whatever loader raises, if there is no usable cached value
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                age = now - entry[0]
+                if age < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry[1]
+                if age < self.ttl + self.stale_ttl:
+                    self.stats["stale_hits"] += 1
+                    self._start_refresh(key, loader)
+                    return entry[1]
+            self.stats["misses"] += 1
+            future, owner = self._claim(key)
+            if not owner:
+                self.stats["coalesced"] += 1
+
+        if owner:
+            self._load(key, loader, future)
+        return future.result()
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any]) -> Future:
+        """Reload key in the background (joining any load already running)."""
+        with self._lock:
+            return self._start_refresh(key, loader)
+
+    def _start_refresh(self, key: Hashable, loader: Callable[[], Any]) -> Future:
+        # Caller holds self._lock
+        future, owner = self._claim(key)
+        if owner:
+            self.stats["refreshes"] += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                    thread_name_prefix=self.name)
+            self._executor.submit(self._load, key, loader, future)
+        return future
+
+    def _claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """In-flight future for key and whether the caller must run the load."""
+        # Caller holds self._lock
+        future = self._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = Future()
+        self._inflight[key] = future
+        return future, True
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], future: Future):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                self._inflight.pop(key, None)
+            self.logger.warning(f"Loading {key!r} failed: {e}")
+            future.set_exception(e)
+            return
+        with self._lock:
+            self.stats["loads"] += 1
+            self._store(key, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value as freshly loaded."""
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any):
+        # Caller holds self._lock
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Cached value regardless of age, without loading or counting."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since key was loaded, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return self.clock() - entry[0] if entry else None
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def hit_ratio(self) -> float:
+        """Share of get() calls answered from the cache (fresh or stale)."""
+        stats = self.counters()
+        served = stats["hits"] + stats["stale_hits"]
+        total = served + stats["misses"]
+        return served / total if total else 0.0
+
+    def counters(self) -> Dict[str, int]:
+        """Consistent copy of the stats."""
+        with self._lock:
+            return dict(self.stats)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def close(self):
+        """Stop the refresh threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
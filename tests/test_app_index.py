@@ -0,0 +1,38 @@
+import unittest
+from src.capabilities.app_index import AppIndex, normalize, bounded_edit_distance
+
+
+class TestAppIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = AppIndex({
+            "uninstall": "C:/Apps/Foo/uninstall.exe",
+            "chrome": "C:/Apps/Chrome/chrome.exe",
+            "notepad++": "C:/Apps/Notepad++/notepad++.exe",
+            "notepad": "notepad.exe",
+            "visual_studio_code": "C:/Apps/VSCode/code.exe",
+            "spotify": "C:/Apps/Spotify/spotify.exe",
+        })
+
+    def test_exact_match_ranks_first(self):
+        results = self.index.search("notepad")
+        self.assertEqual(results[0]["name"], "notepad")
+        self.assertEqual(results[0]["score"], 1.0)
+        self.assertEqual(results[1]["name"], "notepad++")
+
+    def test_misspelling_and_tokens(self):
+        self.assertEqual(self.index.find("spotfy"), "C:/Apps/Spotify/spotify.exe")
+        self.assertEqual(self.index.find("studio code"), "C:/Apps/VSCode/code.exe")
+
+    def test_unrelated_query_does_not_match_helper_executables(self):
+        self.assertIsNone(self.index.find("install"))
+        self.assertIsNone(self.index.find("a"))
+
+    def test_helpers(self):
+        self.assertEqual(normalize("Visual_Studio-Code.EXE"), "visual studio code")
+        self.assertEqual(bounded_edit_distance("discrod", "discord", 1), 1)
+        self.assertEqual(bounded_edit_distance("abc", "xyz", 1), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
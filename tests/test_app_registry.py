@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from src.capabilities.app_registry import AppRegistry
+
+
+class TestAppRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "apps.db")
+        self.legacy = os.path.join(self.tmp.name, "app_cache.json")
+        with open(self.legacy, "w") as f:
+            json.dump({"chrome": "chrome.exe", "notepad": "notepad.exe"}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_migrated_once_and_lazily(self):
+        registry = AppRegistry(self.db, legacy_cache=self.legacy, legacy_state=None)
+        self.assertFalse(os.path.exists(self.db))  # Nothing opened yet
+        self.assertEqual(registry.apps(), {"chrome": "chrome.exe", "notepad": "notepad.exe"})
+        self.assertFalse(os.path.exists(self.legacy))
+        self.assertTrue(os.path.exists(self.legacy + ".migrated"))
+        registry.close()
+
+        with open(self.legacy, "w") as f:
+            json.dump({"stale": "stale.exe"}, f)
+        reopened = AppRegistry(self.db, legacy_cache=self.legacy, legacy_state=None)
+        self.assertNotIn("stale", reopened.apps())
+        reopened.close()
+
+    def test_apply_scan_keeps_launch_counts(self):
+        registry = AppRegistry(self.db, legacy_cache=self.legacy, legacy_state=None)
+        registry.add_alias("browser", "chrome")
+        registry.record_launch("browser")
+        registry.record_launch("chrome")
+
+        changes = registry.apply_scan({"chrome": "C:/Chrome/chrome.exe", "code": "code.exe"})
+        self.assertEqual(changes, {"added": 1, "updated": 1, "removed": 1, "restored": 0})
+        self.assertEqual(registry.get("browser"), "C:/Chrome/chrome.exe")
+        self.assertEqual(registry.most_launched()[0][:3], ("chrome", "C:/Chrome/chrome.exe", 2))
+        registry.close()
+
+    def test_unchanged_scan_writes_nothing(self):
+        registry = AppRegistry(self.db, legacy_cache=self.legacy, legacy_state=None)
+        registry.apply_scan({"chrome": "chrome.exe", "notepad": "notepad.exe"})
+        changes_before = registry.conn.total_changes
+        self.assertEqual(registry.apply_scan({"chrome": "chrome.exe", "notepad": "notepad.exe"}),
+                         {"added": 0, "updated": 0, "removed": 0, "restored": 0})
+        self.assertEqual(registry.conn.total_changes - changes_before, 1)  # meta.last_scan only
+        registry.close()
+
+    def test_vanished_app_keeps_history_when_it_returns(self):
+        registry = AppRegistry(self.db, legacy_cache=self.legacy, legacy_state=None)
+        registry.add_alias("browser", "chrome")
+        registry.record_launch("chrome")
+
+        registry.apply_scan({"notepad": "notepad.exe"})
+        self.assertIsNone(registry.get("browser"))
+        self.assertNotIn("chrome", registry.apps())
+
+        changes = registry.apply_scan({"chrome": "chrome.exe", "notepad": "notepad.exe"})
+        self.assertEqual(changes["restored"], 1)
+        self.assertEqual(registry.get("browser"), "chrome.exe")
+        self.assertEqual(registry.launch_counts(), {"chrome": 1})
+        registry.close()
+
+    def test_scan_state_round_trip(self):
+        registry = AppRegistry(self.db, legacy_cache=None, legacy_state=None)
+        state = {"/apps": {"mtime": 1.5, "apps": {"a": "/apps/a"}, "dirs": ["/apps/sub"]}}
+        registry.save_scan_state(state)
+        self.assertEqual(registry.load_scan_state(), state)
+        registry.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from src.capabilities.app_scanner import AppScanner, LinuxBackend, ScanRoot, WindowsBackend
+
+
+class TreeBackend:
+    """Scans one temporary tree for .exe files, like the Windows backend."""
+
+    def __init__(self, root, max_depth):
+        self.root = root
+        self.max_depth = max_depth
+
+    def static_apps(self):
+        return {"builtin": "builtin.exe"}
+
+    def roots(self):
+        return [ScanRoot(self.root, self.max_depth, WindowsBackend.match_exe)]
+
+
+class TestAppScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        for rel in ("Top.exe", "Vendor/App/app.exe", "Vendor/App/bin/deep.exe", "Other/tool.exe", "Other/readme.txt"):
+            path = os.path.join(root, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_depth_pruning(self):
+        apps, state = AppScanner(TreeBackend(self.tmp.name, 2)).scan()
+        self.assertEqual(set(apps), {"builtin", "top", "app", "tool"})
+        self.assertNotIn(os.path.join(self.tmp.name, "Vendor", "App", "bin"), state)
+
+    def test_incremental_rescan_only_lists_changed_directories(self):
+        scanner = AppScanner(TreeBackend(self.tmp.name, 3))
+        apps, state = scanner.scan()
+        self.assertIn("deep", apps)
+
+        open(os.path.join(self.tmp.name, "Other", "new.exe"), "w").close()
+        apps, state = scanner.scan(state)
+        self.assertIn("new", apps)
+        self.assertEqual(scanner.stats["dirs_scanned"], 1)
+        self.assertEqual(scanner.stats["dirs_reused"], 4)
+
+    def test_desktop_entry_parsing(self):
+        path = os.path.join(self.tmp.name, "org.gnome.Calculator.desktop")
+        with open(path, "w") as f:
+            f.write("[Desktop Entry]\nType=Application\nName=Calculator\nExec=gnome-calculator %U\n"
+                    "[Desktop Action new]\nExec=ignored\n")
+        entry = next(e for e in os.scandir(self.tmp.name) if e.name.endswith(".desktop"))
+        self.assertEqual(dict(LinuxBackend.match_desktop(entry)), {
+            "calculator": "gnome-calculator",
+            "org.gnome.calculator": "gnome-calculator",
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import threading
+import unittest
+from src.assistant.capability_loader import CapabilityLoader, LazyCapability
+
+
+class Owner:
+    counter = LazyCapability()
+
+    def __init__(self, loader):
+        self.capabilities = loader
+
+
+class TestCapabilityLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = CapabilityLoader()
+        self.loader.register("counter", "collections", "Counter", a=1)
+        self.loader.register("broken", "module_that_does_not_exist", "Thing")
+
+    def test_loads_on_first_access_only(self):
+        owner = Owner(self.loader)
+        self.assertFalse(self.loader.is_loaded("counter"))
+        self.assertEqual(owner.counter["a"], 1)
+        self.assertIs(owner.counter, owner.counter)
+        self.assertIn("import_ms", self.loader.report["counter"])
+
+    def test_concurrent_first_use_constructs_once(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.loader.get("counter"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_failures_are_reported(self):
+        with self.assertRaises(ImportError):
+            self.loader.get("broken")
+        self.assertIsNotNone(self.loader.report["broken"]["error"])
+        self.assertIn("ERROR", self.loader.format_report())
+
+    def test_prewarm_loads_in_background(self):
+        after = []
+        self.loader.prewarm(["counter", "broken"], then=lambda: after.append(self.loader.is_loaded("counter"))).join(5)
+        self.assertTrue(self.loader.is_loaded("counter"))
+        self.assertFalse(self.loader.is_loaded("broken"))
+        self.assertEqual(after, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from src.utils.downloader import Downloader, DownloadError
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, headers, body=b"", fail_after=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.fail_after = fail_after
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for offset in range(0, len(self.body), chunk_size):
+            if self.fail_after is not None and offset >= self.fail_after:
+                raise ConnectionError("connection reset")
+            yield self.body[offset:offset + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRaw:
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, chunk_size, decode_content=True):
+        assert not decode_content
+        for offset in range(0, len(self.body), chunk_size):
+            yield self.body[offset:offset + chunk_size]
+
+
+class GzipResponse(FakeResponse):
+    """Like requests: iter_content decodes, raw.stream(decode_content=False) does not."""
+
+    def __init__(self, body):
+        self.encoded = gzip.compress(body)
+        super().__init__(200, {"Content-Length": str(len(self.encoded)), "Content-Encoding": "gzip"}, body)
+        self.raw = FakeRaw(self.encoded)
+
+
+class FakeServer:
+    """Serves one body; honours Range when ranges=True."""
+
+    def __init__(self, body, ranges=True, etag='"v1"'):
+        self.body = body
+        self.ranges = ranges
+        self.etag = etag
+        self.requests = []
+        self.fail_after = None
+        self.lock = threading.Lock()
+
+    def request(self, method, url, headers=None, **kwargs):
+        headers = {"Content-Length": str(len(self.body)), "ETag": self.etag}
+        if self.ranges:
+            headers["Accept-Ranges"] = "bytes"
+        return FakeResponse(200, headers)
+
+    def get(self, url, headers=None, stream=False, **kwargs):
+        with self.lock:
+            self.requests.append(dict(headers or {}))
+        fail_after, self.fail_after = self.fail_after, None
+        spec = (headers or {}).get("Range")
+        if spec and self.ranges:
+            start, _, end = spec[len("bytes="):].partition("-")
+            end = int(end) if end else len(self.body) - 1
+            return FakeResponse(206, {"ETag": self.etag}, self.body[int(start):end + 1], fail_after)
+        return FakeResponse(200, {"ETag": self.etag}, self.body, fail_after)
+
+
+class TestDownloader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "file.bin")
+        self.body = os.urandom(100_000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_single_stream_with_progress_and_checksum(self):
+        server = FakeServer(self.body, ranges=False)
+        seen = []
+        result = Downloader(server, chunk_size=4096).download(
+            "https://x/file", self.dest, sha256=hashlib.sha256(self.body).hexdigest(),
+            progress=lambda done, total, rate: seen.append((done, total)))
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.body)
+        self.assertEqual((result.size, result.segments, result.resumed_from), (len(self.body), 1, 0))
+        self.assertEqual(seen[-1], (len(self.body), len(self.body)))
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+        self.assertFalse(os.path.exists(self.dest + ".part.json"))
+
+    def test_content_encoding_does_not_break_length_check(self):
+        body = b"a,b,c\n" * 20000
+        sent = []
+
+        class GzipServer:
+            def request(self, method, url, headers=None, **kwargs):
+                sent.append(dict(headers or {}))
+                return GzipResponse(body)
+
+            def get(self, url, headers=None, **kwargs):
+                sent.append(dict(headers or {}))
+                return GzipResponse(body)
+
+        result = Downloader(GzipServer()).download("https://x/data.csv", self.dest)
+        self.assertTrue(all(headers["Accept-Encoding"] == "identity" for headers in sent))
+        with open(self.dest, "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), body)
+        self.assertEqual(result.size, len(gzip.compress(body)))
+
+    def test_resumes_with_range_after_interruption(self):
+        server = FakeServer(self.body)
+        downloader = Downloader(server, chunk_size=10_000)
+        server.fail_after = 30_000
+        with self.assertRaises(ConnectionError):
+            downloader.download("https://x/file", self.dest)
+        self.assertEqual(os.path.getsize(self.dest + ".part"), 30_000)
+
+        result = downloader.download("https://x/file", self.dest)
+        self.assertEqual(server.requests[-1]["Range"], "bytes=30000-99999")
+        self.assertEqual(result.resumed_from, 30_000)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_restarts_when_resource_changed(self):
+        server = FakeServer(self.body)
+        server.fail_after = 30_000
+        with self.assertRaises(ConnectionError):
+            Downloader(server, chunk_size=10_000).download("https://x/file", self.dest)
+        server.etag = '"v2"'
+        result = Downloader(server, chunk_size=10_000).download("https://x/file", self.dest)
+        self.assertEqual(result.resumed_from, 0)
+        self.assertNotIn("Range", server.requests[-1])
+
+    def test_parallel_ranges(self):
+        server = FakeServer(self.body)
+        result = Downloader(server, chunk_size=4096, workers=4, parallel_threshold=10_000).download(
+            "https://x/file", self.dest, expected_size=len(self.body))
+        self.assertEqual(result.segments, 4)
+        self.assertEqual(len(server.requests), 4)
+        self.assertTrue(all("Range" in headers for headers in server.requests))
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_parallel_ranges_resume(self):
+        server = FakeServer(self.body)
+        downloader = Downloader(server, chunk_size=4096, workers=4, parallel_threshold=10_000)
+        server.fail_after = 8192
+        with self.assertRaises(ConnectionError):
+            downloader.download("https://x/file", self.dest)
+        result = downloader.download("https://x/file", self.dest)
+        self.assertGreater(result.resumed_from, 0)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.body)
+
+    def test_checksum_mismatch_discards_partial(self):
+        server = FakeServer(self.body)
+        with self.assertRaises(DownloadError):
+            Downloader(server).download("https://x/file", self.dest, sha256="0" * 64)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+
+    def test_length_mismatch(self):
+        server = FakeServer(self.body)
+        with self.assertRaises(DownloadError):
+            Downloader(server).download("https://x/file", self.dest, expected_size=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from src.utils.fast_path import FastCommandEngine, TokenAutomaton, tokenize
+
+
+class TestTokenAutomaton(unittest.TestCase):
+
+    def test_finds_overlapping_phrases_in_one_pass(self):
+        automaton = TokenAutomaton()
+        weather = automaton.add(["weather"])
+        weather_today = automaton.add(["weather", "today"])
+        today = automaton.add(["today"])
+        matches = automaton.search(tokenize("what's the weather today"))
+        self.assertEqual(sorted(matches), [(2, 3, weather), (2, 4, weather_today), (3, 4, today)])
+
+
+class TestFastCommandEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = FastCommandEngine()
+
+    def test_matches_whole_words_only(self):
+        self.assertIsNone(self.engine.match("check for updates"))
+        self.assertIsNone(self.engine.match("sometimes i wonder"))
+        self.assertIsNone(self.engine.match("set a timer for 5 minutes"))
+
+    def test_filler_words_are_allowed(self):
+        self.assertEqual(self.engine.match("what time is it")["action"], "time")
+        self.assertEqual(self.engine.match("open calc")["action"], "calculator")
+
+    def test_nested_phrase_does_not_compete(self):
+        self.assertEqual(self.engine.match("what's the weather today")["action"], "weather")
+
+    def test_slot_extraction(self):
+        match = self.engine.match("weather in new york")
+        self.assertEqual(match["action"], "weather")
+        self.assertEqual(match["slots"], {"location": "new york"})
+
+    def test_slot_stops_at_time_words_and_length(self):
+        self.assertIsNone(self.engine.match("weather for the weekend"))
+        self.assertIsNone(self.engine.match("weather in paris tomorrow"))
+        self.assertIsNone(self.engine.match("weather in a place i visited last summer with my family"))
+
+    def test_go_back_is_not_media(self):
+        self.assertIsNone(self.engine.match("go back"))
+        self.assertEqual(self.engine.match("previous song")["action"], "previous")
+
+    def test_unknown_words_fall_through(self):
+        self.assertIsNone(self.engine.match("what time is it in tokyo"))
+        self.assertIsNone(self.engine.match("hey what's the weather"))
+
+    def test_config_overrides_add_phrases(self):
+        engine = FastCommandEngine(overrides={"time": ["clock check"]})
+        self.assertEqual(engine.match("clock check")["action"], "time")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from src.utils.feeds import Headline, dedupe, normalize_title, parse_feed, shingles, similarity
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example News</title>
+<item><title>Storm hits coast - Daily Planet</title><link>https://a/1</link>
+<pubDate>Mon, 19 Oct 2026 08:00:00 GMT</pubDate><source url="https://dp">Daily Planet</source></item>
+<item><title>Markets rally</title><link>https://a/2</link><pubDate>Mon, 19 Oct 2026 09:00:00 GMT</pubDate></item>
+<item><link>https://a/3</link></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom Feed</title>
+<entry><title>New chip announced</title><link rel="alternate" href="https://b/1"/>
+<link rel="related" href="https://b/other"/><updated>2026-10-19T10:00:00Z</updated></entry>
+</feed>"""
+
+
+class TestParseFeed(unittest.TestCase):
+
+    def test_rss(self):
+        items = parse_feed(RSS, topic="world")
+        self.assertEqual([h.title for h in items], ["Storm hits coast - Daily Planet", "Markets rally"])
+        self.assertEqual((items[0].link, items[0].source, items[0].topic), ("https://a/1", "Daily Planet", "world"))
+        self.assertEqual(items[1].source, "Example News")
+        self.assertGreater(items[1].published, items[0].published)
+
+    def test_atom(self):
+        [item] = parse_feed(ATOM)
+        self.assertEqual((item.title, item.link, item.source), ("New chip announced", "https://b/1", "Atom Feed"))
+        self.assertIsNotNone(item.published)
+
+    def test_chunks_and_max_items(self):
+        chunks = [RSS[i:i + 7] for i in range(0, len(RSS), 7)]
+        self.assertEqual(len(parse_feed(chunks, max_items=1)), 1)
+        self.assertEqual(len(parse_feed(chunks)), 2)
+
+
+class TestDedupe(unittest.TestCase):
+
+    def test_normalize_title(self):
+        self.assertEqual(normalize_title("Storm Hits Coast! - Daily Planet"), "storm hits coast")
+
+    def test_near_duplicates_removed(self):
+        items = [Headline(title, "", None, None) for title in (
+            "Storm hits coast, thousands evacuated - Daily Planet",
+            "Storm hits coast; thousands evacuated - Gazette",
+            "Storm hits the coast, thousands evacuated",
+            "Markets rally on rate cut hopes",
+        )]
+        kept = dedupe(items)
+        self.assertEqual([h.title for h in kept], [items[0].title, items[3].title])
+
+    def test_similarity_bounds(self):
+        a = shingles("central bank holds rates")
+        self.assertEqual(similarity(a, a), 1.0)
+        self.assertLess(similarity(a, shingles("football final tonight")), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from src.utils.fetch_race import fetch_all
+
+
+def fake_fetch(delays):
+    """fetch() that sleeps per URL in small steps, honouring cancel, and fails on "bad" URLs."""
+    def fetch(url, timeout, cancel):
+        deadline = time.monotonic() + delays[url]
+        while time.monotonic() < deadline:
+            if cancel.is_set():
+                raise RuntimeError("cancelled")
+            time.sleep(0.005)
+        if url.startswith("bad"):
+            raise ConnectionError("refused")
+        return f"text of {url}"
+    return fetch
+
+
+class InlineExecutor(Executor):
+    """Runs each task at submit time."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class TestFetchAll(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True)
+
+    def test_deadline_cancels_stragglers(self):
+        delays = {"fast": 0.01, "bad": 0.01, "slow": 2.0, "queued": 0.01}
+        start = time.monotonic()
+        values, trace = fetch_all(self.pool, fake_fetch(delays), list(delays), deadline=0.3,
+                                  min_results=4, max_timeout=5)
+        self.assertLess(time.monotonic() - start, 1.0)
+        statuses = {entry["url"]: entry["status"] for entry in trace}
+        self.assertEqual(statuses["fast"], "ok")
+        self.assertEqual(statuses["bad"], "failed")
+        self.assertEqual(statuses["slow"], "timeout")
+        self.assertEqual(values[0], "text of fast")
+        self.assertIn("refused", trace[1]["error"])
+
+    def test_min_results_stop_reports_finished_fetches_truthfully(self):
+        # Every fetch has finished before the first result is looked at
+        values, trace = fetch_all(InlineExecutor(), lambda url, timeout, cancel: f"text of {url}",
+                                  ["first", "second"], deadline=2, min_results=1, max_timeout=5)
+        self.assertEqual([entry["status"] for entry in trace], ["ok", "ok"])
+        self.assertEqual(values, ["text of first", "text of second"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import itertools
+import threading
+import unittest
+from src.utils.html_extract import extract_text, sniff_encoding
+
+PAGE = (
+    b'<html><head><meta charset="utf-8"><title>Title</title>'
+    b'<style>p { color: red }</style><script>var s = "<p>not text</p>";</script></head>'
+    b'<body><div>Caf\xc3\xa9 <b>bold</b>   text</div><p>One &amp; two</p>'
+    b'<svg><text>hidden</text></svg><ul><li>first</li><li>second</li></ul></body></html>'
+)
+
+
+def chunked(data, size=7):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class TestExtractText(unittest.TestCase):
+
+    def test_skips_script_style_and_svg(self):
+        result = extract_text(chunked(PAGE), prefer_lxml=False)
+        self.assertEqual(result.text, "Title\nCafé bold text\nOne & two\nfirst\nsecond")
+        self.assertFalse(result.truncated)
+        self.assertEqual(result.bytes_read, len(PAGE))
+
+    def test_multibyte_characters_split_across_chunks(self):
+        result = extract_text(chunked(PAGE, 1), prefer_lxml=False)
+        self.assertIn("Café", result.text)
+
+    def test_character_budget_stops_reading(self):
+        endless = (b"<p>" + b"word " * 100 + b"</p>" for _ in itertools.count())
+        result = extract_text(endless, max_chars=1000, prefer_lxml=False)
+        self.assertTrue(result.truncated)
+        self.assertTrue(result.text.endswith("..."))
+        self.assertLessEqual(len(result.text), 1000 + len("..."))
+        self.assertLess(result.bytes_read, 5000)
+
+    def test_byte_budget_stops_reading(self):
+        result = extract_text(chunked(PAGE), max_bytes=120, prefer_lxml=False)
+        self.assertTrue(result.truncated)
+        self.assertEqual(result.bytes_read, 120)
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        result = extract_text(chunked(PAGE), cancel=cancel, prefer_lxml=False)
+        self.assertEqual((result.text, result.bytes_read, result.truncated), ("", 0, True))
+
+    def test_sniff_encoding(self):
+        self.assertEqual(sniff_encoding(b'<meta charset="ISO-8859-1">'), "iso8859-1")
+        self.assertEqual(sniff_encoding(b"<html>"), "utf-8")
+
+
+if __name__ == '__main__':
+    unittest.main()
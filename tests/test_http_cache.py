@@ -0,0 +1,188 @@
+import importlib.util
+import io
+import os
+import tempfile
+import time
+import unittest
+from email.utils import formatdate
+from src.utils.http_cache import (CachedSession, HTTPCacheStore, freshness_lifetime, is_storable,
+                                  parse_cache_control)
+
+
+class TestCachePolicy(unittest.TestCase):
+
+    def test_parse_cache_control(self):
+        self.assertEqual(parse_cache_control('max-age=60, No-Cache, private="x"'),
+                         {"max-age": "60", "no-cache": None, "private": "x"})
+
+    def test_freshness_from_max_age_and_expires(self):
+        now = time.time()
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=120"}, now), 120)
+        headers = {"Date": formatdate(now, usegmt=True), "Expires": formatdate(now + 300, usegmt=True)}
+        self.assertAlmostEqual(freshness_lifetime(headers, now), 300, delta=1)
+        self.assertEqual(freshness_lifetime({"Cache-Control": "max-age=60, no-cache"}, now), 0)
+        self.assertEqual(freshness_lifetime({"Expires": "0"}, now), 0)
+
+    def test_heuristic_freshness_from_last_modified(self):
+        now = time.time()
+        headers = {"Date": formatdate(now, usegmt=True), "Last-Modified": formatdate(now - 1000, usegmt=True)}
+        self.assertAlmostEqual(freshness_lifetime(headers, now), 100, delta=1)
+
+    def test_storable(self):
+        self.assertTrue(is_storable(200, {"ETag": '"a"'}))
+        self.assertFalse(is_storable(200, {"Cache-Control": "no-store"}))
+        self.assertFalse(is_storable(200, {}, {"Cache-Control": "no-store"}))
+        self.assertFalse(is_storable(500, {}))
+        self.assertFalse(is_storable(200, {"Vary": "*"}))
+
+
+class TestHTTPCacheStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "http.db")
+        self.store = HTTPCacheStore(self.path, max_bytes=1000, memory_entries=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_round_trip_survives_reopen(self):
+        self.store.put("https://a", 200, {"ETag": '"1"'}, b"body", time.time() + 60)
+        self.store.close()
+        store = HTTPCacheStore(self.path)
+        entry = store.get("https://a")
+        self.assertEqual((entry["status"], entry["body"], entry["headers"]["ETag"]), (200, b"body", '"1"'))
+        store.close()
+
+    def test_refresh_merges_headers_and_extends_expiry(self):
+        self.store.put("https://a", 200, {"ETag": '"1"', "X": "old"}, b"body", 0)
+        self.store.refresh("https://a", {"X": "new"}, 12345)
+        entry = self.store.get("https://a")
+        self.assertEqual((entry["headers"]["X"], entry["headers"]["ETag"], entry["expires_at"]), ("new", '"1"', 12345))
+
+    def test_evicts_least_recently_used(self):
+        for key in ("a", "b", "c"):
+            self.store.put(key, 200, {}, b"x" * 300, 0)
+        self.store.get("a")
+        self.store.put("d", 200, {}, b"x" * 300, 0)
+        self.assertLessEqual(self.store.size(), 1000)
+        self.assertIsNotNone(self.store.get("a"))
+        self.assertIsNone(self.store.get("b"))
+        self.assertGreater(self.store.stats["evictions"], 0)
+
+    def test_oversized_responses_are_not_stored(self):
+        store = HTTPCacheStore(self.path, max_entry_bytes=10)
+        self.assertFalse(store.put("big", 200, {}, b"x" * 11, 0))
+        store.close()
+
+
+class CountingRaw(io.BytesIO):
+    """Body stream that remembers how much was read."""
+
+    def __init__(self, body):
+        super().__init__(body)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class StubSession:
+    """Serves canned responses and records request headers."""
+
+    def __init__(self, body=b"<html>page</html>", etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, stream=False, **kwargs):
+        import requests
+        self.requests.append(dict(headers or {}))
+        response = requests.models.Response()
+        response.url = url
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response.headers = requests.structures.CaseInsensitiveDict({"ETag": self.etag})
+            response.raw = io.BytesIO(b"")
+        else:
+            response.status_code = 200
+            response.headers = requests.structures.CaseInsensitiveDict(
+                {"ETag": self.etag, "Cache-Control": "no-cache", "Content-Length": str(len(self.body))})
+            response.raw = self.raw = CountingRaw(self.body)
+        return response
+
+    def close(self):
+        pass
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "requests not installed")
+class TestCachedSession(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stub = StubSession()
+        self.session = CachedSession(HTTPCacheStore(os.path.join(self.tmp.name, "http.db")), session=self.stub)
+
+    def tearDown(self):
+        self.session.close()
+        self.tmp.cleanup()
+
+    def test_stores_then_revalidates(self):
+        first = self.session.get("https://example.com/page")
+        self.assertEqual(first.content, self.stub.body)
+        self.assertEqual(len(self.session.store), 1)
+
+        second = self.session.get("https://example.com/page")
+        self.assertEqual(self.stub.requests[-1]["If-None-Match"], '"v1"')
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.content, self.stub.body)
+        self.assertEqual(self.session.stats["not_modified"], 1)
+
+    def test_streamed_body_is_stored_and_replayed(self):
+        response = self.session.get("https://example.com/page", stream=True)
+        self.assertEqual(b"".join(response.iter_content(4)), self.stub.body)
+        response.close()
+        self.assertEqual(self.session.stats["streams_stored"], 1)
+
+        cached = self.session.get("https://example.com/page", stream=True)
+        self.assertEqual(self.session.stats["not_modified"], 1)
+        self.assertEqual(b"".join(cached.iter_content(4)), self.stub.body)
+        cached.close()
+
+    def test_stream_closed_early_is_finished_in_background(self):
+        response = self.session.get("https://example.com/page", stream=True)
+        next(response.iter_content(4))
+        response.close()
+        self.session._drain_pool.shutdown(wait=True)
+        self.assertEqual(self.session.store.get("https://example.com/page")["body"], self.stub.body)
+
+    def test_early_close_of_large_stream_reads_no_further(self):
+        self.stub.body = b"x" * 200_000
+        response = self.session.get("https://example.com/big", stream=True)
+        next(response.iter_content(4096))
+        response.close()
+        if self.session._drain_pool is not None:
+            self.session._drain_pool.shutdown(wait=True)
+        self.assertEqual(self.stub.raw.bytes_read, 4096)
+        self.assertEqual(len(self.session.store), 0)
+
+    def test_no_store_request_bypasses_cache(self):
+        response = self.session.get("https://example.com/file", headers={"Cache-Control": "no-store"}, stream=True)
+        self.assertEqual(b"".join(response.iter_content(4)), self.stub.body)
+        response.close()
+        self.assertEqual(len(self.session.store), 0)
+        self.assertEqual(self.session.store.stats["misses"], 0)
+
+    def test_oversized_stream_is_not_stored(self):
+        self.session.store.max_entry_bytes = 8
+        response = self.session.get("https://example.com/page", stream=True)
+        self.assertEqual(b"".join(response.iter_content(4)), self.stub.body)
+        response.close()
+        self.assertEqual(len(self.session.store), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import threading
+import time
+import unittest
+from src.llm.intent import KeywordIntentClassifier, HedgedIntentResolver
+
+
+class SlowLLM:
+    """Stand-in for LocalLLM that answers after a fixed delay unless cancelled."""
+
+    def __init__(self, delay, answer=None):
+        self.delay = delay
+        self.answer = answer or {"intent": "general", "action": "chat", "parameters": {}, "needs_permission": False}
+        self.cancelled = threading.Event()
+
+    def extract_intent(self, command, timeout=None, cancel_event=None):
+        deadline = time.monotonic() + self.delay
+        while time.monotonic() < deadline:
+            if cancel_event is not None and cancel_event.is_set():
+                self.cancelled.set()
+                return {"intent": "general", "action": "cancelled", "cancelled": True}
+            time.sleep(0.005)
+        return dict(self.answer)
+
+
+class TestKeywordIntentClassifier(unittest.TestCase):
+
+    def setUp(self):
+        self.classifier = KeywordIntentClassifier()
+
+    def test_confident_match_with_parameters(self):
+        result = self.classifier.classify("what's the weather in Paris")
+        self.assertEqual(result["intent"], "weather")
+        self.assertEqual(result["parameters"]["location"], "paris")
+        self.assertGreaterEqual(result["confidence"], 0.85)
+
+    def test_convert_needs_a_quantity(self):
+        self.assertEqual(self.classifier.classify("convert 5 miles to km")["action"], "convert")
+        self.assertEqual(self.classifier.classify("convert this pdf to word")["intent"], "general")
+
+    def test_unit_free_commands_are_not_confident_conversions(self):
+        for command in ("send one email to john", "move 3 files to documents",
+                        "translate one sentence to french", "text 2 people in slack"):
+            result = self.classifier.classify(command)
+            self.assertFalse(result["action"] == "convert" and result["confidence"] >= 0.85, command)
+
+    def test_convert_validator_drops_non_conversions(self):
+        classifier = KeywordIntentClassifier(validators={"convert": lambda text: "miles" in text})
+        self.assertEqual(classifier.classify("5 km to miles")["action"], "convert")
+        self.assertNotEqual(classifier.classify("move 3 files to documents")["action"], "convert")
+
+    def test_unknown_command_has_zero_confidence(self):
+        result = self.classifier.classify("tell me a story about dragons")
+        self.assertEqual(result["intent"], "general")
+        self.assertEqual(result["confidence"], 0.0)
+
+
+class TestHedgedIntentResolver(unittest.TestCase):
+
+    def test_confident_local_answer_skips_llm(self):
+        llm = SlowLLM(delay=1.0)
+        resolver = HedgedIntentResolver(llm, budget_ms=500)
+        result = resolver.resolve("set a timer for 5 minutes")
+        self.assertEqual(result["source"], "local")
+        self.assertEqual(resolver.stats["local_wins"], 1)
+        resolver.shutdown()
+
+    def test_timeout_is_reported_and_llm_cancelled(self):
+        llm = SlowLLM(delay=1.0)
+        resolver = HedgedIntentResolver(llm, budget_ms=100)
+        result = resolver.resolve("tell me a story about dragons")
+        self.assertTrue(result["timed_out"])
+        self.assertEqual(resolver.stats["timeouts"], 1)
+        self.assertTrue(llm.cancelled.wait(1.0))
+        resolver.shutdown()
+
+    def test_fast_llm_answer_wins(self):
+        answer = {"intent": "search", "action": "search_web", "parameters": {"query": "dragons"}, "needs_permission": False}
+        resolver = HedgedIntentResolver(SlowLLM(delay=0.01, answer=answer), budget_ms=500)
+        result = resolver.resolve("tell me a story about dragons")
+        self.assertEqual(result["source"], "llm")
+        self.assertEqual(result["intent"], "search")
+        resolver.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
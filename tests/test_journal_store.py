@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from src.utils.journal_store import JournalStore
+
+
+class TestJournalStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "timers")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_records_survive_reopen(self):
+        store = JournalStore(self.path, flush_interval=0.01)
+        store.put("1", {"id": 1, "label": "tea"})
+        store.put("2", {"id": 2, "label": "laundry"})
+        store.delete("1")
+        store.close()
+
+        reopened = JournalStore(self.path)
+        self.assertEqual(reopened.all(), {"2": {"id": 2, "label": "laundry"}})
+        reopened.close()
+
+    def test_writes_are_batched_and_compacted(self):
+        store = JournalStore(self.path, flush_interval=0.05, compact_after=10)
+        for i in range(25):
+            store.put(str(i % 5), {"n": i})
+        store.close()
+        self.assertLess(store.stats["fsyncs"], 25)
+        self.assertGreaterEqual(store.stats["compactions"], 1)
+
+        reopened = JournalStore(self.path)
+        self.assertEqual(reopened.get("4"), {"n": 24})
+        self.assertEqual(len(reopened.all()), 5)
+        reopened.close()
+
+    def test_unserializable_value_does_not_stop_the_writer(self):
+        store = JournalStore(self.path, flush_interval=0.01)
+        store.put("bad", {"when": object()})
+        store.put("good", {"ok": True})
+        self.assertTrue(store.flush(timeout=2))
+        store.put("later", {"ok": True})
+        store.close()
+
+        reopened = JournalStore(self.path)
+        self.assertEqual(sorted(reopened.all()), ["good", "later"])
+        reopened.close()
+
+    def test_torn_tail_is_ignored(self):
+        store = JournalStore(self.path, flush_interval=0.01)
+        store.put("a", {"ok": True})
+        store.close()
+        with open(self.path + ".journal", "a") as f:
+            f.write('{"op": "put", "key": "b", "val')
+
+        reopened = JournalStore(self.path, flush_interval=0.01)
+        self.assertEqual(list(reopened.all()), ["a"])
+        reopened.put("b", {"ok": True})
+        reopened.put("c", {"ok": True})
+        reopened.close()
+
+        again = JournalStore(self.path)
+        self.assertEqual(sorted(again.all()), ["a", "b", "c"])
+        again.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import time
+import unittest
+from src.capabilities.launch_cache import LaunchCache, build_argv
+
+
+class TestLaunchCache(unittest.TestCase):
+
+    def test_hit_skips_lookup_and_frecency_orders_entries(self):
+        cache = LaunchCache()
+        python = [sys.executable]
+        cache.record("python", "python", sys.executable, python)
+        cache.record("old tool", "tool", sys.executable, python, count=5, last=time.time() - 120 * 86400)
+        cache.record("python", "python", sys.executable, python)
+
+        self.assertEqual(cache.get("Python")["argv"], python)
+        self.assertIsNone(cache.get("unknown"))
+        self.assertEqual([e["name"] for e in cache.top()], ["python", "old tool"])
+
+    def test_capacity_evicts_coldest(self):
+        cache = LaunchCache(capacity=2)
+        cache.record("a", "a", "a", ["a"], count=3)
+        cache.record("b", "b", "b", ["b"], count=1, last=time.time() - 60 * 86400)
+        cache.record("c", "c", "c", ["c"])
+        self.assertEqual(set(cache.entries), {"a", "c"})
+
+    def test_validation_drops_missing_targets(self):
+        cache = LaunchCache(revalidate_after=0)
+        cache.record("gone", "gone", "/no/such/app", ["/no/such/app"])
+        self.assertEqual(cache.validate_top(), 0)
+        self.assertIsNone(cache.get("gone"))
+
+    def test_build_argv(self):
+        self.assertEqual(build_argv("ms-settings:", "Windows"), ["cmd", "/c", "start", "", "ms-settings:"])
+        self.assertEqual(build_argv("C:/Apps/app.exe", "Windows"), ["C:/Apps/app.exe"])
+        self.assertEqual(build_argv("gimp-2.10 --new-instance", "Linux"), ["gimp-2.10", "--new-instance"])
+
+
+if __name__ == '__main__':
+    unittest.main()
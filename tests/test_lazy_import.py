@@ -0,0 +1,56 @@
+import os
+import re
+import sys
+import unittest
+from src.utils.lazy_import import lazy_import, is_available
+from src.utils.startup_profiler import SRC_DIR, STARTUP_MODULES, parse_importtime, format_tree
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_import_deferred_until_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        loaded = []
+        module = lazy_import("colorsys", on_load=lambda m: loaded.append(m.__name__))
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertFalse(module.is_loaded)
+        self.assertEqual(module.rgb_to_hsv(1, 0, 0)[0], 0.0)
+        self.assertTrue(module.is_loaded)
+        self.assertEqual(loaded, ["colorsys"])
+
+    def test_missing_module_fails_on_use_only(self):
+        module = lazy_import("jarvis_no_such_module")
+        self.assertFalse(is_available("jarvis_no_such_module"))
+        with self.assertRaises(ImportError):
+            module.anything
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_parse_importtime_builds_tree(self):
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     leaf",
+            "import time:       200 |        300 |   child",
+            "import time:       500 |        800 | root",
+            "import time:        50 |         50 | other",
+        ])
+        roots = parse_importtime(output)
+        self.assertEqual([node.name for node in roots], ["root", "other"])
+        self.assertEqual(roots[0].children[0].name, "child")
+        self.assertEqual(roots[0].children[0].children[0].name, "leaf")
+        lines = format_tree(roots, min_ms=0.2)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("root"))
+
+    def test_every_registered_capability_is_profiled(self):
+        with open(os.path.join(SRC_DIR, "assistant", "core.py")) as f:
+            registered = re.findall(r'register\("\w+", "([\w.]+)"', f.read())
+        self.assertTrue(registered)
+        self.assertEqual(sorted(set(registered) - set(STARTUP_MODULES)), [])
+        for name in STARTUP_MODULES:
+            self.assertTrue(os.path.exists(os.path.join(SRC_DIR, *name.split(".")) + ".py"), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
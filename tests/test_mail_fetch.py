@@ -0,0 +1,91 @@
+import base64
+import unittest
+from src.capabilities.mail_fetch import (IMAPError, fetch_recent, latest_uid, parse_fetch, parse_status,
+                                         summarize_message)
+
+
+def header(sender, subject, extra=b""):
+    return (b"From: " + sender + b"\r\nSubject: " + subject + b"\r\nDate: Mon, 19 Oct 2026 08:00:00 +0000\r\n"
+            + extra + b"\r\n")
+
+
+class FakeIMAP:
+    """Answers UID FETCH for a set of UIDs the way imaplib returns it."""
+
+    def __init__(self, uids, seen=()):
+        self.uids = uids
+        self.seen = set(seen)
+        self.commands = []
+
+    def status(self, mailbox, items):
+        self.commands.append(("STATUS", mailbox))
+        return "OK", [b'"INBOX" (MESSAGES %d UIDNEXT %d UIDVALIDITY 7 UNSEEN 2)' % (len(self.uids), max(self.uids) + 1)]
+
+    def uid(self, command, message_set, query):
+        self.commands.append((command, message_set))
+        if message_set == "*":
+            return "OK", [b"%d (UID %d)" % (len(self.uids), max(self.uids))]
+        low, high = (int(x) for x in message_set.split(":"))
+        data = []
+        for seq, uid in enumerate(self.uids, 1):
+            if low <= uid <= high:
+                flags = b"\\Seen" if uid in self.seen else b""
+                data.append((b"%d (UID %d FLAGS (%s) BODY[HEADER.FIELDS (FROM SUBJECT DATE)] {10}" % (seq, uid, flags),
+                             header(b"a@example.com", b"Message %d" % uid)))
+                data.append((b" BODY[TEXT]<0> {5}", b"Body of %d" % uid))
+                data.append(b")")
+        return "OK", data or [None]
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_parse_status(self):
+        self.assertEqual(parse_status([b'INBOX (MESSAGES 231 UIDNEXT 44292 UNSEEN 3)']),
+                         {"messages": 231, "uidnext": 44292, "unseen": 3})
+
+    def test_parse_fetch_uid_after_literal(self):
+        data = [(b"1 (FLAGS (\\Seen) BODY[HEADER.FIELDS (SUBJECT)] {12}", b"Subject: x\r\n"), b" UID 42)"]
+        self.assertEqual(parse_fetch(data), {42: {"header": b"Subject: x\r\n", "text": b"", "flags": ["\\Seen"]}})
+
+    def test_summarize_truncated_multipart_base64(self):
+        body = base64.encodebytes(("Hello there, " * 40).encode())
+        text = (b"--b\r\nContent-Type: text/plain; charset=utf-8\r\nContent-Transfer-Encoding: base64\r\n\r\n"
+                + body)[:300]
+        summary = summarize_message(
+            header(b"=?utf-8?q?J=C3=BCrgen?= <j@example.com>", b"Hi",
+                   b'Content-Type: multipart/alternative; boundary="b"\r\n'), text)
+        self.assertEqual(summary["from"], "Jürgen <j@example.com>")
+        self.assertTrue(summary["preview"].startswith("Hello there, Hello there"))
+
+
+class TestFetchRecent(unittest.TestCase):
+
+    def test_one_batched_fetch_for_dense_uids(self):
+        imap = FakeIMAP(list(range(1, 50001)), seen={50000})
+        emails = fetch_recent(imap, 50001, limit=5)
+        self.assertEqual([e["uid"] for e in emails], [50000, 49999, 49998, 49997, 49996])
+        self.assertEqual(emails[0]["subject"], "Message 50000")
+        self.assertEqual(emails[0]["preview"], "Body of 50000")
+        self.assertEqual((emails[0]["unread"], emails[1]["unread"]), (False, True))
+        self.assertEqual(imap.commands, [("FETCH", "49991:50000")])
+
+    def test_window_widens_over_gaps(self):
+        imap = FakeIMAP([3, 5, 100, 900])
+        emails = fetch_recent(imap, 1000, limit=3)
+        self.assertEqual([e["uid"] for e in emails], [900, 100, 5])
+        self.assertGreater(len(imap.commands), 1)
+
+    def test_stops_at_uid_one(self):
+        imap = FakeIMAP([1, 2])
+        self.assertEqual(len(fetch_recent(imap, 3, limit=5)), 2)
+        self.assertEqual(latest_uid(imap), 2)
+
+    def test_fetch_failure(self):
+        imap = FakeIMAP([1])
+        imap.uid = lambda *args: ("NO", [b"nope"])
+        with self.assertRaises(IMAPError):
+            fetch_recent(imap, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import smtplib
+import threading
+import time
+import unittest
+from src.capabilities.mail_outbox import Outbox
+
+
+class FakeStore:
+
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+
+    def all(self):
+        return dict(self.records)
+
+    def put(self, key, value):
+        self.records[key] = value
+
+    def delete(self, key):
+        self.records.pop(key, None)
+
+    def close(self):
+        pass
+
+
+class FakeSMTP:
+
+    def __init__(self, server):
+        self.server = server
+        self.open = True
+
+    def sendmail(self, sender, recipients, raw):
+        if not self.open:
+            raise smtplib.SMTPServerDisconnected("closed")
+        error = self.server.errors.pop(0) if self.server.errors else None
+        if error:
+            raise error
+        self.server.sent.append((sender, tuple(recipients), raw))
+        return {}
+
+    def quit(self):
+        self.open = False
+
+
+class FakeServer:
+
+    def __init__(self):
+        self.sent = []
+        self.errors = []
+        self.connections = []
+        self.connect_errors = []
+
+    def connect(self):
+        if self.connect_errors:
+            raise self.connect_errors.pop(0)
+        conn = FakeSMTP(self)
+        self.connections.append(conn)
+        return conn
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeServer()
+        self.store = FakeStore()
+        self.failed = []
+
+    def make(self, **kwargs):
+        options = dict(keepalive=5, base_delay=0.05, max_delay=0.2, on_failed=self.failed.append)
+        options.update(kwargs)
+        outbox = Outbox(self.server.connect, self.store, **options)
+        self.addCleanup(outbox.close)
+        return outbox
+
+    def wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("condition not met")
+            time.sleep(0.01)
+
+    def test_burst_shares_one_connection(self):
+        outbox = self.make()
+        for i in range(5):
+            outbox.enqueue("me@x", [f"user{i}@x"], f"message {i}")
+        outbox.start()
+        self.wait_for(lambda: len(self.server.sent) == 5)
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual([raw for _, _, raw in self.server.sent], [f"message {i}" for i in range(5)])
+        self.assertEqual(self.store.records, {})
+        self.assertEqual(outbox.report()["pending"], 0)
+
+    def test_enqueue_returns_before_send(self):
+        gate = threading.Event()
+        self.server.connect = lambda: (gate.wait(5), FakeSMTP(self.server))[1]
+        outbox = self.make()
+        outbox.start()
+        start = time.monotonic()
+        outbox.enqueue("me@x", ["a@x"], "hello")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertEqual(len(self.store.records), 1)
+        gate.set()
+        self.wait_for(lambda: self.server.sent)
+
+    def test_idle_connection_closed_after_keepalive(self):
+        outbox = self.make(keepalive=0.1)
+        outbox.start()
+        outbox.enqueue("me@x", ["a@x"], "one")
+        self.wait_for(lambda: self.server.sent)
+        self.wait_for(lambda: not outbox.report()["connected"])
+        self.assertFalse(self.server.connections[0].open)
+
+    def test_reconnects_when_server_dropped_idle_session(self):
+        outbox = self.make()
+        outbox.start()
+        outbox.enqueue("me@x", ["a@x"], "one")
+        self.wait_for(lambda: len(self.server.sent) == 1)
+        self.server.connections[0].open = False
+        outbox.enqueue("me@x", ["a@x"], "two")
+        self.wait_for(lambda: len(self.server.sent) == 2)
+        self.assertEqual(len(self.server.connections), 2)
+        self.assertEqual(outbox.report()["retries"], 0)
+
+    def test_transient_failure_retried_with_backoff(self):
+        self.server.connect_errors = [OSError("network down")]
+        self.server.errors = [smtplib.SMTPDataError(451, b"try later")]
+        outbox = self.make()
+        outbox.start()
+        outbox.enqueue("me@x", ["a@x"], "retry me")
+        self.wait_for(lambda: self.server.sent)
+        self.assertEqual(outbox.report()["retries"], 2)
+        self.assertEqual(self.failed, [])
+
+    def test_permanent_failure_given_up(self):
+        self.server.errors = [smtplib.SMTPRecipientsRefused({"bad@x": (550, b"no such user")})]
+        outbox = self.make()
+        outbox.start()
+        outbox.enqueue("me@x", ["bad@x"], "nope", description="to bad@x")
+        self.wait_for(lambda: self.failed)
+        self.assertEqual(self.failed[0]["description"], "to bad@x")
+        self.assertTrue(next(iter(self.store.records.values()))["failed"])
+        self.assertEqual(outbox.pending(), [])
+
+    def test_gives_up_after_max_attempts(self):
+        self.server.connect_errors = [OSError("down")] * 3
+        outbox = self.make(max_attempts=3)
+        outbox.start()
+        outbox.enqueue("me@x", ["a@x"], "lost")
+        self.wait_for(lambda: self.failed)
+        self.assertEqual(self.failed[0]["attempts"], 3)
+
+    def test_spool_survives_restart(self):
+        outbox = self.make()
+        outbox.enqueue("me@x", ["a@x"], "from last run")
+        outbox.close()
+        self.assertEqual(len(self.store.records), 1)
+
+        restarted = self.make()
+        restarted.start()
+        self.wait_for(lambda: self.server.sent)
+        self.assertEqual(self.server.sent[0][2], "from last run")
+        self.assertTrue(restarted.flush(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import socket
+import threading
+import time
+import unittest
+from src.capabilities.mail_session import HeaderCache, MailSession
+
+
+class FakeIMAPServer:
+    """Mailbox state plus an imaplib-like connection speaking IDLE over a socketpair."""
+
+    def __init__(self, uids, uidvalidity=1):
+        self.uids = list(uids)
+        self.seen = set()
+        self.uidvalidity = uidvalidity
+        self.commands = []
+        self.idle_extra = b""  # Sent in the same packet as the IDLE continuation
+        self.status_uidnext = True
+        self.lock = threading.Lock()
+
+    def deliver(self, uid):
+        with self.lock:
+            self.uids.append(uid)
+        self.conn.push(b"* %d EXISTS\r\n" % len(self.uids))
+
+    def connect(self):
+        self.conn = FakeConnection(self)
+        return self.conn
+
+
+class FakeConnection:
+    capabilities = ("IMAP4REV1", "IDLE")
+
+    def __init__(self, server):
+        self.server = server
+        self.sock, self.peer = socket.socketpair()
+        self.file = self.sock.makefile("rb")
+        self.tags = 0
+
+    def push(self, line):
+        self.peer.sendall(line)
+
+    def select(self, mailbox, readonly=False):
+        return "OK", [b"%d" % len(self.server.uids)]
+
+    def status(self, mailbox, items):
+        s = self.server
+        with s.lock:
+            unseen = len([uid for uid in s.uids if uid not in s.seen])
+            uidnext = b" UIDNEXT %d" % (max(s.uids) + 1) if s.status_uidnext else b""
+            return "OK", [b'"INBOX" (MESSAGES %d%s UIDVALIDITY %d UNSEEN %d)'
+                          % (len(s.uids), uidnext, s.uidvalidity, unseen)]
+
+    def uid(self, command, message_set, query):
+        s = self.server
+        s.commands.append(message_set)
+        low, _, high = message_set.partition(":")
+        if low == "*":
+            low = high = str(max(s.uids))
+        with s.lock:
+            uids = list(s.uids)
+        high = max(uids) if high == "*" else int(high)
+        low = min(int(low), max(uids))  # "n:*" always includes the newest message
+        data = []
+        for seq, uid in enumerate(uids, 1):
+            if low <= uid <= high:
+                flags = b"\\Seen" if uid in s.seen else b""
+                if "HEADER" in query:
+                    data.append((b"%d (UID %d FLAGS (%s) BODY[HEADER.FIELDS (FROM SUBJECT)] {1}" % (seq, uid, flags),
+                                 b"From: a@example.com\r\nSubject: Message %d\r\n\r\n" % uid))
+                    data.append((b" BODY[TEXT]<0> {1}", b"Body %d" % uid))
+                    data.append(b")")
+                else:
+                    data.append(b"%d (UID %d FLAGS (%s))" % (seq, uid, flags))
+        return "OK", data or [None]
+
+    def noop(self):
+        return "OK", [b""]
+
+    def _new_tag(self):
+        self.tags += 1
+        return b"T%d" % self.tags
+
+    def send(self, data):
+        if data.endswith(b" IDLE\r\n"):
+            self.idle_tag = data.split()[0]
+            self.push(b"+ idling\r\n" + self.server.idle_extra)
+        elif data == b"DONE\r\n":
+            self.push(self.idle_tag + b" OK IDLE terminated\r\n")
+
+    def readline(self):
+        return self.file.readline()
+
+    def socket(self):
+        return self.sock
+
+    def logout(self):
+        self.file.close()
+        self.sock.close()
+        self.peer.close()
+
+
+class TestHeaderCache(unittest.TestCase):
+
+    def test_keeps_newest(self):
+        cache = HeaderCache(size=3)
+        cache.add({uid: {"uid": uid} for uid in range(1, 6)})
+        self.assertEqual([m["uid"] for m in cache.recent(10)], [5, 4, 3])
+
+
+class TestMailSessionSync(unittest.TestCase):
+
+    def test_incremental_sync(self):
+        server = FakeIMAPServer(range(1, 1001))
+        session = MailSession(server.connect, cache_size=5)
+        conn = server.connect()
+        session.sync(conn)
+        self.assertEqual([m["uid"] for m in session.recent(5)], [1000, 999, 998, 997, 996])
+        self.assertEqual(session.unseen_count(), 1000)
+
+        server.uids += [1001, 1002]
+        server.uids.remove(999)
+        server.seen.add(1000)
+        server.commands.clear()
+        new = session.sync(conn)
+        self.assertEqual([m["uid"] for m in new], [1002, 1001])
+        self.assertEqual(server.commands, ["1001:*", "996:1000"])
+        recent = session.recent(5)
+        self.assertEqual([m["uid"] for m in recent], [1002, 1001, 1000, 998, 997])
+        self.assertFalse(recent[2]["unread"])
+
+        server.commands.clear()
+        self.assertEqual(session.sync(conn), [])
+        self.assertEqual(server.commands, ["997:1002"])
+
+    def test_status_without_uidnext_falls_back_to_latest_uid(self):
+        server = FakeIMAPServer(range(1, 21))
+        server.status_uidnext = False
+        session = MailSession(server.connect, cache_size=3)
+        conn = server.connect()
+        session.sync(conn)
+        self.assertEqual([m["uid"] for m in session.recent(5)], [20, 19, 18])
+        server.uids.append(21)
+        self.assertEqual([m["uid"] for m in session.sync(conn)], [21])
+
+    def test_uidvalidity_change_resets_cache(self):
+        server = FakeIMAPServer(range(1, 11))
+        session = MailSession(server.connect, cache_size=3)
+        conn = server.connect()
+        session.sync(conn)
+        server.uidvalidity = 2
+        server.uids = [1, 2]
+        self.assertEqual(session.sync(conn), [])
+        self.assertEqual([m["uid"] for m in session.recent(5)], [2, 1])
+
+
+class TestMailSessionIdle(unittest.TestCase):
+
+    def test_idle_push_delivers_new_mail(self):
+        server = FakeIMAPServer(range(1, 4))
+        arrived = []
+        got_mail = threading.Event()
+        session = MailSession(server.connect, cache_size=5,
+                              on_new_mail=lambda emails: (arrived.extend(emails), got_mail.set()))
+        session.start()
+        try:
+            self.assertTrue(session.wait_ready(5))
+            server.deliver(4)
+            self.assertTrue(got_mail.wait(5))
+            self.assertEqual(arrived[0]["subject"], "Message 4")
+            self.assertEqual(session.recent(1)[0]["uid"], 4)
+            self.assertEqual(session.report()["idle_wakeups"], 1)
+            self.assertTrue(session.refresh(5))
+        finally:
+            session.stop()
+        self.assertFalse(session.connected)
+
+    def test_mail_that_arrived_while_disconnected_is_announced(self):
+        server = FakeIMAPServer(range(1, 4))
+        arrived = []
+        got_mail = threading.Event()
+        session = MailSession(server.connect, cache_size=5,
+                              on_new_mail=lambda emails: (arrived.extend(emails), got_mail.set()))
+        session.start()
+        try:
+            self.assertTrue(session.wait_ready(5))
+            with server.lock:
+                server.uids.append(4)
+            server.conn.peer.close()  # Drop the connection without an EXISTS
+            self.assertTrue(got_mail.wait(5))
+            self.assertEqual([m["uid"] for m in arrived], [4])
+            self.assertEqual(session.report()["connects"], 2)
+        finally:
+            session.stop()
+
+    def test_response_buffered_with_continuation_wakes_idle(self):
+        server = FakeIMAPServer(range(1, 4))
+        server.idle_extra = b"* 4 EXISTS\r\n"
+        session = MailSession(server.connect)
+        conn = server.connect()
+        start = time.monotonic()
+        self.assertTrue(session._idle(conn, timeout=3))
+        self.assertLess(time.monotonic() - start, 1.0)
+        conn.logout()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import importlib.util
+import unittest
+from src.capabilities.math_engine import (
+    MathEngine, compile_expression, format_number, normalize, parse_number_words
+)
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_number_words(self):
+        self.assertEqual(parse_number_words("three hundred and two".split()), 302)
+        self.assertEqual(parse_number_words("five and a half".split()), 5.5)
+        self.assertEqual(parse_number_words("two point five".split()), 2.5)
+        self.assertIsNone(parse_number_words(["hello"]))
+
+    def test_operator_phrases(self):
+        self.assertEqual(normalize("what is five plus three"), "5 + 3")
+        self.assertEqual(normalize("square root of 144"), "sqrt(144)")
+        self.assertEqual(normalize("6 x 7"), "6 * 7")
+
+
+class TestMathEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = MathEngine()
+
+    def test_spoken_arithmetic(self):
+        self.assertEqual(self.engine.evaluate("five plus three")[1], 8)
+        self.assertEqual(self.engine.evaluate("three hundred and two minus two")[1], 300)
+        self.assertEqual(self.engine.evaluate("a half plus a quarter")[1], 0.75)
+        self.assertEqual(self.engine.evaluate("15 percent of 200")[1], 30)
+        self.assertEqual(self.engine.evaluate("2 to the power of 10")[1], 1024)
+
+    def test_rejects_non_math(self):
+        for text in ("__import__('os')", "open('x')", "(1).__class__", "[1, 2]"):
+            with self.assertRaises((ValueError, SyntaxError)):
+                self.engine.evaluate(text)
+
+    def test_exponent_bound(self):
+        with self.assertRaises(ValueError):
+            self.engine.evaluate("2 ** 100000")
+
+    def test_huge_result_is_spoken_in_scientific_notation(self):
+        # More digits than sys.get_int_max_str_digits() allows, fewer bits than MAX_RESULT_BITS
+        _, result = self.engine.evaluate("9 ** 9999")
+        self.assertEqual(format_number(result), "2.957003808e+9541")
+        self.assertEqual(format_number(2 ** 10), "1024")
+
+    def test_nested_power_bound(self):
+        with self.assertRaises(ValueError):
+            self.engine.evaluate("(9 ** 9999) ** 9999")
+        self.assertEqual(self.engine.evaluate("(2 ** 10) ** 2")[1], 1048576)
+
+    def test_repeat_hits_cache(self):
+        self.engine.evaluate("17 times 23")
+        hits = self.engine.cache_info().hits
+        self.engine.evaluate("seventeen times twenty three")
+        self.assertEqual(self.engine.cache_info().hits, hits + 1)
+
+    def test_constants_folded(self):
+        closure = compile_expression("2 * pi + 1")
+        self.assertAlmostEqual(closure({}), 7.283185307179586)
+
+    def test_evaluate_many_reports_errors_per_item(self):
+        results = self.engine.evaluate_many(["1 + 1", "1 / 0", "7 squared"])
+        self.assertEqual(results[0]["result"], 2)
+        self.assertIn("error", results[1])
+        self.assertEqual(results[2]["result"], 49)
+
+    def test_format_number(self):
+        self.assertEqual(format_number(12.0), "12")
+        self.assertEqual(format_number(1 / 3), "0.3333333333")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+    def test_evaluate_array(self):
+        import numpy as np
+
+        result = self.engine.evaluate_array("x squared plus 1", x=np.arange(4))
+        self.assertEqual(result.tolist(), [1, 2, 5, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
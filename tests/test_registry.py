@@ -0,0 +1,41 @@
+import unittest
+from src.assistant.registry import HandlerRegistry, PhraseMatcher, INTENT_PATTERNS
+
+
+class TestPhraseMatcher(unittest.TestCase):
+
+    def test_matches_respect_word_boundaries(self):
+        matcher = PhraseMatcher(INTENT_PATTERNS["exit"])
+        self.assertEqual(matcher.scan("maybe later"), {})
+        self.assertIn("exit", matcher.scan("ok bye"))
+
+    def test_longest_phrase_wins(self):
+        matcher = PhraseMatcher(INTENT_PATTERNS["app_automation"])
+        found = matcher.scan("type hello in notepad++")
+        self.assertIn("notepad++", found)
+        self.assertNotIn("notepad", found)
+
+    def test_phrase_under_several_labels(self):
+        found = PhraseMatcher(INTENT_PATTERNS["web_browsing"]).scan("search for python on youtube")
+        self.assertEqual(set(found), {"search", "query", "youtube"})
+        self.assertEqual(found["query"].end(), len("search for"))
+
+
+class TestHandlerRegistry(unittest.TestCase):
+
+    def test_dispatch_prefers_action_handler(self):
+        calls = []
+        registry = HandlerRegistry()
+        registry.register(
+            "media_control",
+            lambda action, params, command, matches: calls.append("intent"),
+            actions={"mute": lambda action, params, command, matches: calls.append("mute")},
+        )
+        self.assertTrue(registry.dispatch("media_control", "mute", {}, "mute"))
+        self.assertTrue(registry.dispatch("media_control", "other", {}, "other"))
+        self.assertFalse(registry.dispatch("unknown", "chat", {}, "hello"))
+        self.assertEqual(calls, ["mute", "intent"])
+
+
+if __name__ == '__main__':
+    unittest.main()
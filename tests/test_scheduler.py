@@ -0,0 +1,44 @@
+import threading
+import time
+import unittest
+from src.utils.scheduler import Scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = Scheduler(name="test-scheduler")
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_fires_in_deadline_order(self):
+        fired = []
+        done = threading.Event()
+        self.scheduler.schedule(0.06, lambda: (fired.append("late"), done.set()))
+        self.scheduler.schedule(0.02, fired.append, "early")
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, ["early", "late"])
+
+    def test_cancelled_task_never_fires(self):
+        fired = []
+        done = threading.Event()
+        task = self.scheduler.schedule(0.02, fired.append, "cancelled")
+        self.scheduler.schedule(0.05, done.set)
+        self.assertTrue(self.scheduler.cancel(task))
+        self.assertFalse(self.scheduler.cancel(task))
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, [])
+        self.assertEqual(self.scheduler.pending(), 0)
+
+    def test_thread_count_is_constant(self):
+        before = threading.active_count()
+        tasks = [self.scheduler.schedule(60, lambda: None) for _ in range(2000)]
+        self.assertLessEqual(threading.active_count() - before, 3)
+        for task in tasks:
+            self.scheduler.cancel(task)
+        self.assertEqual(self.scheduler.pending(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
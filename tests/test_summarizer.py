@@ -0,0 +1,145 @@
+import threading
+import time
+import unittest
+from src.llm.scheduler import LLMScheduler
+from src.llm.summarizer import PageSummarizer, content_hash, split_chunks
+
+
+class FakeLLM:
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+        time.sleep(self.delay)
+        return f"summary {len(self.prompts)}"
+
+
+class FakeStore:
+
+    def __init__(self):
+        self.records = {}
+
+    def all(self):
+        return dict(self.records)
+
+    def put(self, key, value):
+        self.records[key] = value
+
+    def delete(self, key):
+        self.records.pop(key, None)
+
+    def close(self):
+        pass
+
+
+class TestSplitChunks(unittest.TestCase):
+
+    def test_chunks_respect_size_and_keep_text(self):
+        text = "\n".join(f"paragraph {i} " + "word " * 50 for i in range(40))
+        chunks = split_chunks(text, 1000)
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertEqual(" ".join(" ".join(chunks).split()), " ".join(text.split()))
+
+    def test_long_line_is_split_on_words(self):
+        chunks = split_chunks("word " * 1000, 300)
+        self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+        self.assertGreater(len(chunks), 10)
+
+    def test_hash_ignores_whitespace(self):
+        self.assertEqual(content_hash("a  b\nc"), content_hash("a b c"))
+        self.assertNotEqual(content_hash("a b"), content_hash("a c"))
+
+
+class TestLLMScheduler(unittest.TestCase):
+
+    def test_map_is_bounded_and_ordered(self):
+        scheduler = LLMScheduler(max_concurrent=2)
+        results = scheduler.map(lambda x: time.sleep(0.02) or x * 2, range(6))
+        self.assertEqual(results, [0, 2, 4, 6, 8, 10])
+        self.assertEqual(scheduler.report()["peak_concurrency"], 2)
+        scheduler.shutdown()
+
+    def test_failures_yield_none(self):
+        scheduler = LLMScheduler(max_concurrent=2)
+        results = scheduler.map(lambda x: 1 / x, [1, 0])
+        self.assertEqual(results, [1.0, None])
+        self.assertEqual(scheduler.report()["failed"], 1)
+        scheduler.shutdown()
+
+
+class TestPageSummarizer(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.llm = FakeLLM()
+        self.store = FakeStore()
+        self.scheduler = LLMScheduler(max_concurrent=3)
+        self.summarizer = PageSummarizer(self.llm, self.scheduler, self.store, ttl=60, chunk_chars=500,
+                                         clock=lambda: self.now)
+        self.page = "short page text"
+        self.fetches = 0
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def fetch(self, url):
+        self.fetches += 1
+        return self.page
+
+    def test_cached_within_ttl_without_fetch(self):
+        first = self.summarizer.summarize_page("https://a", self.fetch)
+        second = self.summarizer.summarize_page("https://a", self.fetch)
+        self.assertEqual((first["source"], second["source"]), ("fresh", "cache"))
+        self.assertEqual(first["summary"], second["summary"])
+        self.assertEqual((self.fetches, len(self.llm.prompts)), (1, 1))
+
+    def test_revalidates_after_ttl(self):
+        self.summarizer.summarize_page("https://a", self.fetch)
+        self.now += 120
+        result = self.summarizer.summarize_page("https://a", self.fetch)
+        self.assertEqual(result["source"], "revalidated")
+        self.assertEqual((self.fetches, len(self.llm.prompts)), (2, 1))
+
+        self.now += 120
+        self.page = "the page changed"
+        result = self.summarizer.summarize_page("https://a", self.fetch)
+        self.assertEqual(result["source"], "fresh")
+        self.assertEqual(len(self.llm.prompts), 2)
+
+    def test_stale_summary_when_fetch_fails(self):
+        self.summarizer.summarize_page("https://a", self.fetch)
+        self.now += 120
+        result = self.summarizer.summarize_page("https://a", lambda url: None)
+        self.assertEqual((result["success"], result["source"]), (True, "stale"))
+        self.assertFalse(self.summarizer.summarize_page("https://b", lambda url: None)["success"])
+
+    def test_long_page_map_reduce(self):
+        self.llm.delay = 0.02
+        self.page = "\n".join("sentence " * 20 for _ in range(30))
+        result = self.summarizer.summarize_page("https://long", self.fetch)
+        map_prompts = [p for p in self.llm.prompts if p.startswith("Summarize this part")]
+        self.assertEqual(len(map_prompts), result["chunks"])
+        self.assertGreater(result["chunks"], 1)
+        self.assertTrue(self.llm.prompts[-1].startswith("Combine these notes"))
+        self.assertGreater(self.scheduler.report()["peak_concurrency"], 1)
+
+    def test_persists_and_reloads(self):
+        self.summarizer.summarize_page("https://a", self.fetch)
+        reloaded = PageSummarizer(self.llm, store=self.store, ttl=60, clock=lambda: self.now)
+        self.assertEqual(reloaded.summarize_page("https://a", self.fetch)["source"], "cache")
+
+    def test_bounded_entries(self):
+        self.summarizer.max_entries = 2
+        for i in range(4):
+            self.now += 1
+            self.summarizer.summarize_page(f"https://{i}", self.fetch)
+        self.assertEqual(sorted(self.store.records), ["https://2", "https://3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import threading
+import time
+import unittest
+from src.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(ttl=10, stale_ttl=20, clock=self.clock, name="test-cache")
+        self.calls = 0
+
+    def tearDown(self):
+        self.cache.close()
+
+    def loader(self):
+        self.calls += 1
+        return self.calls
+
+    def test_fresh_entries_are_served_from_memory(self):
+        self.assertEqual(self.cache.get("a", self.loader), 1)
+        self.clock.now = 9
+        self.assertEqual(self.cache.get("a", self.loader), 1)
+        self.assertEqual(self.calls, 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.cache.get("a", self.loader)
+        self.clock.now = 15
+        self.assertEqual(self.cache.get("a", self.loader), 1)
+        self.cache.refresh("a", self.loader).result(timeout=2)
+        self.assertEqual(self.cache.get("a", self.loader), 2)
+        self.assertEqual(self.cache.stats["stale_hits"], 1)
+
+    def test_expired_entry_is_reloaded(self):
+        self.cache.get("a", self.loader)
+        self.clock.now = 31
+        self.assertEqual(self.cache.get("a", self.loader), 2)
+
+    def test_concurrent_callers_share_one_load(self):
+        release = threading.Event()
+
+        def slow_loader():
+            release.wait(2)
+            return self.loader()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get("a", slow_loader)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(results, [1] * 8)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.stats["coalesced"], 7)
+
+    def test_failed_load_is_not_cached(self):
+        def failing():
+            raise ConnectionError("offline")
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get("a", failing)
+        self.assertEqual(self.cache.get("a", self.loader), 1)
+        self.assertEqual(self.cache.stats["errors"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl=10, max_entries=2, clock=self.clock)
+        cache.get("a", self.loader)
+        cache.get("b", self.loader)
+        cache.get("a", self.loader)
+        cache.get("c", self.loader)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.peek("b"))
+        self.assertEqual(cache.peek("a"), 1)
+        self.assertEqual(cache.counters()["evictions"], 1)
+
+    def test_hit_ratio(self):
+        self.cache.get("a", self.loader)
+        self.cache.get("a", self.loader)
+        self.cache.get("a", self.loader)
+        self.cache.get("b", self.loader)
+        self.assertEqual(self.cache.hit_ratio(), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
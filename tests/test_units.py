@@ -0,0 +1,70 @@
+import importlib.util
+import unittest
+from src.capabilities.units import UnitRegistry, format_quantity, get_registry
+
+
+class TestUnitRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.units = get_registry()
+
+    def test_resolve_names_symbols_and_plurals(self):
+        self.assertEqual(self.units.resolve("km").name, "kilometer")
+        self.assertEqual(self.units.resolve("Kilometres").name, "kilometer")
+        self.assertEqual(self.units.resolve("feet").name, "foot")
+        self.assertEqual(self.units.resolve("degrees celsius").name, "degree celsius")
+        self.assertEqual(self.units.resolve("MiB").name, "mebibyte")
+        self.assertIsNone(self.units.resolve("furlongs"))
+
+    def test_pairs_without_a_direct_factor(self):
+        self.assertAlmostEqual(self.units.convert(1, "mile", "cm"), 160934.4)
+        self.assertAlmostEqual(self.units.convert(1, "tablespoon", "tsp"), 3)
+        self.assertAlmostEqual(self.units.convert(1, "stone", "oz"), 224, places=3)
+        self.assertAlmostEqual(self.units.convert(1, "GiB", "MB"), 1073.741824)
+
+    def test_temperature_offsets(self):
+        self.assertAlmostEqual(self.units.convert(100, "celsius", "fahrenheit"), 212)
+        self.assertAlmostEqual(self.units.convert(32, "f", "kelvin"), 273.15)
+        self.assertAlmostEqual(self.units.convert(0, "kelvin", "c"), -273.15)
+
+    def test_dimension_mismatch(self):
+        with self.assertRaisesRegex(ValueError, "Cannot convert mass"):
+            self.units.convert(1, "kg", "miles")
+        with self.assertRaisesRegex(ValueError, "Unknown unit"):
+            self.units.convert(1, "furlong", "miles")
+
+    def test_table_covers_every_pair_in_a_dimension(self):
+        registry = UnitRegistry([
+            ("meter", "meters", "length", 1.0, 0.0, ("m",), (), ("kilo",)),
+            ("foot", "feet", "length", 0.3048, 0.0, ("ft",), (), ()),
+            ("gram", "grams", "mass", 1.0, 0.0, ("g",), (), ()),
+        ])
+        self.assertEqual(len(registry.table), 3 * 3 + 1)
+        self.assertNotIn(("meter", "gram"), registry.table)
+
+    def test_parse_spoken_quantities(self):
+        value, source, target = self.units.parse("five and a half miles in km")
+        self.assertEqual((value, source.name, target.name), (5.5, "mile", "kilometer"))
+
+        value, source, target = self.units.parse("how many feet in a mile")
+        self.assertEqual((value, source.name, target.name), (1.0, "mile", "foot"))
+
+        value, source, target = self.units.parse("convert 5 in to cm")
+        self.assertEqual((value, source.name, target.name), (5.0, "inch", "centimeter"))
+
+        self.assertIsNone(self.units.parse("open spotify in the morning"))
+
+    def test_format_quantity(self):
+        mile = self.units.resolve("mile")
+        self.assertEqual(format_quantity(1, mile), "1 mile")
+        self.assertEqual(format_quantity(5280.0, mile), "5,280 miles")
+        self.assertEqual(format_quantity(0.000123, mile), "0.000123 miles")
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+    def test_convert_array(self):
+        result = self.units.convert_array([0, 100], "celsius", "fahrenheit")
+        self.assertEqual(result.round(6).tolist(), [32.0, 212.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
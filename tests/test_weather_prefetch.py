@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from src.capabilities.weather_prefetch import WeatherPrefetcher
+
+
+class FakeWeatherService:
+
+    def __init__(self, top=(), fail=(), gate=None):
+        self.top = list(top)
+        self.fail = set(fail)
+        self.gate = gate
+        self.fetched = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=8)
+
+    def top_locations(self, n):
+        return self.top[:n]
+
+    def prefetch(self, location):
+        return self.pool.submit(self._fetch, location)
+
+    def _fetch(self, location):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+            self.fetched.append(location)
+        if location in self.fail:
+            raise ConnectionError("offline")
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestWeatherPrefetcher(unittest.TestCase):
+
+    def test_targets_configured_then_most_queried(self):
+        service = FakeWeatherService(top=["paris", "london", "rome"])
+        prefetcher = WeatherPrefetcher(service, ["London", ""], top_n=2)
+        self.assertEqual(prefetcher.targets(), ["london", "", "paris"])
+
+    def test_concurrency_is_bounded(self):
+        service = FakeWeatherService(top=[f"city {i}" for i in range(6)], fail=["city 5"])
+        prefetcher = WeatherPrefetcher(service, top_n=6, max_concurrent=2)
+        self.assertEqual(prefetcher.run_once(), 6)
+        self.assertTrue(wait_until(lambda: len(service.fetched) == 6 and prefetcher.stats["in_flight"] == 0))
+        self.assertLessEqual(service.peak, 2)
+        report = prefetcher.report()
+        self.assertEqual((report["prefetched"], report["failed"], report["in_flight"]), (5, 1, 0))
+        self.assertLessEqual(report["peak_concurrency"], 2)
+
+    def test_run_returns_without_waiting_for_slots(self):
+        gate = threading.Event()
+        service = FakeWeatherService(top=[f"city {i}" for i in range(4)], gate=gate)
+        prefetcher = WeatherPrefetcher(service, top_n=4, max_concurrent=1)
+        start = time.monotonic()
+        self.assertEqual(prefetcher.run_once(), 4)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(prefetcher.report()["queued"], 3)
+        gate.set()
+        self.assertTrue(wait_until(lambda: len(service.fetched) == 4))
+        self.assertEqual(service.peak, 1)
+
+    def test_skips_runs_outside_active_hours(self):
+        service = FakeWeatherService(top=["oslo"])
+        prefetcher = WeatherPrefetcher(service, active_hours=range(6, 10))
+        self.assertEqual(prefetcher.run_once(datetime(2024, 1, 1, 14)), 0)
+        self.assertEqual(prefetcher.run_once(datetime(2024, 1, 1, 7)), 1)
+        self.assertEqual(prefetcher.stats["skipped_runs"], 1)
+        self.assertTrue(wait_until(lambda: service.fetched == ["oslo"]))
+
+
+if __name__ == '__main__':
+    unittest.main()